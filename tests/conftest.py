@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# The tools are flat scripts importing each other by module name
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'tools'))
+
+TEAM = {
+    "killteamId": "TST-KT",
+    "killteamName": "Test Team",
+    "description": "Operatives that re-roll their dice.",
+    "opTypes": [{
+        "opTypeId": "TST-KT-GUNNER",
+        "opTypeName": "Gunner",
+        "weapons": [{
+            "wepId": "TST-KT-GUNNER-LAS",
+            "wepName": "Lasgun",
+            "profiles": [{"wepprofileId": "TST-KT-GUNNER-LAS-0", "profileName": "Standard",
+                          "WR": [{"id": "WR-TST-HOT"}, {"id": "WR-UNIV-LETHAL", "number": 5}]}],
+        }],
+        "abilities": [{"abilityId": "TST-KT-GUNNER-STEADY", "abilityName": "Steady Aim",
+                       "description": "This operative can re-roll one attack dice when shooting."}],
+    }],
+    "weapon_rules": [{"id": "WR-TST-HOT", "name": "Hot", "description": "The weapon may overheat."}],
+}
+
+WEAPON_RULES = {
+    "weapon_rules": [{"id": "WR-UNIV-LETHAL", "name": "Lethal", "description": "Critical successes on x+."}],
+}
+
+UNIVERSAL_EQUIPMENT = {
+    "equipments": [{"eqId": "EQ-UNIV-GRENADE", "eqName": "Frag Grenade",
+                    "description": "A thrown explosive that damages every operative nearby."}],
+}
+
+@pytest.fixture
+def dataset(tmp_path):
+    """A dataset root with one language holding one team and the shared files it needs."""
+    folder = tmp_path / 'en'
+    (folder / 'teams').mkdir(parents=True)
+    for name, data in (("teams/TST-KT.json", TEAM), ("weapon_rules.json", WEAPON_RULES),
+                       ("universal_equipment.json", UNIVERSAL_EQUIPMENT)):
+        (folder / name).write_text(json.dumps(data, indent=2), encoding='utf-8')
+    return tmp_path
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from conftest import TEAM, UNIVERSAL_EQUIPMENT
+from killteam_data.bundle import Bundle, build_bundle, to_python
+from killteam_data.id_index import IdIndex
+from killteam_data.rule_table import (DanglingRuleError, WeaponRuleTable, build_rule_table,
+                                      save_rule_table)
+from killteam_data.search import SearchIndex, analyze
+
+def test_bundle_round_trip(dataset, tmp_path):
+    stats = build_bundle(dataset / 'en', tmp_path / 'en.bundle')
+    assert stats["files"] == 3
+    with Bundle(tmp_path / 'en.bundle') as bundle:
+        assert bundle.team_ids() == ["TST-KT"]
+        assert to_python(bundle.team("TST-KT")) == TEAM
+        assert to_python(bundle.shared("universal_equipment")) == UNIVERSAL_EQUIPMENT
+        assert bundle.team("TST-KT")["opTypes"][0]["weapons"][0]["profiles"][0]["WR"][1]["number"] == 5
+
+def test_bundle_rejects_other_files(tmp_path):
+    path = tmp_path / 'not.bundle'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        Bundle(path)
+
+def test_id_index_resolves_and_refreshes(dataset, tmp_path):
+    index = IdIndex(dataset, tmp_path / 'ids.json')
+    assert index.locate("TST-KT-GUNNER-LAS-0").dotted.endswith("profiles[0]")
+    assert index.resolve("TST-KT-GUNNER-STEADY")["abilityName"] == "Steady Aim"
+    assert index.resolve("EQ-UNIV-GRENADE")["eqName"] == "Frag Grenade"
+    with pytest.raises(KeyError):
+        index.locate("NOPE")
+
+    # Reopening re-scans nothing; editing a file re-scans only that file
+    assert IdIndex(dataset, tmp_path / 'ids.json').rescanned == []
+    equipment = dict(UNIVERSAL_EQUIPMENT, equipments=UNIVERSAL_EQUIPMENT["equipments"] +
+                     [{"eqId": "EQ-UNIV-ROPE", "eqName": "Rope"}])
+    (dataset / 'en' / 'universal_equipment.json').write_text(json.dumps(equipment), encoding='utf-8')
+    reopened = IdIndex(dataset, tmp_path / 'ids.json')
+    assert reopened.rescanned == ["en/universal_equipment.json"]
+    assert "EQ-UNIV-ROPE" in reopened
+
+def test_search_ranks_and_filters(dataset, tmp_path):
+    index = SearchIndex("en", dataset, tmp_path / 'search.bin')
+    assert index.rebuilt
+    hits = index.search("reroll")
+    assert sorted(hit.id for hit in hits) == ["TST-KT", "TST-KT-GUNNER-STEADY"]
+    assert hits[0].score >= hits[1].score
+    ability = next(hit for hit in hits if hit.kind == "abilities")
+    assert ability.file == "teams/TST-KT.json" and ability.name == "Steady Aim"
+    assert "re-roll" in ability.snippet
+    assert [hit.id for hit in index.search("reroll", kind="teams")] == ["TST-KT"]
+    assert index.search("the") == []
+
+    reopened = SearchIndex("en", dataset, tmp_path / 'search.bin')
+    assert not reopened.rebuilt
+    assert reopened.search("grenades")[0].id == "EQ-UNIV-GRENADE"
+
+def test_analyze_folds_and_stems():
+    assert analyze("Re-rolls the Operative's dice", "en") == ["reroll", "operativ", "dic"]
+    assert analyze("reacción", "es") == analyze("reaccion", "es")
+
+def test_rule_table_resolves_team_and_universal_rules(dataset, tmp_path):
+    table_path = tmp_path / 'en.rule_table.json'
+    save_rule_table(build_rule_table("en", dataset), table_path)
+    table = WeaponRuleTable(table_path)
+    rules = table.profile_rules("TST-KT-GUNNER-LAS-0")
+    assert [(rule.id, rule.name, rule.number) for rule in rules] == [("WR-TST-HOT", "Hot", None),
+                                                                     ("WR-UNIV-LETHAL", "Lethal", 5)]
+    assert table.dangling == []
+
+def test_rule_table_dangling_references(dataset, tmp_path):
+    team = json.loads(json.dumps(TEAM))
+    team["opTypes"][0]["weapons"][0]["profiles"][0]["WR"].append({"id": "WR-MISSING"})
+    (dataset / 'en' / 'teams' / 'TST-KT.json').write_text(json.dumps(team), encoding='utf-8')
+    with pytest.raises(DanglingRuleError):
+        build_rule_table("en", dataset)
+
+    table_path = tmp_path / 'en.rule_table.json'
+    save_rule_table(build_rule_table("en", dataset, allow_dangling=True), table_path)
+    table = WeaponRuleTable(table_path)
+    assert len(table.profile_rules("TST-KT-GUNNER-LAS-0")) == 2
+    assert table.dangling == [("teams/TST-KT.json",
+                               "opTypes[0].weapons[0].profiles[0].WR[2]", "WR-MISSING")]
@@ -0,0 +1,33 @@
+from translate_batch import decode_packet, encode_packet
+
+def test_round_trip_keeps_segment_whitespace():
+    texts = ["Plain text", "  indented\n", "**Heading**\n\n- first\n- second", "ends with space "]
+    assert decode_packet(encode_packet(texts), len(texts)) == texts
+
+def test_text_before_first_sentinel_rejects_packet():
+    assert decode_packet("stray\n[[0]]\nuno\n[[1]]\ndos", 2) == [None, None]
+
+def test_no_sentinels_rejects_packet():
+    assert decode_packet("uno dos", 2) == [None, None]
+
+def test_gap_rejects_segment_that_absorbed_neighbour():
+    # Segment 1's sentinel was lost: segment 0 may hold its text
+    assert decode_packet("[[0]]\nuno\ndos\n[[2]]\ntres", 3) == [None, None, "tres"]
+
+def test_missing_last_segment():
+    assert decode_packet("[[0]]\nuno\n[[1]]\ndos", 3) == ["uno", None, None]
+
+def test_duplicate_sentinels_reject_both_segments():
+    assert decode_packet("[[0]]\nuno\n[[1]]\ndos\n[[1]]\ntres\n[[2]]\ncuatro", 3) == ["uno", None, "cuatro"]
+
+def test_misaligned_sentinels_are_rejected():
+    assert decode_packet("[[1]]\ndos\n[[0]]\nuno", 2) == [None, None]
+
+def test_out_of_range_sentinel_is_treated_as_a_gap():
+    assert decode_packet("[[0]]\nuno\n[[5]]\ncinco", 1) == [None]
+
+def test_empty_segment_is_rejected():
+    assert decode_packet("[[0]]\n\n[[1]]\ndos", 2) == [None, "dos"]
+
+def test_spacing_around_sentinels_is_accepted():
+    assert decode_packet("[[ 0 ]]\nuno\n [[1]] \ndos", 2) == ["uno", "dos"]
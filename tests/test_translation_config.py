@@ -0,0 +1,66 @@
+from translation_config import (TRANSLATION_RULES, has_rules, should_translate_field,
+                                translatable_locations, translatable_refs)
+
+def dict_walk_rule(file_name, field_path, field_name):
+    """The rule lookup walking TRANSLATION_RULES directly, as before the rules were compiled."""
+    if file_name.endswith('.json') and 'teams' in file_name.lower():
+        rules_key = 'teams'
+    else:
+        rules_key = file_name
+    if rules_key not in TRANSLATION_RULES:
+        return False
+    current_rules = TRANSLATION_RULES[rules_key]
+    for parent_field in field_path:
+        if isinstance(current_rules, dict) and parent_field in current_rules:
+            current_rules = current_rules[parent_field]
+        else:
+            return False
+    if isinstance(current_rules, dict):
+        return bool(current_rules.get(field_name, False))
+    return False
+
+def rule_paths(rules, path=()):
+    """Every (field path, field name) mentioned by a rules dict."""
+    for name, rule in rules.items():
+        yield list(path), name
+        if isinstance(rule, dict):
+            yield from rule_paths(rule, path + (name,))
+
+def test_compiled_rules_match_dict_walk():
+    file_names = ['actions.json', 'ops_2025.json', 'teams/IMP-AOD.json', 'universal_equipment.json',
+                  'weapon_rules.json', 'rules_key.json', 'teams.json']
+    fields = {name for rules in TRANSLATION_RULES.values() for _, name in rule_paths(rules)}
+    fields |= {'id', 'killteamId', 'WR', 'missing'}
+    checked = 0
+    for file_name in file_names:
+        key = 'teams' if 'teams' in file_name else file_name
+        paths = [path for path, _ in rule_paths(TRANSLATION_RULES.get(key, {}))]
+        paths += [[], ['opTypes', 'missing'], ['nowhere'], ['opTypes', 'weapons', 'profiles', 'deeper']]
+        for path in paths:
+            for field in fields:
+                assert should_translate_field(file_name, path, field) == dict_walk_rule(file_name, path, field), \
+                    (file_name, path, field)
+                checked += 1
+    assert checked > 1000
+
+def test_rules_of_team_files():
+    assert should_translate_field('teams/IMP-AOD.json', ['opTypes', 'weapons'], 'wepName')
+    assert not should_translate_field('teams/IMP-AOD.json', ['opTypes', 'weapons'], 'wepId')
+    assert has_rules('teams/IMP-AOD.json') and not has_rules('rules_key.json')
+
+def test_translatable_locations_follow_rules():
+    data = {
+        "killteamId": "TST",
+        "killteamName": "Test",
+        "composition": ["", "Two operatives"],
+        "opTypes": [{"opTypeId": "TST-A", "opTypeName": "Alpha",
+                     "weapons": [{"wepId": "W", "wepName": "Knife", "profiles": [{"profileName": "Stab"}]}]}],
+    }
+    assert translatable_locations(data, 'teams/TST.json') == {
+        "killteamName": "Test",
+        "composition[1]": "Two operatives",
+        "opTypes[0].opTypeName": "Alpha",
+        "opTypes[0].weapons[0].wepName": "Knife",
+        "opTypes[0].weapons[0].profiles[0].profileName": "Stab",
+    }
+    assert len(translatable_refs(data, 'teams/TST.json', skip_blank=False)) == 6
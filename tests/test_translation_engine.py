@@ -0,0 +1,61 @@
+import threading
+
+from rate_limiter import RateLimiter
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+
+class StubProvider:
+    """Tags text with the target language and records every request; texts in ``fail`` always raise."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text, target_lang, source_lang):
+        with self.lock:
+            self.requests.append(text)
+        if text in self.fail:
+            raise ConnectionError("stub failure")
+        return f"<{target_lang}>{text}"
+
+def make_engine(provider, **kwargs):
+    return TranslationEngine(provider, retries=0, use_memory=False, limiter=RateLimiter(),
+                             masking=False, **kwargs)
+
+def test_results_keep_input_order():
+    texts = [f"text {n}" for n in range(40)]
+    translated = make_engine(StubProvider(), max_in_flight=8).translate(texts, "es")
+    assert translated == [f"<es>text {n}" for n in range(40)]
+
+def test_duplicates_are_sent_once():
+    provider = StubProvider()
+    translated = make_engine(provider).translate(["alpha", "beta", "alpha", "alpha"], "es")
+    assert translated == ["<es>alpha", "<es>beta", "<es>alpha", "<es>alpha"]
+    assert sorted(provider.requests) == ["alpha", "beta"]
+
+def test_blank_strings_are_not_sent():
+    provider = StubProvider()
+    assert make_engine(provider).translate(["", "  ", "gamma"], "es") == ["", "  ", "<es>gamma"]
+    assert provider.requests == ["gamma"]
+
+def test_failures_fall_back_to_source():
+    engine = make_engine(StubProvider(fail={"broken"}))
+    assert engine.translate(["fine", "broken"], "es") == ["<es>fine", "broken"]
+    assert engine.stats["fallbacks"] == 1
+
+def test_failures_without_fallback_are_none():
+    engine = make_engine(StubProvider(fail={"broken"}))
+    assert engine.translate(["fine", "broken"], "es", fallback_to_source=False) == ["<es>fine", None]
+
+def test_memory_answers_repeated_runs(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite")
+    provider = StubProvider(fail={"broken"})
+    engine = TranslationEngine(provider, retries=0, memory=memory, limiter=RateLimiter(), masking=False)
+    engine.translate(["one", "two", "broken"], "es")
+    provider.requests.clear()
+
+    assert engine.translate(["two", "one", "broken"], "es") == ["<es>two", "<es>one", "broken"]
+    # Fallbacks are never stored, so only the failed string is sent again
+    assert provider.requests == ["broken"]
+    memory.close()
@@ -0,0 +1,65 @@
+from translation_journal import TranslationJournal
+from translation_manifest import TranslationManifest
+
+def test_resume_reads_back_recorded_entries(tmp_path):
+    path = tmp_path / "es.journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.record("teams/TST.json", ["killteamName", "opTypes[0].opTypeName"], "Test", "Prueba")
+    journal.close()
+
+    resumed = TranslationJournal(path, resume=True)
+    assert len(resumed) == 2
+    strings = {"killteamName": "Test", "description": "New text"}
+    assert resumed.completed("teams/TST.json", strings) == {"Test": "Prueba"}
+    resumed.close()
+
+def test_changed_english_text_is_not_reused(tmp_path):
+    path = tmp_path / "es.journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.record("teams/TST.json", ["killteamName"], "Test", "Prueba")
+    journal.close()
+
+    resumed = TranslationJournal(path, resume=True)
+    assert resumed.completed("teams/TST.json", {"killteamName": "Renamed"}) == {}
+    resumed.close()
+
+def test_starting_afresh_discards_the_journal(tmp_path):
+    path = tmp_path / "es.journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.record("teams/TST.json", ["killteamName"], "Test", "Prueba")
+    journal.close()
+
+    fresh = TranslationJournal(path)
+    assert len(fresh) == 0
+    fresh.close()
+    assert path.read_text(encoding='utf-8') == ""
+
+def test_half_written_last_line_is_dropped_on_resume(tmp_path):
+    path = tmp_path / "es.journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.record("teams/TST.json", ["killteamName"], "Test", "Prueba")
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"file": "teams/TST.json", "pa')
+
+    resumed = TranslationJournal(path, resume=True)
+    assert resumed.corrupt_lines == 1
+    resumed.record("teams/TST.json", ["description"], "Text", "Texto")
+    resumed.close()
+
+    reopened = TranslationJournal(path, resume=True)
+    assert reopened.corrupt_lines == 0
+    assert sorted(reopened.entries) == [("teams/TST.json", "description"), ("teams/TST.json", "killteamName")]
+    reopened.close()
+
+def test_manifest_reports_new_and_changed_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manifest = TranslationManifest.for_language("es")
+    assert manifest.changed_paths("teams/TST.json", {"killteamName": "Test"}) == ["killteamName"]
+    manifest.record("teams/TST.json", {"killteamName": "Test", "description": "Old"})
+    manifest.save()
+
+    reloaded = TranslationManifest.for_language("es")
+    strings = {"killteamName": "Test", "description": "New", "composition": "Added"}
+    assert reloaded.changed_paths("teams/TST.json", strings) == ["description", "composition"]
+    assert reloaded.has_file("teams/TST.json") and not reloaded.has_file("teams/OTHER.json")
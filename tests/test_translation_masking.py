@@ -0,0 +1,35 @@
+from translation_masking import mask_text, needs_translation, unmask_text
+
+def test_round_trip_restores_protected_spans():
+    text = "**Shoot:** Gain 2 APL and move up to 6\" if the operative has an ENGAGE order."
+    masked, spans = mask_text(text)
+    assert "APL" not in masked and "ENGAGE" not in masked and '6"' not in masked
+    assert unmask_text(masked, spans) == text
+
+def test_round_trip_after_provider_reorders_and_spaces_placeholders():
+    masked, spans = mask_text("Roll 2D6 for APL")
+    assert masked == "Roll {0} for {1}"
+    assert unmask_text("Tira { 0 } para {1}", spans) == "Tira 2D6 para APL"
+
+def test_literal_braces_are_masked_too():
+    masked, spans = mask_text("Keep {0} as written")
+    assert spans == ["{0}"]
+    assert unmask_text(masked, spans) == "Keep {0} as written"
+
+def test_lost_placeholder_gives_none():
+    masked, spans = mask_text("Add 1 to the APL stat")
+    assert len(spans) == 2
+    assert unmask_text(masked.replace("{1}", ""), spans) is None
+
+def test_duplicated_or_invented_placeholder_gives_none():
+    masked, spans = mask_text("Add 1 to the APL stat")
+    assert unmask_text(masked + " {1}", spans) is None
+    assert unmask_text(masked + " {7}", spans) is None
+
+def test_text_without_spans_is_unchanged():
+    assert mask_text("plain words") == ("plain words", [])
+    assert unmask_text("palabras", []) == "palabras"
+
+def test_only_protected_spans_need_no_translation():
+    assert not needs_translation(mask_text("APL 2, 3+")[0])
+    assert needs_translation(mask_text("APL 2, then move")[0])
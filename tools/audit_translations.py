@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Audit a whole translation folder against en/ in one run.
+Every English file is paired with its translation and checked in a process pool for
+structure (validate_translation), values changed outside the translatable fields and
+completeness (check_translation_completeness). Everything found, with every issue path
+and per-file timings, is written to a single JSON report.
+
+Results are cached in <language>.audit-cache.json under the content hashes of both files
+of each pair, so only pairs where either side changed are checked again. Files whose size
+and modification time are unchanged are not even read. The cache is discarded when the
+audit code or the translation rules change.
+
+Usage: python audit_translations.py <language> [--output <lang>.audit.json] [--workers N] [--no-cache]
+
+  language    - Translation folder to audit, e.g. es
+  --output    - Report path (default: <language>.audit.json)
+  --workers   - Worker processes (default: CPU count)
+  --no-cache  - Check every pair again (the cache is still rewritten)
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from check_translation_completeness import classify_strings
+from extract_translatables import extract_file_strings
+from json_output import write_json
+from translation_config import file_key, has_rules, iter_source_files
+from validate_translation import compare_structures, untranslatable_changes
+
+REPORT_VERSION = 1
+CACHE_VERSION = 1
+
+# Modules whose code decides the audit results; editing any of them invalidates the cache
+AUDIT_MODULES = ['audit_translations.py', 'validate_translation.py', 'check_translation_completeness.py',
+                 'extract_translatables.py', 'translation_config.py', 'json_refs.py']
+
+def code_digest() -> str:
+    """Hash of the audit code and the translation rules it applies."""
+    digest = hashlib.sha256()
+    tools_dir = Path(__file__).resolve().parent
+    for module in AUDIT_MODULES:
+        digest.update((tools_dir / module).read_bytes())
+    return digest.hexdigest()[:16]
+
+def file_signature(path: Path, cached: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Size, modification time and content hash of a file (None if it does not exist).
+    The hash is taken from ``cached`` without reading the file when size and mtime match.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+        return cached
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns,
+            "hash": hashlib.sha256(path.read_bytes()).hexdigest()[:16]}
+
+def same_content(signature: Optional[Dict[str, Any]], cached: Optional[Dict[str, Any]]) -> bool:
+    """True when a file has the content it had when cached (or is still missing)."""
+    if signature is None or cached is None:
+        return signature is cached
+    return signature["hash"] == cached["hash"]
+
+def load_cache(path: Path, digest: str) -> Dict[str, Any]:
+    """Cached entries per file, or nothing if the cache is missing, unreadable or stale."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("code") != digest:
+        return {}
+    return cache.get("files", {})
+
+def audit_pair(filename: str, en_dir: str, lang_dir: str) -> Dict[str, Any]:
+    """Audit one English file against its translation; runs in a worker process."""
+    en_file = Path(en_dir) / filename
+    trans_file = Path(lang_dir) / filename
+    result = {"file": filename, "status": "ok", "timings": {}}
+    timings = result["timings"]
+    start_time = time.perf_counter()
+
+    if not trans_file.exists():
+        result["status"] = "missing"
+        timings["total"] = time.perf_counter() - start_time
+        return result
+    try:
+        with open(en_file, 'r', encoding='utf-8') as f:
+            en_data = json.load(f)
+        with open(trans_file, 'r', encoding='utf-8') as f:
+            trans_data = json.load(f)
+    except Exception as e:
+        result["status"] = "unreadable"
+        result["error"] = str(e)
+        timings["total"] = time.perf_counter() - start_time
+        return result
+    timings["parse"] = time.perf_counter() - start_time
+
+    step_time = time.perf_counter()
+    result["structure_errors"] = [
+        {"path": path, "issue": issue}
+        for path, _, issue in (error.partition(': ') for error in compare_structures(en_data, trans_data))]
+    timings["structure"] = time.perf_counter() - step_time
+
+    # Values the rules don't translate should be identical to English (only for structurally equal files)
+    step_time = time.perf_counter()
+    name = file_key(en_file)
+    if has_rules(name) and not result["structure_errors"]:
+        result["untranslatable_changes"] = untranslatable_changes(en_data, trans_data, name)
+    else:
+        result["untranslatable_changes"] = []
+    timings["untranslatable"] = time.perf_counter() - step_time
+
+    step_time = time.perf_counter()
+    classified = classify_strings(extract_file_strings(en_file, en_data),
+                                  extract_file_strings(en_file, trans_data))
+    result["strings"] = sum(len(paths) for paths in classified.values())
+    result["translated"] = len(classified["translated"])
+    result["missing"] = classified["missing"]
+    result["untranslated"] = classified["untranslated"]
+    timings["completeness"] = time.perf_counter() - step_time
+
+    if result["structure_errors"]:
+        result["status"] = "invalid"
+    elif result["missing"]:
+        result["status"] = "incomplete"
+    timings["total"] = time.perf_counter() - start_time
+    return result
+
+def summarize(results: Dict[str, Dict[str, Any]], extra_files: list) -> Dict[str, Any]:
+    """Totals over every file of the report: files per status, issues per kind, strings."""
+    return {
+        "files": len(results),
+        "extra_files": len(extra_files),
+        "status": {status: sum(result["status"] == status for result in results.values())
+                   for status in ("ok", "incomplete", "invalid", "missing", "unreadable")},
+        "issues": {issue: sum(len(result.get(issue, [])) for result in results.values())
+                   for issue in ("structure_errors", "untranslatable_changes", "missing", "untranslated")},
+        "strings": sum(result.get("strings", 0) for result in results.values()),
+        "translated": sum(result.get("translated", 0) for result in results.values()),
+    }
+
+def audit_files(files: List[str], en_dir: Path, lang_dir: Path, workers: int) -> List[Dict[str, Any]]:
+    """Audit the given pairs, in a process pool when there is more than one."""
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            return list(pool.map(audit_pair, files, [str(en_dir)] * len(files),
+                                 [str(lang_dir)] * len(files), chunksize=4))
+    return [audit_pair(filename, str(en_dir), str(lang_dir)) for filename in files]
+
+def main():
+    args = sys.argv[1:]
+    options = {flag: args[args.index(flag) + 1] for flag in ('--output', '--workers') if flag in args}
+    positional = [arg for arg in args if not arg.startswith('--') and arg not in options.values()]
+    if not positional:
+        print("Usage: python audit_translations.py <language> [--output <lang>.audit.json] [--workers N] [--no-cache]")
+        sys.exit(1)
+
+    lang = positional[0].lower()
+    en_dir = Path('en')
+    lang_dir = Path(lang)
+    if not lang_dir.is_dir():
+        print(f"Error: Translation folder not found: {lang_dir}")
+        sys.exit(1)
+    output = Path(options.get('--output', f"{lang}.audit.json"))
+    workers = int(options.get('--workers', os.cpu_count() or 1))
+
+    files = [f.relative_to(en_dir).as_posix() for f in iter_source_files(en_dir)]
+    extra_files = sorted(set(f.relative_to(lang_dir).as_posix() for f in iter_source_files(lang_dir))
+                         - set(files))
+
+    print("=" * 70)
+    print(f"Auditing {lang}/ against en/: {len(files)} files, {workers} worker processes")
+    print("=" * 70)
+    start_time = time.time()
+
+    # Pairs whose English and translated content are both unchanged reuse the cached result
+    cache_path = Path(f"{lang}.audit-cache.json")
+    digest = code_digest()
+    cached = {} if '--no-cache' in args else load_cache(cache_path, digest)
+    signatures = {}
+    results = {}
+    for filename in files:
+        entry = cached.get(filename, {})
+        signatures[filename] = (file_signature(en_dir / filename, entry.get("en")),
+                                file_signature(lang_dir / filename, entry.get("translation")))
+        if entry and same_content(signatures[filename][0], entry["en"]) \
+                and same_content(signatures[filename][1], entry["translation"]):
+            results[filename] = entry["result"]
+    changed = [filename for filename in files if filename not in results]
+
+    for result in audit_files(changed, en_dir, lang_dir, workers):
+        results[result["file"]] = result
+    results = {filename: results[filename] for filename in files}
+    elapsed = time.time() - start_time
+
+    write_json(cache_path, {
+        "version": CACHE_VERSION,
+        "code": digest,
+        "files": {filename: {"en": signatures[filename][0], "translation": signatures[filename][1],
+                             "result": results[filename]} for filename in files},
+    })
+
+    counts = summarize(results, extra_files)
+    report = {
+        "version": REPORT_VERSION,
+        "language": lang,
+        "elapsed": elapsed,
+        "workers": workers,
+        "checked": changed,
+        "counts": counts,
+        "extra_files": extra_files,
+        "files": results,
+    }
+    write_json(output, report)
+
+    for filename, result in results.items():
+        if result["status"] != "ok":
+            detail = result.get("error") or (f"{len(result.get('structure_errors', []))} structure errors, "
+                                             f"{len(result.get('missing', []))} missing strings")
+            tag = "[WARNING]" if result["status"] == "incomplete" else "[ERROR]"
+            print(f"  {tag} {filename}: {result['status']} ({detail})")
+    for filename in extra_files:
+        print(f"  [WARNING] {lang}/{filename} has no English counterpart")
+
+    status = counts["status"]
+    issues = counts["issues"]
+    completeness = counts["translated"] / max(counts["strings"], 1) * 100
+    print(f"\n{status['ok']}/{counts['files']} files OK, {status['incomplete']} incomplete, "
+          f"{status['invalid']} invalid, {status['missing']} missing, {status['unreadable']} unreadable")
+    print(f"{issues['structure_errors']} structure errors, {issues['untranslatable_changes']} "
+          f"non-translatable values changed, {issues['untranslated']} strings identical to English")
+    print(f"{counts['translated']}/{counts['strings']} strings translated ({completeness:.1f}%), "
+          f"{issues['missing']} missing")
+    print(f"\n[OK] Report written to {output} ({elapsed:.3f}s, {len(changed)} pairs checked, "
+          f"{len(files) - len(changed)} from cache)")
+    sys.exit(1 if status["invalid"] or status["missing"] or status["unreadable"] else 0)
+
+if __name__ == '__main__':
+    main()
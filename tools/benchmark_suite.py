@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark of the translate_* scripts against the local stub server.
+Each script runs as a subprocess over the real en/ tree, in a scratch directory with a
+fresh translation memory, with Google and DeepL pointed at the stub. Reports wall time,
+strings translated per second, requests issued and characters sent per script.
+
+Usage: python benchmark_suite.py [script ...] [--latency 0.02] [--error-rate 0] [--rate-limit-rate 0]
+                                 [--provider-limits]
+
+  script             - Scripts to run (default: all of SCRIPTS), e.g. translate_batch
+  --provider-limits  - Keep the default provider rate limits (by default they are lifted so
+                       the scripts themselves are measured)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from stub_translate_server import start_stub_server
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+# Script -> command line arguments for one end-to-end run to Spanish
+SCRIPTS = {
+    "translate_batch": ["es"],
+    "translate_precise": ["es", "--full"],
+    "translate_teams_only": [],
+    "translate_deepl": ["es", "stub-key:fx"],
+}
+
+def run_script(name: str, args: list, server, url: str, provider_limits: bool) -> dict:
+    """Run one script to completion in a scratch directory and measure it through the stub's counters."""
+    with tempfile.TemporaryDirectory(prefix="kt-bench-") as work_dir:
+        (Path(work_dir) / 'en').symlink_to(Path('en').resolve(), target_is_directory=True)
+        env = dict(os.environ,
+                   KT_GOOGLE_TRANSLATE_URL=url,
+                   KT_DEEPL_SERVER_URL=server.deepl_url,
+                   KT_TRANSLATION_MEMORY=str(Path(work_dir) / 'memory.sqlite'))
+        if not provider_limits:
+            for provider in ("GOOGLE", "DEEPL"):
+                env[f"KT_{provider}_RPS"] = "0"
+                env[f"KT_{provider}_CPS"] = "0"
+
+        before = server.snapshot()
+        start_time = time.time()
+        process = subprocess.run([sys.executable, str(TOOLS_DIR / f"{name}.py")] + args,
+                                 cwd=work_dir, env=env, capture_output=True, text=True)
+        elapsed = time.time() - start_time
+        after = server.snapshot()
+
+    output = process.stdout + process.stderr
+    result = {counter: after[counter] - before[counter] for counter in after}
+    result["elapsed"] = elapsed
+    result["ok"] = process.returncode == 0 and "[ERROR]" not in output
+    result["error"] = next((line.strip() for line in output.splitlines()
+                            if "[ERROR]" in line or line.startswith("Error")), "")
+    return result
+
+def main():
+    args = sys.argv[1:]
+    latency = float(args[args.index('--latency') + 1]) if '--latency' in args else 0.02
+    error_rate = float(args[args.index('--error-rate') + 1]) if '--error-rate' in args else 0.0
+    rate_limit_rate = float(args[args.index('--rate-limit-rate') + 1]) if '--rate-limit-rate' in args else 0.0
+    provider_limits = '--provider-limits' in args
+    option_values = {args[args.index(flag) + 1] for flag in ('--latency', '--error-rate', '--rate-limit-rate')
+                     if flag in args}
+    names = [arg for arg in args if not arg.startswith('--') and arg not in option_values] or list(SCRIPTS)
+
+    unknown = [name for name in names if name not in SCRIPTS]
+    if unknown:
+        print(f"Error: Unknown script(s) {', '.join(unknown)}. Choose from: {', '.join(SCRIPTS)}")
+        sys.exit(1)
+    if not Path('en').is_dir():
+        print("Error: Run from the repository root (en/ not found)")
+        sys.exit(1)
+
+    server, url = start_stub_server(latency, error_rate=error_rate, rate_limit_rate=rate_limit_rate)
+    print("=" * 70)
+    print(f"Translation scripts benchmark: {latency * 1000:.0f} ms latency, {error_rate:.0%} errors, "
+          f"{rate_limit_rate:.0%} rate limited, provider limits {'on' if provider_limits else 'off'}")
+    print("=" * 70)
+
+    results = {}
+    for name in names:
+        print(f"\nRunning {name}...")
+        result = run_script(name, SCRIPTS[name], server, url, provider_limits)
+        results[name] = result
+        if not result["ok"]:
+            print(f"  [ERROR] {name} failed: {result['error'] or 'non-zero exit status'}")
+        print(f"  {result['elapsed']:.1f}s, {result['strings_received']} strings, "
+              f"{result['request_count']} requests, {result['chars_received']} characters sent")
+
+    print("\n" + "=" * 70)
+    print(f"{'Script':<22}{'Wall (s)':>9}{'Strings':>9}{'Str/sec':>9}{'Requests':>10}"
+          f"{'Chars':>10}{'500/429':>9}")
+    print("-" * 70)
+    for name, result in results.items():
+        rate = result["strings_received"] / max(result["elapsed"], 0.001)
+        injected = f"{result['errors_injected']}/{result['rate_limits_injected']}"
+        print(f"{name:<22}{result['elapsed']:>9.1f}{result['strings_received']:>9}{rate:>9.1f}"
+              f"{result['request_count']:>10}{result['chars_received']:>10}{injected:>9}"
+              + ("" if result["ok"] else "  [FAILED]"))
+    print("=" * 70)
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
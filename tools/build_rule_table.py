@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Build the weapon-rule join of a language (see killteam_data.rule_table): every WR entry
+of every weapon profile resolved once into <language>.rule_table.json. Fails, writing
+nothing, if a profile references a weapon rule that is not defined, unless --allow-dangling
+is given.
+
+Usage: python build_rule_table.py <language> [--output <file>] [--team <killteamId>] [--allow-dangling]
+
+  language  - Folder to build, e.g. en or es
+  --output  - Table path (default: <language>.rule_table.json next to the language folders)
+  --team    - Afterwards, print the weapon rules of that team's datacards from the table
+  --allow-dangling - Report references to undefined weapon rules as warnings and build the
+                     table without them (they are listed under "dangling" in the table)
+"""
+
+import sys
+import time
+from killteam_data.loader import DATA_ROOT, DatasetLoader
+from killteam_data.rule_table import (DanglingRuleError, WeaponRuleTable, build_rule_table,
+                                      default_table_path, profile_id, save_rule_table)
+
+def print_team(table: WeaponRuleTable, loader: DatasetLoader, killteam_id: str):
+    """Weapons of each operative of a team with their resolved rules."""
+    team = loader.team(killteam_id)
+    print(f"\n{team.get('killteamName')} ({killteam_id})")
+    for op_type in team.get('opTypes', []):
+        print(f"  {op_type.get('opTypeName')}")
+        for weapon in op_type.get('weapons', []):
+            for i, profile in enumerate(weapon.get('profiles', [])):
+                rules = ', '.join(' '.join(str(part) for part in (rule.name, rule.details, rule.number)
+                                           if part is not None)
+                                  for rule in table.profile_rules(profile_id(weapon, profile, i)))
+                name = ' - '.join(part for part in (weapon.get('wepName'), profile.get('profileName')) if part)
+                print(f"    {name}: {rules or '-'}")
+
+def main():
+    args = sys.argv[1:]
+    options = {flag: args[args.index(flag) + 1] for flag in ('--output', '--team') if flag in args}
+    positional = [arg for arg in args if not arg.startswith('--') and arg not in options.values()]
+    if not positional:
+        print("Usage: python build_rule_table.py <language> [--output <file>] [--team <killteamId>] "
+              "[--allow-dangling]")
+        sys.exit(1)
+
+    lang = positional[0].lower()
+    if not (DATA_ROOT / lang).is_dir():
+        print(f"Error: Language folder not found: {DATA_ROOT / lang}")
+        sys.exit(1)
+    output = options.get('--output') or default_table_path(lang)
+
+    allow_dangling = '--allow-dangling' in args
+    start_time = time.time()
+    try:
+        table = build_rule_table(lang, allow_dangling=allow_dangling)
+    except DanglingRuleError as e:
+        for name, path, rule_id in e.references:
+            print(f"[ERROR] {lang}/{name} {path}: weapon rule {rule_id} is not defined")
+        print(f"\n[ERROR] {e}")
+        print("[INFO] Define these rules, or rerun with --allow-dangling to build without them")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    save_rule_table(table, output)
+    for name, path, rule_id in table["dangling"]:
+        print(f"[WARNING] {lang}/{name} {path}: weapon rule {rule_id} is not defined, left out")
+
+    references = sum(len(indexes) for indexes in table["profiles"].values())
+    print(f"[OK] Built {output}: {len(table['profiles'])} profiles, {references} rule references "
+          f"as {len(table['pairs'])} distinct pairs of {len(table['rules'])} rules ({time.time() - start_time:.2f}s)")
+    if table["dangling"]:
+        print(f"[WARNING] {len(table['dangling'])} references to undefined weapon rules were left out")
+
+    if '--team' in options:
+        print_team(WeaponRuleTable(output), DatasetLoader(lang), options['--team'])
+
+if __name__ == '__main__':
+    main()
@@ -2,38 +2,29 @@
 """
 Check translation completeness by comparing English and translated files.
 Reports which fields are translated and which are missing.
+Files covered by translation_config are checked against its compiled field rules.
 """
 
 import json
 import sys
 from pathlib import Path
-from extract_translatables import extract_strings, is_translatable_key
+from typing import Dict, List
+from extract_translatables import extract_file_strings
 
-def get_translatable_strings(data, path="", strings=None):
-    """Get all translatable strings with their paths and values."""
-    if strings is None:
-        strings = {}
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            full_path = f"{path}.{key}" if path else key
-            
-            if is_translatable_key(key):
-                if isinstance(value, str) and value.strip():
-                    strings[full_path] = value
-                elif isinstance(value, list):
-                    for i, item in enumerate(value):
-                        if isinstance(item, str) and item.strip():
-                            strings[f"{full_path}[{i}]"] = item
-            else:
-                if isinstance(value, (dict, list)):
-                    get_translatable_strings(value, full_path, strings)
-    
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            get_translatable_strings(item, f"{path}[{i}]", strings)
-    
-    return strings
+def classify_strings(en_strings: Dict[str, str], trans_strings: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Paths of the translatable English strings, split into 'translated', 'missing' (absent
+    from the translation) and 'untranslated' (identical to English).
+    """
+    result = {"translated": [], "missing": [], "untranslated": []}
+    for path, en_value in en_strings.items():
+        if path not in trans_strings:
+            result["missing"].append(path)
+        elif trans_strings[path] == en_value:
+            result["untranslated"].append(path)  # Same as English, likely not translated
+        else:
+            result["translated"].append(path)
+    return result
 
 def check_completeness(english_file, translation_file):
     """Check translation completeness."""
@@ -51,22 +42,13 @@ def check_completeness(english_file, translation_file):
         print(f"Error reading translation file: {e}")
         return False
     
-    # Get all translatable strings
-    en_strings = get_translatable_strings(en_data)
-    trans_strings = get_translatable_strings(trans_data)
-    
-    # Find missing translations
-    missing = []
-    translated = []
-    untranslated = []
-    
-    for path, en_value in en_strings.items():
-        if path not in trans_strings:
-            missing.append(path)
-        elif trans_strings[path] == en_value:
-            untranslated.append(path)  # Same as English, likely not translated
-        else:
-            translated.append(path)
+    # Get all translatable strings (both sides use the English file's rules)
+    en_strings = extract_file_strings(english_file, en_data)
+    trans_strings = extract_file_strings(english_file, trans_data)
+    classified = classify_strings(en_strings, trans_strings)
+    missing = classified["missing"]
+    translated = classified["translated"]
+    untranslated = classified["untranslated"]
     
     # Calculate completeness
     total = len(en_strings)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Export every weapon profile of a language as columnar NumPy arrays (see
+killteam_data.weapon_table). Requires numpy.
+
+Usage: python export_weapon_table.py <language> [--output <file>] [--bench]
+
+  language  - Folder to export, e.g. en or es
+  --output  - Table path (default: <language>.weapons.npz next to the language folders)
+  --bench   - Time "melee weapons with critical damage >= 5 and Lethal" as one vectorized
+              expression against loops over the parsed team files
+"""
+
+import sys
+import time
+from killteam_data.loader import DATA_ROOT, DatasetLoader
+from killteam_data.rule_table import profile_id
+from killteam_data.weapon_table import (build_weapon_table, default_weapon_table_path,
+                                        load_weapon_table, save_weapon_table)
+
+def loop_query(loader: DatasetLoader) -> list:
+    """The benchmark query over the nested JSON, as done without the table."""
+    found = []
+    teams = list(loader.teams()) + [loader.universal_equipment]
+    for team in teams:
+        holders = team.get('opTypes', []) + team.get('equipments', [])
+        for holder in holders:
+            for weapon in holder.get('weapons') or []:
+                if weapon.get('wepType') != 'M':
+                    continue
+                for i, profile in enumerate(weapon.get('profiles') or []):
+                    damage = str(profile.get('DMG', '')).split('/')
+                    if len(damage) > 1 and damage[1].isdigit() and int(damage[1]) >= 5 \
+                            and any(rule['id'] == 'WR-UNIV-LETHAL' for rule in profile.get('WR') or []):
+                        found.append(profile_id(weapon, profile, i))
+    return found
+
+def best_time(function, repeat: int = 20) -> float:
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    args = sys.argv[1:]
+    output_arg = args[args.index('--output') + 1] if '--output' in args else None
+    positional = [arg for arg in args if not arg.startswith('--') and arg != output_arg]
+    if not positional:
+        print("Usage: python export_weapon_table.py <language> [--output <file>] [--bench]")
+        sys.exit(1)
+
+    lang = positional[0].lower()
+    if not (DATA_ROOT / lang).is_dir():
+        print(f"Error: Language folder not found: {DATA_ROOT / lang}")
+        sys.exit(1)
+    output = output_arg or default_weapon_table_path(lang)
+
+    start_time = time.time()
+    try:
+        table = build_weapon_table(lang)
+    except ImportError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    save_weapon_table(table, output)
+    print(f"[OK] Exported {output}: {len(table)} profiles of {len(table.team_ids)} teams, "
+          f"{len(table.rule_ids)} weapon rules ({time.time() - start_time:.2f}s)")
+
+    if '--bench' in args:
+        start_time = time.perf_counter()
+        table = load_weapon_table(output)
+        load_time = time.perf_counter() - start_time
+
+        def vectorized():
+            return table["profile_id"][(table["wep_type"] == table.category("M")) & (table["dmg_crit"] >= 5)
+                                       & table.has_rule("WR-UNIV-LETHAL")]
+
+        loader = DatasetLoader(lang, max_teams=len(DatasetLoader(lang).team_ids()))
+        expected = loop_query(loader)
+        found = vectorized()
+        if sorted(found) != sorted(expected):
+            print(f"[ERROR] Vectorized query found {len(found)} profiles, loops found {len(expected)}")
+            sys.exit(1)
+        print(f"\nMelee, critical damage >= 5, Lethal: {len(found)} profiles")
+        print(f"  Table load:                   {load_time * 1000:8.2f} ms")
+        print(f"  Vectorized expression:        {best_time(vectorized) * 1000:8.3f} ms")
+        print(f"  Loops over parsed JSON:       {best_time(lambda: loop_query(loader)) * 1000:8.3f} ms")
+        loader.clear()
+        print(f"  Loops including parsing:      {best_time(lambda: (loader.clear(), loop_query(loader)), 5) * 1000:8.3f} ms")
+
+if __name__ == '__main__':
+    main()
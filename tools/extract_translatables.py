@@ -2,11 +2,15 @@
 """
 Extract all translatable strings from JSON files into a structured format.
 Useful for translation services and maintaining translation templates.
+Files covered by translation_config use its compiled field rules, completed by the
+key-name heuristics for the sections the rules leave out; other files use the heuristics only.
 """
 
 import json
 import sys
 from pathlib import Path
+from json_output import write_json
+from translation_config import file_key, has_rules, translatable_locations
 
 # Fields that should NOT be translated
 NON_TRANSLATABLE_FIELDS = {
@@ -85,6 +89,21 @@ def extract_strings(data, path="", strings=None):
     
     return strings
 
+def extract_file_strings(json_file, data):
+    """
+    Translatable strings of a file, keyed by path: the compiled translation_config rules
+    when they cover the file, plus whatever the key-name heuristics of extract_strings find
+    outside them (the rules of team files leave out ploys, equipments, teamAbilities and
+    archetypes, which are translated all the same).
+    """
+    key = file_key(json_file)
+    if not has_rules(key):
+        return extract_strings(data)
+    strings = translatable_locations(data, key)
+    for path, value in extract_strings(data).items():
+        strings.setdefault(path, value)
+    return strings
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python extract_translatables.py <json_file> [output_file]")
@@ -106,7 +125,7 @@ def main():
         sys.exit(1)
     
     # Extract translatable strings
-    strings = extract_strings(data)
+    strings = extract_file_strings(json_file, data)
     
     # Prepare output
     output = {
@@ -117,8 +136,7 @@ def main():
     
     # Output
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        write_json(output_file, output)
         print(f"Extracted {len(strings)} translatable strings to {output_file}")
     else:
         # Print to stdout
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared writer for the JSON files the tools produce.
+Output keeps the repository's formatting (2-space indent, UTF-8, no trailing newline)
+byte for byte, is serialized with orjson when it is installed, skips files whose
+content would not change, and goes through a temporary file and a rename so an
+interrupted run never leaves a truncated file behind.
+
+Usage: python json_output.py [file.json ...] [--fix]   (check formatting, default: en/ and es/)
+
+  --fix  - Rewrite files that are not in the standard formatting
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# A line of indented output whose value is a float; orjson formats those differently
+# from the standard library (1e-05 vs 0.00001, NaN vs null), so such data is left to it
+FLOAT_LINE = re.compile(rb'^ *(?:"(?:[^"\\]|\\.)*": )?-?\d+[.eE]', re.MULTILINE)
+
+class OutputStats:
+    """Files written and skipped by ``write_json``, and the bytes actually written."""
+
+    def __init__(self):
+        self.written = 0
+        self.unchanged = 0
+        self.bytes_written = 0
+
+    def add(self, other: 'OutputStats'):
+        """Merge counts collected elsewhere (e.g. returned by a worker process)."""
+        self.written += other.written
+        self.unchanged += other.unchanged
+        self.bytes_written += other.bytes_written
+
+    def summary(self) -> str:
+        return (f"{self.written} files written ({self.bytes_written / 1024:.1f} KB), "
+                f"{self.unchanged} unchanged")
+
+# Totals for the current process
+OUTPUT_STATS = OutputStats()
+
+def dump_json(data: Any) -> bytes:
+    """Serialize exactly as ``json.dump(data, f, ensure_ascii=False, indent=2)`` would, as UTF-8."""
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-string keys or integers beyond 64 bits
+            content = None
+        if content is not None and not FLOAT_LINE.search(content):
+            return content
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def write_json(path: Union[str, Path], data: Any, stats: OutputStats = OUTPUT_STATS) -> bool:
+    """
+    Write ``data`` to ``path`` unless the file already holds exactly that content.
+    Returns True if the file was written, False if it was left untouched.
+    """
+    path = Path(path)
+    content = dump_json(data)
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            stats.unchanged += 1
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    stats.written += 1
+    stats.bytes_written += len(content)
+    return True
+
+def main():
+    args = sys.argv[1:]
+    fix = '--fix' in args
+    files = [Path(arg) for arg in args if not arg.startswith('--')]
+    if not files:
+        files = sorted(path for folder in ('en', 'es') for path in Path(folder).rglob('*.json'))
+
+    differing = 0
+    for json_file in files:
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        if raw == dump_json(data):
+            continue
+        differing += 1
+        if fix:
+            write_json(json_file, data)
+            print(f"  [OK] Rewrote {json_file}")
+        else:
+            print(f"  [WARNING] {json_file} is not in the standard formatting")
+    print(f"\n{differing} of {len(files)} files differ from the standard formatting "
+          f"(serializer: {'orjson' if orjson is not None else 'json'})")
+    if fix:
+        print(OUTPUT_STATS.summary())
+
+if __name__ == '__main__':
+    main()
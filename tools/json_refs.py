@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Direct references to strings inside a parsed JSON tree.
+Extraction records each string as its (container, key) pair, so translations are
+written back with one item assignment instead of building, parsing and walking
+a path string from the root.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+Container = Union[dict, list]
+Key = Union[str, int]
+
+class StringRefs:
+    """
+    Compact list of (container, key) handles, in traversal order.
+    Stored as parallel lists; dotted paths (``opTypes[3].weapons[1].wepName``) are
+    only built when requested with ``with_paths``.
+    """
+
+    __slots__ = ('containers', 'keys', 'paths')
+
+    def __init__(self, with_paths: bool = False):
+        self.containers: List[Container] = []
+        self.keys: List[Key] = []
+        self.paths: Optional[List[str]] = [] if with_paths else None
+
+    def add(self, container: Container, key: Key, path: Optional[str] = None):
+        self.containers.append(container)
+        self.keys.append(key)
+        if self.paths is not None:
+            self.paths.append(path)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def texts(self) -> List[str]:
+        """Current value of every referenced string."""
+        return [container[key] for container, key in zip(self.containers, self.keys)]
+
+    def write(self, values: Iterable[Any]):
+        """Write ``values`` back, one per reference, in order."""
+        for container, key, value in zip(self.containers, self.keys, values):
+            container[key] = value
+
+    def translate(self, lookup: Dict[str, str]):
+        """Replace every referenced string by its entry in ``lookup`` (unchanged if missing)."""
+        for container, key in zip(self.containers, self.keys):
+            container[key] = lookup.get(container[key], container[key])
+
+    def locations(self) -> Dict[str, str]:
+        """Path -> current text (requires ``with_paths``)."""
+        return {path: container[key] for path, container, key
+                in zip(self.paths, self.containers, self.keys)}
+
+    def handles(self) -> Dict[str, Tuple[Container, Key]]:
+        """Path -> (container, key) (requires ``with_paths``)."""
+        return {path: (container, key) for path, container, key
+                in zip(self.paths, self.containers, self.keys)}
@@ -0,0 +1,59 @@
+"""
+Importable access to the Kill Team dataset.
+Team files are parsed on first access to their killteamId and kept in a bounded LRU;
+shared files are parsed on first use:
+
+    from killteam_data import get_loader
+    team = get_loader("es").team("IMP-CI")
+
+Any entity ID resolves through a persisted index, parsing only the file defining it:
+
+    from killteam_data import get_id_index
+    weapon = get_id_index().resolve("IMP-CI-DEN-SD", "es", kind="weapons")
+
+and the rules text of a language is searched with BM25:
+
+    from killteam_data import get_search_index
+    hits = get_search_index("es").search("repetir tirada")
+
+Datacards take the weapon rules of each profile from the table built by build_rule_table.py
+(with --allow-dangling while some profiles reference weapon rules that are not defined):
+
+    from killteam_data import get_rule_table
+    rules = get_rule_table("es").profile_rules("IMP-CI-DEN-SD-0")
+
+Weapon profiles can be queried as NumPy columns (numpy is only imported by these):
+
+    from killteam_data import load_weapon_table, default_weapon_table_path
+    table = load_weapon_table(default_weapon_table_path("en"))
+    melee = table["profile_id"][table["wep_type"] == table.category("M")]
+"""
+
+import importlib
+
+# Public name -> submodule defining it. Submodules are imported on first access, so a
+# process using only the loader or the bundle does not import the index, search or NumPy code.
+_EXPORTS = {
+    'DEFAULT_TEAM_CACHE_SIZE': 'loader', 'SHARED_FILES': 'loader', 'DatasetLoader': 'loader',
+    'LoaderStats': 'loader', 'get_loader': 'loader',
+    'ENTITY_FIELDS': 'id_index', 'IdIndex': 'id_index', 'IdLocation': 'id_index',
+    'get_id_index': 'id_index',
+    'SearchHit': 'search', 'SearchIndex': 'search', 'analyze': 'search', 'get_search_index': 'search',
+    'DanglingRuleError': 'rule_table', 'ResolvedRule': 'rule_table', 'WeaponRuleTable': 'rule_table',
+    'build_rule_table': 'rule_table', 'get_rule_table': 'rule_table',
+    'WeaponTable': 'weapon_table', 'build_weapon_table': 'weapon_table',
+    'default_weapon_table_path': 'weapon_table', 'load_weapon_table': 'weapon_table',
+    'save_weapon_table': 'weapon_table',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,3 @@
+from killteam_data.loader import main
+
+main()
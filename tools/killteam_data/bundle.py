@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Compact binary bundle of one language of the dataset, read through mmap.
+Every JSON file of en/ or es/ (teams, packs, rules, universal_*) is compiled into one
+file holding a string table (each distinct string stored once) and a node section
+in which containers keep an offset index of their children. Opening a bundle only
+reads its header; objects are decoded when they are accessed.
+
+Layout (little-endian):
+    header   magic, version, string count, then the positions of the sections below
+    strings  (count + 1) uint32 offsets into the UTF-8 string data, then the data
+    nodes    tagged values: null/false/true, int64, float64, string id,
+             list (count, child offsets) or dict (count, (key id, child offset) pairs)
+    root     a dict node mapping relative paths (teams/IMP-CI.json) to each file's root node
+"""
+
+import mmap
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from killteam_data.loader import SHARED_FILES, parse_json
+
+MAGIC = b"KTB1"
+BUNDLE_VERSION = 1
+
+HEADER = struct.Struct('<4sIIIIII')   # magic, version, strings, index pos, data pos, nodes pos, root pos
+U32 = struct.Struct('<I')
+PAIR = struct.Struct('<II')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+
+# Node tags
+NULL, FALSE, TRUE, INT, FLOAT, STRING, LIST, DICT = range(8)
+
+def bundle_sources(folder: Path) -> List[Path]:
+    """Every JSON file of a language folder, in a stable order."""
+    return sorted(folder.rglob('*.json'))
+
+class BundleWriter:
+    """Encodes JSON values into the string table and node section of a bundle."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.nodes = bytearray()
+        # Identical scalars are encoded once and shared
+        self.scalars: Dict[Any, int] = {}
+
+    def string_id(self, text: str) -> int:
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+        return string_id
+
+    def add(self, value: Any) -> int:
+        """Encode ``value`` and return the position of its node in the node section."""
+        if isinstance(value, dict):
+            children = [(self.string_id(key), self.add(child)) for key, child in value.items()]
+            position = len(self.nodes)
+            self.nodes.append(DICT)
+            self.nodes += U32.pack(len(children))
+            for key_id, child in children:
+                self.nodes += PAIR.pack(key_id, child)
+            return position
+        if isinstance(value, list):
+            children = [self.add(child) for child in value]
+            position = len(self.nodes)
+            self.nodes.append(LIST)
+            self.nodes += U32.pack(len(children))
+            for child in children:
+                self.nodes += U32.pack(child)
+            return position
+
+        key = (type(value), value)
+        position = self.scalars.get(key)
+        if position is not None:
+            return position
+        position = len(self.nodes)
+        if value is None:
+            self.nodes.append(NULL)
+        elif value is True or value is False:
+            self.nodes.append(TRUE if value else FALSE)
+        elif isinstance(value, int):
+            self.nodes.append(INT)
+            self.nodes += INT64.pack(value)
+        elif isinstance(value, float):
+            self.nodes.append(FLOAT)
+            self.nodes += FLOAT64.pack(value)
+        elif isinstance(value, str):
+            self.nodes.append(STRING)
+            self.nodes += U32.pack(self.string_id(value))
+        else:
+            raise TypeError(f"Cannot bundle a value of type {type(value).__name__}")
+        self.scalars[key] = position
+        return position
+
+    def to_bytes(self, root: int) -> bytes:
+        """The complete bundle: header, string table, then nodes (positions made absolute)."""
+        encoded = [text.encode('utf-8') for text in self.strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        index_pos = HEADER.size
+        data_pos = index_pos + U32.size * len(offsets)
+        nodes_pos = data_pos + offsets[-1]
+        header = HEADER.pack(MAGIC, BUNDLE_VERSION, len(encoded), index_pos, data_pos, nodes_pos,
+                             nodes_pos + root)
+        return b''.join([header, struct.pack(f'<{len(offsets)}I', *offsets), *encoded,
+                         relocate(self.nodes, nodes_pos)])
+
+def relocate(nodes: bytearray, base: int) -> bytes:
+    """Shift every child offset of the node section by ``base`` (node positions become absolute)."""
+    nodes = bytearray(nodes)
+    position = 0
+    while position < len(nodes):
+        tag = nodes[position]
+        if tag in (LIST, DICT):
+            count = U32.unpack_from(nodes, position + 1)[0]
+            entry_size = U32.size if tag == LIST else PAIR.size
+            child = position + 5 + (entry_size - U32.size)
+            for _ in range(count):
+                U32.pack_into(nodes, child, U32.unpack_from(nodes, child)[0] + base)
+                child += entry_size
+            position += 5 + entry_size * count
+        elif tag in (INT, FLOAT):
+            position += 9
+        elif tag == STRING:
+            position += 5
+        else:
+            position += 1
+    return bytes(nodes)
+
+def build_bundle(folder: Path, output: Path) -> Dict[str, int]:
+    """Compile every JSON file of ``folder`` into a bundle at ``output``; returns size statistics."""
+    folder = Path(folder)
+    writer = BundleWriter()
+    files = {path.relative_to(folder).as_posix(): writer.add(parse_json(path))
+             for path in bundle_sources(folder)}
+    # The root maps relative paths to file roots; it reuses the dict encoding with pre-encoded children
+    root = len(writer.nodes)
+    writer.nodes.append(DICT)
+    writer.nodes += U32.pack(len(files))
+    for name, position in files.items():
+        writer.nodes += PAIR.pack(writer.string_id(name), position)
+    data = writer.to_bytes(root)
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + '.tmp')
+    tmp_path.write_bytes(data)
+    tmp_path.replace(output)
+    return {"files": len(files), "strings": len(writer.strings), "bytes": len(data),
+            "source_bytes": sum(path.stat().st_size for path in bundle_sources(folder))}
+
+class BundleDict(Mapping):
+    """Read-only dict view of a bundled object; values are decoded when accessed."""
+
+    __slots__ = ('bundle', 'position', 'count', '_index')
+
+    def __init__(self, bundle: 'Bundle', position: int):
+        self.bundle = bundle
+        self.position = position
+        self.count = U32.unpack_from(bundle.buffer, position + 1)[0]
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Key -> child node position, built on first lookup."""
+        if self._index is None:
+            buffer = self.bundle.buffer
+            string = self.bundle.string
+            start = self.position + 5
+            self._index = {string(key_id): child for key_id, child
+                           in (PAIR.unpack_from(buffer, start + i * PAIR.size) for i in range(self.count))}
+        return self._index
+
+    def __getitem__(self, key: str) -> Any:
+        return self.bundle.value(self.index[key])
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"BundleDict({len(self)} keys)"
+
+    def to_python(self) -> Dict[str, Any]:
+        """Fully decoded copy as plain dicts and lists."""
+        return {key: to_python(self.bundle.value(child)) for key, child in self.index.items()}
+
+class BundleList(Sequence):
+    """Read-only list view of a bundled array; items are decoded when accessed."""
+
+    __slots__ = ('bundle', 'position', 'count')
+
+    def __init__(self, bundle: 'Bundle', position: int):
+        self.bundle = bundle
+        self.position = position
+        self.count = U32.unpack_from(bundle.buffer, position + 1)[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("bundle list index out of range")
+        child = U32.unpack_from(self.bundle.buffer, self.position + 5 + index * U32.size)[0]
+        return self.bundle.value(child)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"BundleList({len(self)} items)"
+
+    def to_python(self) -> List[Any]:
+        """Fully decoded copy as plain dicts and lists."""
+        return [to_python(item) for item in self]
+
+def to_python(value: Any) -> Any:
+    """Plain Python value of a decoded node (views are decoded recursively)."""
+    return value.to_python() if isinstance(value, (BundleDict, BundleList)) else value
+
+class Bundle:
+    """A memory-mapped bundle; ``bundle.file('teams/IMP-CI.json')`` returns a lazy view."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.string_count, self.index_pos, self.data_pos, self.nodes_pos, root = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {BUNDLE_VERSION} dataset bundle")
+        self._strings: Dict[int, str] = {}
+        self.root = BundleDict(self, root)
+
+    def string(self, string_id: int) -> str:
+        """Entry of the string table, decoded once."""
+        text = self._strings.get(string_id)
+        if text is None:
+            start, end = struct.unpack_from('<II', self.buffer, self.index_pos + string_id * U32.size)
+            text = self._strings[string_id] = str(self.buffer[self.data_pos + start:self.data_pos + end],
+                                                   'utf-8')
+        return text
+
+    def value(self, position: int) -> Any:
+        """Decode the node at ``position``: a scalar, or a lazy view for containers."""
+        tag = self.buffer[position]
+        if tag == STRING:
+            return self.string(U32.unpack_from(self.buffer, position + 1)[0])
+        if tag == DICT:
+            return BundleDict(self, position)
+        if tag == LIST:
+            return BundleList(self, position)
+        if tag == INT:
+            return INT64.unpack_from(self.buffer, position + 1)[0]
+        if tag == FLOAT:
+            return FLOAT64.unpack_from(self.buffer, position + 1)[0]
+        return (None, False, True)[tag]
+
+    def files(self) -> List[str]:
+        """Relative paths of the bundled files."""
+        return list(self.root)
+
+    def file(self, name: str) -> Any:
+        """Root object of a bundled file, e.g. ``teams/IMP-CI.json``."""
+        return self.root[name]
+
+    def team(self, killteam_id: str) -> BundleDict:
+        return self.root[f"teams/{killteam_id}.json"]
+
+    def team_ids(self) -> List[str]:
+        return sorted(name[len('teams/'):-len('.json')] for name in self.root if name.startswith('teams/'))
+
+    def shared(self, name: str) -> Any:
+        """A shared file by its SHARED_FILES name (as DatasetLoader.shared)."""
+        return self.root[SHARED_FILES[name]]
+
+    def close(self):
+        self.buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> 'Bundle':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
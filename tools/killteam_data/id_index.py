@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Persisted index of every entity ID in the dataset.
+Each killteamId, opTypeId, abilityId, ployId, eqId, wepId, wepprofileId and the ``id`` of
+weapon rules, actions, ops and core rules is mapped to its language, file and position
+(``opTypes[3].weapons[1]``), so an ID is resolved with one dict lookup and by parsing
+only the file that defines it.
+
+The index is stored in .id_index.json next to en/ and es/ with the size, modification time
+and content hash of every file it was built from. Opening it checks those signatures and
+re-scans only the files whose content changed (and drops deleted ones).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from killteam_data.loader import DATA_ROOT, SHARED_FILES, DatasetLoader, get_loader, parse_json
+
+INDEX_VERSION = 1
+
+# Location of the index (override with KT_ID_INDEX)
+DEFAULT_INDEX_PATH = Path(os.getenv("KT_ID_INDEX", DATA_ROOT / ".id_index.json"))
+
+# Entity kind (the key of the list holding the entities) -> field holding their ID.
+# Team files are indexed under "teams" and rules_key.json, a bare list, under "rules_key".
+# WR entries of weapon profiles only reference weapon rules and are not indexed.
+ENTITY_FIELDS = {
+    "teams": "killteamId",
+    "opTypes": "opTypeId",
+    "abilities": "abilityId",
+    "teamAbilities": "abilityId",
+    "ploys": "ployId",
+    "equipments": "eqId",
+    "weapons": "wepId",
+    "profiles": "wepprofileId",
+    "weapon_rules": "id",
+    "actions": "id",
+    "ops": "id",
+    "steps": "id",
+    "rules_terrain": "id",
+    "rules_key": "id",
+}
+
+Key = Union[str, int]
+
+class IdLocation(NamedTuple):
+    """Where an entity is defined: ``file`` is relative to the language folder."""
+    lang: str
+    file: str
+    kind: str
+    path: Tuple[Key, ...]
+
+    @property
+    def dotted(self) -> str:
+        """Path in the ``opTypes[3].weapons[1]`` notation of the other tools."""
+        dotted = ''
+        for key in self.path:
+            dotted += f"[{key}]" if isinstance(key, int) else (f".{key}" if dotted else key)
+        return dotted
+
+def file_entries(path: Path, name: str) -> List[List[Any]]:
+    """[kind, id, path] of every entity defined in one dataset file."""
+    entries = []
+
+    def walk(value: Any, container: str, path: List[Key]):
+        if isinstance(value, dict):
+            field = ENTITY_FIELDS.get(container)
+            if field and isinstance(value.get(field), str):
+                entries.append([container, value[field], list(path)])
+            for key, child in value.items():
+                walk(child, key, path + [key])
+        elif isinstance(value, list):
+            for i, child in enumerate(value):
+                walk(child, container, path + [i])
+
+    parent = Path(name).parent.name
+    walk(parse_json(path), parent or Path(name).stem, [])
+    return entries
+
+def file_signature(path: Path, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Size, modification time and content hash; the hash is reused from ``cached`` if size and mtime match."""
+    stat = path.stat()
+    if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+        return {"size": cached["size"], "mtime": cached["mtime"], "hash": cached["hash"]}
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns,
+            "hash": hashlib.sha256(path.read_bytes()).hexdigest()[:16]}
+
+def dataset_languages(root: Path) -> List[str]:
+    """Language folders of the dataset (those holding a teams/ folder)."""
+    return sorted(path.parent.name for path in Path(root).glob('*/teams') if path.is_dir())
+
+class IdIndex:
+    """
+    ID -> locations of one dataset root. Most IDs have a single location per language;
+    a few are shared by entities of different kinds (a weapon and its action), hence
+    ``kind`` on lookups.
+    """
+
+    def __init__(self, root: Path = DATA_ROOT, path: Path = DEFAULT_INDEX_PATH):
+        self.root = Path(root)
+        self.path = Path(path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.ids: Dict[str, List[IdLocation]] = {}
+        # Files re-scanned by the last refresh
+        self.rescanned: List[str] = []
+        # Loaders of self.root per language, for resolve
+        self._loaders: Dict[str, DatasetLoader] = {}
+        self.load()
+        self.refresh()
+
+    def load(self):
+        """Read the persisted index; a missing, unreadable or outdated one is rebuilt."""
+        try:
+            data = parse_json(self.path)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self.files = data.get("files", {})
+
+    def refresh(self) -> bool:
+        """Re-scan files whose content changed since they were indexed; True if the index changed."""
+        files = {}
+        self.rescanned = []
+        for lang in dataset_languages(self.root):
+            for path in sorted((self.root / lang).rglob('*.json')):
+                key = f"{lang}/{path.relative_to(self.root / lang).as_posix()}"
+                cached = self.files.get(key)
+                signature = file_signature(path, cached)
+                if cached and cached["hash"] == signature["hash"]:
+                    files[key] = dict(cached, **signature)
+                    continue
+                try:
+                    signature["entries"] = file_entries(path, key.split('/', 1)[1])
+                except ValueError as e:
+                    raise ValueError(f"Cannot index {path}: {e}") from e
+                files[key] = signature
+                self.rescanned.append(key)
+
+        changed = bool(self.rescanned) or files != self.files
+        self.files = files
+        self.ids = {}
+        for key, entry in files.items():
+            lang, name = key.split('/', 1)
+            for kind, entity_id, path in entry["entries"]:
+                self.ids.setdefault(entity_id, []).append(IdLocation(lang, name, kind, tuple(path)))
+        if changed:
+            self.save()
+        return changed
+
+    def save(self):
+        """Write the index atomically (compact, it is only read by this module)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, ensure_ascii=False,
+                      separators=(',', ':'))
+        tmp_path.replace(self.path)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, entity_id: str, lang: Optional[str] = None, kind: Optional[str] = None) -> List[IdLocation]:
+        """Every location of ``entity_id``, optionally restricted to a language and an entity kind."""
+        return [location for location in self.ids.get(entity_id, ())
+                if (lang is None or location.lang == lang) and (kind is None or location.kind == kind)]
+
+    def locate(self, entity_id: str, lang: str = "en", kind: Optional[str] = None) -> IdLocation:
+        """The single location of ``entity_id`` in a language; KeyError if it is unknown or ambiguous."""
+        locations = self.find(entity_id, lang, kind)
+        if len(locations) != 1:
+            detail = "unknown" if not locations else \
+                "ambiguous between " + ", ".join(location.kind for location in locations)
+            raise KeyError(f"{entity_id} ({lang}): {detail}")
+        return locations[0]
+
+    def loader(self, lang: str) -> DatasetLoader:
+        """DatasetLoader of a language under the index's root (the shared one for DATA_ROOT)."""
+        if self.root == DATA_ROOT:
+            return get_loader(lang)
+        if lang not in self._loaders:
+            self._loaders[lang] = DatasetLoader(lang, self.root)
+        return self._loaders[lang]
+
+    def resolve(self, entity_id: str, lang: str = "en", kind: Optional[str] = None,
+                loader: Optional[DatasetLoader] = None) -> Any:
+        """
+        The entity object itself. Only its file is parsed, through a DatasetLoader of
+        the index's root, so team files stay in its LRU and shared files are kept.
+        """
+        location = self.locate(entity_id, lang, kind)
+        loader = loader or self.loader(lang)
+        shared = {path: name for name, path in SHARED_FILES.items()}
+        if location.file.startswith('teams/'):
+            value = loader.team(location.file[len('teams/'):-len('.json')])
+        elif location.file in shared:
+            value = loader.shared(shared[location.file])
+        else:
+            value = parse_json(loader.folder / location.file)
+        for key in location.path:
+            value = value[key]
+        return value
+
+_index: Optional[IdIndex] = None
+_index_lock = threading.Lock()
+
+def get_id_index() -> IdIndex:
+    """Shared index of DATA_ROOT, loaded (and brought up to date) on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = IdIndex()
+        return _index
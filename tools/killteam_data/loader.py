@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Lazy loader for the dataset in en/ and es/.
+Nothing is parsed up front: a team file is parsed the first time its killteamId is
+requested and kept in a bounded LRU, and shared files (weapon_rules.json,
+universal_equipment.json...) are parsed on first use and then kept. Returned
+objects are shared with the cache and must be treated as read-only.
+
+Usage: python -m killteam_data [language] [killteamId ...]   (compare with parsing everything)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Folder holding en/ and es/ (override with KT_DATA_ROOT)
+DATA_ROOT = Path(os.getenv("KT_DATA_ROOT", Path(__file__).resolve().parents[2]))
+
+# Team files kept parsed per language (override with KT_TEAM_CACHE_SIZE)
+DEFAULT_TEAM_CACHE_SIZE = int(os.getenv("KT_TEAM_CACHE_SIZE", "8"))
+
+# Shared files by name, relative to the language folder
+SHARED_FILES = {
+    "weapon_rules": "weapon_rules.json",
+    "universal_equipment": "universal_equipment.json",
+    "universal_actions": "universal_actions.json",
+    "rules_key": "rules_key.json",
+    "rules_sequence": "rules_sequence.json",
+    "rules_terrain": "rules_terrain.json",
+    "ops": "packs/ops_2025.json",
+    "packs_actions": "packs/packs_actions.json",
+}
+
+def parse_json(path: Path) -> Any:
+    """Parse a JSON file, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class LoaderStats:
+    """Cache behaviour of a DatasetLoader."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.parse_time = 0.0
+
+    def summary(self) -> str:
+        requests = self.hits + self.misses
+        return (f"{requests} team lookups, {self.hits} hits ({self.hits / max(requests, 1) * 100:.0f}%), "
+                f"{self.misses} parsed, {self.evictions} evicted, {self.parse_time * 1000:.1f} ms parsing")
+
+class DatasetLoader:
+    """
+    Team-level lazy access to one language of the dataset.
+    At most ``max_teams`` parsed team files are kept; the least recently used one is
+    evicted when another is loaded. Safe to share between threads.
+    """
+
+    def __init__(self, lang: str = "en", root: Path = DATA_ROOT,
+                 max_teams: int = DEFAULT_TEAM_CACHE_SIZE):
+        self.lang = lang
+        self.folder = Path(root) / lang
+        self.max_teams = max(1, max_teams)
+        self.stats = LoaderStats()
+        self.lock = threading.Lock()
+        self._teams: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._shared: Dict[str, Any] = {}
+        self._team_ids: Optional[List[str]] = None
+
+    def team_ids(self) -> List[str]:
+        """Every killteamId of the language, from the file names (nothing is parsed)."""
+        if self._team_ids is None:
+            self._team_ids = sorted(path.stem for path in (self.folder / 'teams').glob('*.json'))
+        return self._team_ids
+
+    def __contains__(self, killteam_id: str) -> bool:
+        return (self.folder / 'teams' / f"{killteam_id}.json").is_file()
+
+    def team(self, killteam_id: str) -> Dict[str, Any]:
+        """The kill team with this killteamId; raises KeyError if there is none."""
+        with self.lock:
+            team = self._teams.get(killteam_id)
+            if team is not None:
+                self._teams.move_to_end(killteam_id)
+                self.stats.hits += 1
+                return team
+
+        path = self.folder / 'teams' / f"{killteam_id}.json"
+        if '/' in killteam_id or not path.is_file():
+            raise KeyError(killteam_id)
+        start_time = time.perf_counter()
+        team = parse_json(path)
+        elapsed = time.perf_counter() - start_time
+
+        with self.lock:
+            self.stats.misses += 1
+            self.stats.parse_time += elapsed
+            # Another thread may have loaded it meanwhile; keep a single copy
+            team = self._teams.setdefault(killteam_id, team)
+            self._teams.move_to_end(killteam_id)
+            while len(self._teams) > self.max_teams:
+                self._teams.popitem(last=False)
+                self.stats.evictions += 1
+        return team
+
+    def teams(self) -> Iterator[Dict[str, Any]]:
+        """Every kill team in killteamId order, loaded one at a time through the cache."""
+        for killteam_id in self.team_ids():
+            yield self.team(killteam_id)
+
+    def resident_teams(self) -> List[str]:
+        """killteamIds currently parsed, least recently used first."""
+        with self.lock:
+            return list(self._teams)
+
+    def shared(self, name: str) -> Any:
+        """A shared file by its SHARED_FILES name, parsed on first use and then kept."""
+        if name not in SHARED_FILES:
+            raise KeyError(name)
+        data = self._shared.get(name)
+        if data is None:
+            data = parse_json(self.folder / SHARED_FILES[name])
+            with self.lock:
+                data = self._shared.setdefault(name, data)
+        return data
+
+    @property
+    def weapon_rules(self) -> Any:
+        return self.shared("weapon_rules")
+
+    @property
+    def universal_equipment(self) -> Any:
+        return self.shared("universal_equipment")
+
+    def clear(self):
+        """Drop every parsed file (the statistics are kept)."""
+        with self.lock:
+            self._teams.clear()
+            self._shared.clear()
+
+_loaders: Dict[str, DatasetLoader] = {}
+_loaders_lock = threading.Lock()
+
+def get_loader(lang: str = "en") -> DatasetLoader:
+    """Shared loader for a language, created on first use."""
+    with _loaders_lock:
+        if lang not in _loaders:
+            _loaders[lang] = DatasetLoader(lang)
+        return _loaders[lang]
+
+def main():
+    args = sys.argv[1:]
+    lang = args[0] if args and (DATA_ROOT / args[0]).is_dir() else "en"
+    loader = DatasetLoader(lang)
+    requested = [arg for arg in args if arg != lang] or loader.team_ids()[:2]
+
+    print("=" * 70)
+    print(f"Dataset loader: {lang}/, {len(loader.team_ids())} teams, cache of {loader.max_teams}")
+    print("=" * 70)
+
+    # Everything parsed up front, as a service does at startup today
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    everything = [parse_json(path) for path in sorted(loader.folder.rglob('*.json'))]
+    eager_time = time.perf_counter() - start_time
+    eager_memory = tracemalloc.get_traced_memory()[0]
+    del everything
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    for killteam_id in requested:
+        team = loader.team(killteam_id)
+        print(f"  {killteam_id}: {team.get('killteamName')} ({len(team.get('opTypes', []))} operative types)")
+    loader.weapon_rules
+    lazy_time = time.perf_counter() - start_time
+    lazy_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"\nParse everything:      {eager_time * 1000:7.1f} ms, {eager_memory / 1024 / 1024:6.2f} MB")
+    print(f"Lazy ({len(requested)} teams + rules): {lazy_time * 1000:7.1f} ms, {lazy_memory / 1024 / 1024:6.2f} MB")
+    print(f"Loader: {loader.stats.summary()}")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Weapon rules of every weapon profile of a language, joined once at build time.
+Each ``WR`` entry of a profile ({id, number, details, prefix_num}) is resolved against
+weapon_rules.json and the team-specific rules of the team files, and stored as an
+interned (rule, parameters) pair: identical references ("Lethal 5+", "Heavy (Dash only)")
+share one pair, and each rule definition is stored once. A build fails on references to
+rules that are defined nowhere, unless it is asked to allow them: they are then left out
+of the rules of their profile and listed in the table.
+
+Layout of <language>.rule_table.json (written next to en/ and es/ by build_rule_table.py):
+    rules     [id, name, description, team] per rule definition, by id
+    pairs     [rule index, number, details, prefix_num] per distinct reference
+    profiles  wepprofileId -> pair indexes, in the order of the profile's WR array
+              (profiles without one are keyed <wepId>-<index>, see profile_id)
+    dangling  [file, path of the WR entry, rule id] per reference left out (allow_dangling builds)
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from killteam_data.loader import DATA_ROOT, DatasetLoader, parse_json
+
+TABLE_VERSION = 1
+
+# Parameters a WR entry can carry besides its id
+PARAMETERS = ('number', 'details', 'prefix_num')
+
+class DanglingRuleError(ValueError):
+    """Raised by a build when weapon profiles reference rules that are not defined."""
+
+    def __init__(self, lang: str, references: List[Tuple[str, str, str]]):
+        rule_ids = sorted({rule_id for _, _, rule_id in references})
+        super().__init__(f"{len(references)} weapon rule references of {lang}/ are not defined: "
+                         + ", ".join(rule_ids))
+        # (file, path of the WR entry, rule id) of every dangling reference
+        self.references = references
+
+class ResolvedRule(NamedTuple):
+    """A weapon rule of a profile with the parameters of the reference."""
+    id: str
+    name: str
+    description: str
+    team: Any
+    number: Optional[int]
+    details: Optional[str]
+    prefix_num: Optional[int]
+
+def default_table_path(lang: str) -> Path:
+    return DATA_ROOT / f"{lang}.rule_table.json"
+
+def rule_definitions(loader: DatasetLoader) -> Dict[str, Dict[str, Any]]:
+    """Every weapon rule of weapon_rules.json and of the team files, by id."""
+    definitions = {}
+    sources = [("weapon_rules.json", loader.weapon_rules.get("weapon_rules", []))]
+    sources += [(f"teams/{team['killteamId']}.json", team.get("weapon_rules", [])) for team in loader.teams()]
+    for name, rules in sources:
+        for rule in rules:
+            existing = definitions.get(rule["id"])
+            if existing is not None and existing != rule:
+                raise ValueError(f"Weapon rule {rule['id']} is defined differently in {name}")
+            definitions[rule["id"]] = rule
+    return definitions
+
+def profile_id(weapon: Dict[str, Any], profile: Dict[str, Any], index: int) -> str:
+    """
+    wepprofileId of a profile. A few equipment weapons have profiles without one; they
+    get the ``<wepId>-<index>`` id the other profiles follow.
+    """
+    return profile.get("wepprofileId") or f"{weapon.get('wepId')}-{index}"
+
+def weapon_profiles(data: Any, path: str = '') -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """(path, wepprofileId, profile) of every profile of every weapon of a file."""
+    if isinstance(data, dict):
+        if "wepId" in data and isinstance(data.get("profiles"), list):
+            for i, profile in enumerate(data["profiles"]):
+                yield f"{path}.profiles[{i}]", profile_id(data, profile, i), profile
+            return
+        for key, value in data.items():
+            yield from weapon_profiles(value, f"{path}.{key}" if path else key)
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            yield from weapon_profiles(value, f"{path}[{i}]")
+
+def build_rule_table(lang: str = "en", root: Path = DATA_ROOT, allow_dangling: bool = False) -> Dict[str, Any]:
+    """
+    Resolve the WR entries of every weapon profile of a language.
+    Raises DanglingRuleError listing every reference to an undefined rule (with
+    ``allow_dangling`` they are recorded in the table's "dangling" list instead), and
+    ValueError for conflicting rule definitions or profile ids.
+    """
+    loader = DatasetLoader(lang, root)
+    # Every team is read twice (rule definitions, then profiles); keep them all parsed meanwhile
+    loader.max_teams = max(1, len(loader.team_ids()))
+    definitions = rule_definitions(loader)
+    rule_ids = sorted(definitions)
+    rule_index = {rule_id: i for i, rule_id in enumerate(rule_ids)}
+
+    pairs: Dict[Tuple[Any, ...], int] = {}
+    profiles: Dict[str, List[int]] = {}
+    dangling = []
+    files = [("universal_equipment.json", loader.universal_equipment)]
+    files += [(f"teams/{team['killteamId']}.json", team) for team in loader.teams()]
+    for name, data in files:
+        for path, wepprofile_id, profile in weapon_profiles(data):
+            indexes = []
+            for i, reference in enumerate(profile.get("WR") or []):
+                if reference.get("id") not in rule_index:
+                    dangling.append((name, f"{path}.WR[{i}]", str(reference.get("id"))))
+                    continue
+                pair = (rule_index[reference["id"]],) + tuple(reference.get(key) for key in PARAMETERS)
+                indexes.append(pairs.setdefault(pair, len(pairs)))
+            if wepprofile_id in profiles and profiles[wepprofile_id] != indexes:
+                raise ValueError(f"Weapon profile {wepprofile_id} appears twice with different rules ({name})")
+            profiles[wepprofile_id] = indexes
+    if dangling and not allow_dangling:
+        raise DanglingRuleError(lang, dangling)
+
+    return {
+        "version": TABLE_VERSION,
+        "lang": lang,
+        "rules": [[rule_id, definitions[rule_id].get("name"), definitions[rule_id].get("description"),
+                   definitions[rule_id].get("team")] for rule_id in rule_ids],
+        "pairs": [list(pair) for pair in pairs],
+        "profiles": profiles,
+        "dangling": [list(reference) for reference in dangling],
+    }
+
+def save_rule_table(table: Dict[str, Any], path: Path):
+    """Write a table atomically (compact, it is only read by WeaponRuleTable)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+    tmp_path.replace(path)
+
+class WeaponRuleTable:
+    """
+    Built weapon-rule join of one language. Resolving the rules of a profile is a dict
+    lookup and a list index per rule; weapon_rules.json is never read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        table = parse_json(self.path)
+        if table.get("version") != TABLE_VERSION:
+            raise ValueError(f"{self.path} is not a version {TABLE_VERSION} rule table; rebuild it")
+        self.lang = table["lang"]
+        self.profiles: Dict[str, List[int]] = table["profiles"]
+        rules = table["rules"]
+        self.pairs = [ResolvedRule(*rules[pair[0]], *pair[1:]) for pair in table["pairs"]]
+        # (file, path, rule id) of the references a build with allow_dangling left out
+        self.dangling: List[Tuple[str, str, str]] = [tuple(reference) for reference in table.get("dangling", [])]
+
+    def __contains__(self, wepprofile_id: str) -> bool:
+        return wepprofile_id in self.profiles
+
+    def profile_rules(self, wepprofile_id: str) -> List[ResolvedRule]:
+        """Rules of a profile, in WR order; KeyError for an unknown wepprofileId."""
+        return [self.pairs[i] for i in self.profiles[wepprofile_id]]
+
+    def team_rules(self, team: Dict[str, Any]) -> Dict[str, List[ResolvedRule]]:
+        """wepprofileId -> rules for every weapon profile of a parsed team (or universal_equipment)."""
+        return {wepprofile_id: self.profile_rules(wepprofile_id) for _, wepprofile_id, _ in weapon_profiles(team)}
+
+_tables: Dict[str, WeaponRuleTable] = {}
+_tables_lock = threading.Lock()
+
+def get_rule_table(lang: str = "en") -> WeaponRuleTable:
+    """Built table of a language (see build_rule_table.py), loaded on first use."""
+    with _tables_lock:
+        if lang not in _tables:
+            _tables[lang] = WeaponRuleTable(default_table_path(lang))
+        return _tables[lang]
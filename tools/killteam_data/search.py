@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+BM25 full-text search over the rules text of one language of the dataset.
+Every entity of the ID index (team, operative type, ability, ploy, equipment, weapon,
+action, weapon rule, op...) is a document made of its names, description,
+additionalRules, victoryPoints and effects; text of nested objects without an ID
+(operative options) belongs to the enclosing entity.
+
+Words are lower-cased, accents folded (``reacción`` matches ``reaccion``), hyphens dropped
+(``re-roll`` matches ``reroll``), stop words removed and a light stemmer of the language
+applied. BM25 weights are computed when the index is built, so a query only sums the
+precomputed weights of its terms' postings.
+
+The index of each language is stored in .search_index.<lang>.bin next to en/ and es/ and
+rebuilt when the content of any of its source files changes. Only the file signatures are
+JSON; terms and document columns are NUL-separated strings and every offset a uint32
+array, so loading is a few splits and array copies.
+"""
+
+import functools
+import heapq
+import json
+import math
+import re
+import struct
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from killteam_data.id_index import ENTITY_FIELDS, file_signature
+from killteam_data.loader import DATA_ROOT, parse_json
+
+MAGIC = b"KTS1"
+SEARCH_VERSION = 2
+
+# magic, version, size of the JSON header that follows (the body is in native byte order)
+HEADER = struct.Struct('<4sII')
+U32 = struct.Struct('=I')
+
+# Sections of the body after the postings and texts, as named in the header
+STRING_SECTIONS = ("terms", "ids", "kinds", "files", "names")
+ARRAY_SECTIONS = ("term_postings", "texts")
+
+# First offset recorded for terms that only occur in a document's names
+NAME_ONLY = 0xFFFFFFFF
+
+# BM25 parameters; names count NAME_BOOST times as much as a word of the rules text
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_BOOST = 2
+
+# Fields indexed besides the names (keys ending in Name, ``name`` and ``title``)
+TEXT_FIELDS = {"description", "additionalRules", "victoryPoints", "effects"}
+
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 50
+
+WORD = re.compile(r"[^\W_]+(?:['’-][^\W_]+)*")
+
+STOP_WORDS = {
+    "en": set("a an and are as at be by can for from has have if in into is it its of on or "
+              "that the their them then this to was were when which with you your".split()),
+    "es": set("a al con de del el en es la las lo los o para por que se si su sus u un una unas "
+              "unos y".split()),
+}
+
+def fold(word: str) -> str:
+    """Lower case without accents, hyphens or apostrophe suffixes ("operative's" -> "operative")."""
+    word = unicodedata.normalize('NFKD', word.lower())
+    word = ''.join(char for char in word if not unicodedata.combining(char))
+    word = re.sub(r"['’]s$", '', word)
+    return re.sub(r"['’-]", '', word)
+
+def stem_en(word: str) -> str:
+    """Light English stemmer: plurals, -ed, -ing, -ly and a final e."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    for suffix in ('ing', 'ed', 'ly'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]
+    return word
+
+def stem_es(word: str) -> str:
+    """Light Spanish stemmer (on folded words): plurals, -mente and the gender vowel."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith('mente') and len(word) > 7:
+        word = word[:-5]
+    if word.endswith('ces') and len(word) > 4:
+        word = word[:-3] + 'z'
+    elif word.endswith('es') and len(word) > 4 and word[-3] not in 'aeiou':
+        word = word[:-2]
+    elif word.endswith('s') and len(word) > 3:
+        word = word[:-1]
+    if word[-1] in 'aoe' and len(word) > 3:
+        word = word[:-1]
+    return word
+
+STEMMERS = {"en": stem_en, "es": stem_es}
+
+# Words whose term is kept; the dataset has about 15000 distinct words per language
+TERM_CACHE_SIZE = 65536
+
+@functools.lru_cache(maxsize=TERM_CACHE_SIZE)
+def word_term(word: str, lang: str) -> Optional[str]:
+    """Index term of one word, or None for stop words and single letters."""
+    folded = fold(word)
+    if folded and folded not in STOP_WORDS.get(lang, ()) and (len(folded) > 1 or folded.isdigit()):
+        return STEMMERS.get(lang, lambda word: word)(folded)
+    return None
+
+def analyze(text: str, lang: str) -> List[str]:
+    """Index terms of a text, in order."""
+    terms = []
+    for match in WORD.finditer(text):
+        term = word_term(match.group(), lang)
+        if term is not None:
+            terms.append(term)
+    return terms
+
+def is_name_field(key: str) -> bool:
+    return key.endswith('Name') or key in ('name', 'title')
+
+def field_strings(value: Any) -> List[str]:
+    """Non-empty strings of a text field (a string or a list of strings)."""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [text for item in value for text in field_strings(item)]
+    return []
+
+def file_documents(path: Path, name: str) -> List[Dict[str, Any]]:
+    """Searchable entities of one dataset file, with their names and text."""
+    documents = []
+
+    def walk(value: Any, container: str, document: Optional[Dict[str, Any]]):
+        if isinstance(value, dict):
+            field = ENTITY_FIELDS.get(container)
+            if field and isinstance(value.get(field), str):
+                document = {"id": value[field], "kind": container, "file": name, "names": [], "text": []}
+                documents.append(document)
+            for key, child in value.items():
+                if document is not None and is_name_field(key):
+                    document["names"] += field_strings(child)
+                elif document is not None and key in TEXT_FIELDS:
+                    document["text"] += field_strings(child)
+                else:
+                    walk(child, key, document)
+        elif isinstance(value, list):
+            for child in value:
+                walk(child, container, document)
+
+    walk(parse_json(path), Path(name).parent.name or Path(name).stem, None)
+    return [document for document in documents if document["names"] or document["text"]]
+
+class SearchHit(NamedTuple):
+    id: str
+    kind: str
+    file: str
+    score: float
+    name: str
+    snippet: str
+
+class SearchIndex:
+    """
+    Inverted index of one language. Postings are kept as stored: a term maps to its row
+    of ``term_postings``, the position and length of its document numbers (uint32), BM25
+    weights (float32) and first offsets in the document text (uint32) in the body, decoded
+    when a query uses the term; document text is only decoded for the snippets of the hits.
+    """
+
+    def __init__(self, lang: str = "en", root: Path = DATA_ROOT, path: Optional[Path] = None):
+        self.lang = lang
+        self.folder = Path(root) / lang
+        self.path = Path(path or Path(root) / f".search_index.{lang}.bin")
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # (id, kind, file, names) per document number
+        self.documents: List[Tuple[str, str, str, str]] = []
+        # term -> row of term_postings, which holds (body offset, document count) per row
+        self.terms: Dict[str, int] = {}
+        self.term_postings = array('I')
+        # Start of each document's text in the body, plus the end of the last one
+        self.texts = array('I')
+        self.body = memoryview(b'')
+        # True when opening the index had to build it
+        self.rebuilt = False
+        self.load()
+        signatures = self.signatures()
+        if signatures is None:
+            self.build()
+            self.rebuilt = True
+        if signatures != self.files:
+            self.files = signatures or self.files
+            self.save()
+
+    def load(self):
+        """Read the stored index, if there is a readable one of this version."""
+        try:
+            data = self.path.read_bytes()
+            magic, version, header_size = HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != SEARCH_VERSION:
+                return
+            header = json.loads(data[HEADER.size:HEADER.size + header_size])
+        except (OSError, ValueError, struct.error):
+            return
+        if header.get("lang") != self.lang:
+            return
+        body = memoryview(data)[HEADER.size + header_size:]
+        sections = header["sections"]
+        for name in ARRAY_SECTIONS:
+            start, end = sections[name]
+            values = array('I')
+            values.frombytes(body[start:end])
+            setattr(self, name, values)
+        # An empty section is no strings; the arrays tell it apart from one empty string
+        counts = {"terms": len(self.term_postings) // 2}
+        strings = {name: str(body[start:end], 'utf-8').split('\0')
+                   if counts.get(name, len(self.texts) - 1) else []
+                   for name, (start, end) in sections.items() if name in STRING_SECTIONS}
+        self.files = header["files"]
+        self.terms = dict(zip(strings["terms"], range(len(strings["terms"]))))
+        self.documents = list(zip(strings["ids"], strings["kinds"], strings["files"], strings["names"]))
+        self.body = body
+
+    def signatures(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Current signatures of the indexed files, or None if a source file was added,
+        removed or changed since the index was built (unchanged files are not read).
+        """
+        sources = {path.relative_to(self.folder).as_posix(): path for path in self.folder.rglob('*.json')}
+        if not self.files or set(sources) != set(self.files):
+            return None
+        signatures = {}
+        for name, path in sorted(sources.items()):
+            signatures[name] = file_signature(path, self.files[name])
+            if signatures[name]["hash"] != self.files[name]["hash"]:
+                return None
+        return signatures
+
+    def build(self):
+        """Index every source file of the language."""
+        self.files = {}
+        documents = []
+        for path in sorted(self.folder.rglob('*.json')):
+            name = path.relative_to(self.folder).as_posix()
+            self.files[name] = file_signature(path)
+            documents += file_documents(path, name)
+
+        frequencies = []
+        # Character offset of each term's first occurrence in the document text, for snippets
+        first_offsets = []
+        for document in documents:
+            counts: Dict[str, int] = {}
+            offsets: Dict[str, int] = {}
+            for text in document["names"]:
+                for term in analyze(text, self.lang):
+                    counts[term] = counts.get(term, 0) + NAME_BOOST
+            for match in WORD.finditer("\n".join(document["text"])):
+                term = word_term(match.group(), self.lang)
+                if term is not None:
+                    counts[term] = counts.get(term, 0) + 1
+                    offsets.setdefault(term, match.start())
+            frequencies.append(counts)
+            first_offsets.append(offsets)
+
+        postings: Dict[str, List[int]] = {}
+        for number, counts in enumerate(frequencies):
+            for term in counts:
+                postings.setdefault(term, []).append(number)
+        lengths = [sum(counts.values()) for counts in frequencies]
+        average = sum(lengths) / max(len(lengths), 1)
+
+        body = bytearray()
+        self.terms = {}
+        self.term_postings = array('I')
+        for term, numbers in sorted(postings.items()):
+            idf = _idf(len(documents), len(numbers))
+            weights = [idf * frequencies[n][term] * (BM25_K1 + 1) /
+                       (frequencies[n][term] + BM25_K1 * (1 - BM25_B + BM25_B * lengths[n] / average))
+                       for n in numbers]
+            self.terms[term] = len(self.terms)
+            self.term_postings.extend((len(body), len(numbers)))
+            body += array('I', numbers).tobytes() + array('f', weights).tobytes()
+            body += array('I', [first_offsets[n].get(term, NAME_ONLY) for n in numbers]).tobytes()
+        self.texts = array('I')
+        for document in documents:
+            self.texts.append(len(body))
+            body += "\n".join(document["text"]).encode('utf-8')
+        self.texts.append(len(body))
+        self.documents = [(document["id"], document["kind"], document["file"], " / ".join(document["names"]))
+                          for document in documents]
+        self.body = memoryview(bytes(body))
+
+    def save(self):
+        """
+        Write the index atomically: header, JSON file signatures and section positions,
+        then the body (postings and texts, followed by the term and document sections).
+        """
+        columns = list(zip(*self.documents)) or [()] * 4
+        sections = dict(zip(STRING_SECTIONS, [list(self.terms)] + [list(column) for column in columns]))
+        tables = [(name, '\0'.join(values).encode('utf-8')) for name, values in sections.items()]
+        tables += [(name, getattr(self, name).tobytes()) for name in ARRAY_SECTIONS]
+        positions = {}
+        end = len(self.body)
+        for name, table in tables:
+            positions[name] = [end, end + len(table)]
+            end += len(table)
+        header = json.dumps({"lang": self.lang, "files": self.files, "sections": positions},
+                            ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, SEARCH_VERSION, len(header)))
+            f.write(header)
+            f.write(self.body)
+            for _, table in tables:
+                f.write(table)
+        tmp_path.replace(self.path)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def term_offset(self, term: str) -> Tuple[int, int]:
+        """Position of a term's postings in the body and its document count."""
+        row = 2 * self.terms[term]
+        return self.term_postings[row], self.term_postings[row + 1]
+
+    def postings(self, term: str) -> Tuple[array, array]:
+        """Document numbers (ascending) and BM25 weights of a term (empty if it is not indexed)."""
+        numbers, weights = array('I'), array('f')
+        if term in self.terms:
+            offset, count = self.term_offset(term)
+            numbers.frombytes(self.body[offset:offset + 4 * count])
+            weights.frombytes(self.body[offset + 4 * count:offset + 8 * count])
+        return numbers, weights
+
+    def first_offset(self, term: str, numbers: array, number: int) -> int:
+        """
+        Offset of the first occurrence of ``term`` in the text of a document, given the
+        term's document numbers; NAME_ONLY if the term is not in the text.
+        """
+        index = bisect_left(numbers, number)
+        if index == len(numbers) or numbers[index] != number:
+            return NAME_ONLY
+        offset, count = self.term_offset(term)
+        return U32.unpack_from(self.body, offset + 8 * count + 4 * index)[0]
+
+    def text(self, number: int) -> str:
+        """Rules text of a document (its fields joined by newlines)."""
+        return str(self.body[self.texts[number]:self.texts[number + 1]], 'utf-8')
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[SearchHit]:
+        """Best ``limit`` documents for ``query`` (optionally of one entity kind), best first."""
+        postings = sorted(((term, *self.postings(term)) for term in set(analyze(query, self.lang))
+                           if term in self.terms), key=lambda posting: len(posting[1]), reverse=True)
+        if not postings:
+            return []
+        # The longest posting list seeds the scores without a Python-level loop
+        scores: Dict[int, float] = dict(zip(postings[0][1], postings[0][2]))
+        for _, numbers, weights in postings[1:]:
+            for number, weight in zip(numbers, weights):
+                scores[number] = scores.get(number, 0.0) + weight
+        if kind is not None:
+            scores = {number: score for number, score in scores.items() if self.documents[number][1] == kind}
+
+        hits = []
+        for number in heapq.nlargest(limit, scores, key=scores.__getitem__):
+            entity_id, hit_kind, hit_file, hit_name = self.documents[number]
+            start = min(self.first_offset(term, numbers, number) for term, numbers, _ in postings)
+            text = self.text(number)
+            hits.append(SearchHit(entity_id, hit_kind, hit_file, round(scores[number], 3), hit_name,
+                                  snippet(text, start) if text else hit_name))
+        return hits
+
+def snippet(text: str, start: int) -> str:
+    """Extract of ``text`` around the word at ``start`` (its beginning for NAME_ONLY)."""
+    if start != NAME_ONLY and start > SNIPPET_CONTEXT:
+        start = text.rfind(' ', 0, start - SNIPPET_CONTEXT) + 1
+    else:
+        start = 0
+    extract = ' '.join(text[start:start + SNIPPET_LENGTH].split())
+    return ('…' if start else '') + extract + ('…' if start + SNIPPET_LENGTH < len(text) else '')
+
+def _idf(total: int, frequency: int) -> float:
+    """BM25 inverse document frequency (the non-negative Lucene variant)."""
+    return math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+
+_indexes: Dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_search_index(lang: str = "en") -> SearchIndex:
+    """Shared search index of a language, loaded (or rebuilt) on first use."""
+    with _indexes_lock:
+        if lang not in _indexes:
+            _indexes[lang] = SearchIndex(lang)
+        return _indexes[lang]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Every weapon profile of a language flattened into columnar NumPy arrays, so that
+questions over the whole game are single vectorized expressions:
+
+    table = load_weapon_table(default_weapon_table_path("en"))
+    lethal_melee = ((table["wep_type"] == table.category("M")) & (table["dmg_crit"] >= 5)
+                    & table.has_rule("WR-UNIV-LETHAL"))
+    table["wep_name"][lethal_melee]
+
+Columns (one row per profile, stats that are not numbers such as "*" are -1):
+    profile_id, wep_id, wep_name, profile_name   strings (profile_id as in the rule table)
+    atk, hit, dmg_normal, dmg_crit               int16 (HIT "3+" -> 3, DMG "4/5" -> 4 and 5)
+    wep_type                                     uint8 code into ``wep_types``
+    team, op_type                                int32 row into ``team_ids`` / ``op_type_ids``; team is -1
+                                                 for universal equipment, op_type for all equipment
+    wr_bits                                      uint64 words, bit i set if the profile has rule_ids[i]
+    wr_number                                    int16 number of each rule (-1 without one)
+
+numpy is optional for the rest of the package and is imported on first use.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from killteam_data.loader import DATA_ROOT, DatasetLoader
+from killteam_data.rule_table import profile_id
+
+WEAPON_TABLE_VERSION = 1
+
+NUMBER = re.compile(r'\d+')
+
+_numpy = None
+
+def numpy_module() -> Any:
+    """numpy, imported on first use (it takes longer to import than the rest of the package)."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy package not installed. Run: pip install numpy") from None
+        _numpy = numpy
+    return _numpy
+
+def default_weapon_table_path(lang: str) -> Path:
+    return DATA_ROOT / f"{lang}.weapons.npz"
+
+def parse_stat(value: Any) -> int:
+    """Leading number of a stat ("3+" -> 3), or -1 when there is none."""
+    match = NUMBER.match(str(value or '').strip())
+    return int(match.group()) if match else -1
+
+def parse_damage(value: Any) -> List[int]:
+    """Normal and critical damage of a DMG stat ("4/5" -> [4, 5]); -1 where not a number."""
+    parts = str(value or '').split('/')
+    return [parse_stat(parts[0]), parse_stat(parts[1]) if len(parts) > 1 else -1]
+
+def weapon_rows(loader: DatasetLoader) -> List[Dict[str, Any]]:
+    """One dict per weapon profile: operative weapons, then team equipment, of each team, then universal equipment."""
+    rows = []
+
+    def add(weapons: List[Dict[str, Any]], team: Optional[str], op_type: Optional[str]):
+        for weapon in weapons or []:
+            for i, profile in enumerate(weapon.get('profiles') or []):
+                rows.append({"id": profile_id(weapon, profile, i), "profile": profile, "weapon": weapon,
+                             "team": team, "op_type": op_type})
+
+    for team in loader.teams():
+        for op_type in team.get('opTypes', []):
+            add(op_type.get('weapons'), team['killteamId'], op_type['opTypeId'])
+        for equipment in team.get('equipments', []):
+            add(equipment.get('weapons'), team['killteamId'], None)
+    for equipment in loader.universal_equipment.get('equipments', []):
+        add(equipment.get('weapons'), None, None)
+    return rows
+
+def build_weapon_table(lang: str = "en", root: Path = DATA_ROOT) -> 'WeaponTable':
+    """Flatten every weapon profile of a language into a WeaponTable."""
+    np = numpy_module()
+    rows = weapon_rows(DatasetLoader(lang, root))
+    team_ids = sorted({row["team"] for row in rows if row["team"]})
+    op_type_ids = sorted({row["op_type"] for row in rows if row["op_type"]})
+    wep_types = sorted({str(row["weapon"].get('wepType', '')) for row in rows})
+    rule_ids = sorted({reference["id"] for row in rows for reference in row["profile"].get('WR') or []})
+    team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+    op_type_index = {op_type_id: i for i, op_type_id in enumerate(op_type_ids)}
+    rule_index = {rule_id: i for i, rule_id in enumerate(rule_ids)}
+
+    wr_bits = np.zeros((len(rows), max(1, (len(rule_ids) + 63) // 64)), dtype=np.uint64)
+    wr_number = np.full((len(rows), len(rule_ids)), -1, dtype=np.int16)
+    for i, row in enumerate(rows):
+        for reference in row["profile"].get('WR') or []:
+            rule = rule_index[reference["id"]]
+            wr_bits[i, rule // 64] |= np.uint64(1 << (rule % 64))
+            if isinstance(reference.get('number'), int):
+                wr_number[i, rule] = reference['number']
+
+    damage = np.array([parse_damage(row["profile"].get('DMG')) for row in rows], dtype=np.int16).reshape(-1, 2)
+    columns = {
+        "profile_id": np.array([row["id"] for row in rows], dtype=str),
+        "wep_id": np.array([row["weapon"].get('wepId', '') for row in rows], dtype=str),
+        "wep_name": np.array([row["weapon"].get('wepName') or '' for row in rows], dtype=str),
+        "profile_name": np.array([row["profile"].get('profileName') or '' for row in rows], dtype=str),
+        "atk": np.array([parse_stat(row["profile"].get('ATK')) for row in rows], dtype=np.int16),
+        "hit": np.array([parse_stat(row["profile"].get('HIT')) for row in rows], dtype=np.int16),
+        "dmg_normal": damage[:, 0].copy(),
+        "dmg_crit": damage[:, 1].copy(),
+        "wep_type": np.array([wep_types.index(str(row["weapon"].get('wepType', ''))) for row in rows],
+                             dtype=np.uint8),
+        "team": np.array([team_index.get(row["team"], -1) for row in rows], dtype=np.int32),
+        "op_type": np.array([op_type_index.get(row["op_type"], -1) for row in rows], dtype=np.int32),
+        "wr_bits": wr_bits,
+        "wr_number": wr_number,
+    }
+    keys = {
+        "team_ids": np.array(team_ids, dtype=str),
+        "op_type_ids": np.array(op_type_ids, dtype=str),
+        "wep_types": np.array(wep_types, dtype=str),
+        "rule_ids": np.array(rule_ids, dtype=str),
+    }
+    return WeaponTable(lang, columns, keys)
+
+class WeaponTable:
+    """Columns of every weapon profile of a language (``table["atk"]``) and the keys their codes refer to."""
+
+    def __init__(self, lang: str, columns: Dict[str, Any], keys: Dict[str, Any]):
+        self.lang = lang
+        self.columns = columns
+        self.team_ids = keys["team_ids"]
+        self.op_type_ids = keys["op_type_ids"]
+        self.wep_types = keys["wep_types"]
+        self.rule_ids = keys["rule_ids"]
+        self._rule_index = {str(rule_id): i for i, rule_id in enumerate(self.rule_ids)}
+
+    def __getitem__(self, column: str) -> Any:
+        return self.columns[column]
+
+    def __len__(self) -> int:
+        return len(self.columns["profile_id"])
+
+    def category(self, wep_type: str) -> int:
+        """Code of a wepType (R, M...) in the wep_type column; ValueError if no profile has it."""
+        codes = numpy_module().flatnonzero(self.wep_types == wep_type)
+        if not len(codes):
+            raise ValueError(f"No weapon of type {wep_type!r}")
+        return int(codes[0])
+
+    def rule_column(self, rule_id: str) -> int:
+        """Index of a rule in rule_ids and the wr_number columns; KeyError if no profile has it."""
+        return self._rule_index[rule_id]
+
+    def has_rule(self, rule_id: str) -> Any:
+        """Boolean mask of the profiles with a weapon rule."""
+        np = numpy_module()
+        rule = self.rule_column(rule_id)
+        return ((self.columns["wr_bits"][:, rule // 64] >> np.uint64(rule % 64)) & np.uint64(1)).astype(bool)
+
+    def rule_number(self, rule_id: str) -> Any:
+        """Number of a weapon rule for each profile (Lethal 5+ -> 5), -1 where absent or without one."""
+        return self.columns["wr_number"][:, self.rule_column(rule_id)]
+
+    def team_of(self, rows: Any) -> Any:
+        """killteamId of the given rows ('' for universal equipment)."""
+        np = numpy_module()
+        codes = self.columns["team"][rows]
+        return np.where(codes >= 0, self.team_ids[np.maximum(codes, 0)], '')
+
+    def op_type_of(self, rows: Any) -> Any:
+        """opTypeId of the given rows ('' for equipment)."""
+        np = numpy_module()
+        codes = self.columns["op_type"][rows]
+        return np.where(codes >= 0, self.op_type_ids[np.maximum(codes, 0)], '')
+
+def save_weapon_table(table: WeaponTable, path: Path):
+    """Write a table as an uncompressed .npz (arrays load without unpickling)."""
+    np = numpy_module()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp.npz')
+    np.savez(tmp_path, version=np.array(WEAPON_TABLE_VERSION), lang=np.array(table.lang),
+             team_ids=table.team_ids, op_type_ids=table.op_type_ids, wep_types=table.wep_types,
+             rule_ids=table.rule_ids, **table.columns)
+    tmp_path.replace(path)
+
+def load_weapon_table(path: Path) -> WeaponTable:
+    """Read a table written by save_weapon_table."""
+    np = numpy_module()
+    with np.load(Path(path), allow_pickle=False) as data:
+        if int(data["version"]) != WEAPON_TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {WEAPON_TABLE_VERSION} weapon table; rebuild it")
+        arrays = {name: data[name] for name in data.files}
+    keys = {name: arrays.pop(name) for name in ("team_ids", "op_type_ids", "wep_types", "rule_ids")}
+    lang = str(arrays.pop("lang"))
+    arrays.pop("version")
+    return WeaponTable(lang, arrays, keys)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Find where entity IDs are defined, through the persisted ID index (see killteam_data.id_index).
+
+Usage: python lookup_id.py <id> [<id> ...] [--lang es] [--show]
+
+  id      - Any killteamId, opTypeId, abilityId, ployId, eqId, wepId, wepprofileId or rule/action id
+  --lang  - Only report this language (default: every language)
+  --show  - Also print the entity itself
+"""
+
+import json
+import sys
+import time
+from killteam_data.id_index import get_id_index
+
+def main():
+    args = sys.argv[1:]
+    lang = args[args.index('--lang') + 1] if '--lang' in args else None
+    ids = [arg for arg in args if not arg.startswith('--') and arg != lang]
+    if not ids:
+        print("Usage: python lookup_id.py <id> [<id> ...] [--lang es] [--show]")
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    index = get_id_index()
+    elapsed = time.perf_counter() - start_time
+    print(f"[INFO] {len(index)} IDs indexed, {len(index.rescanned)} files re-scanned ({elapsed * 1000:.1f} ms)")
+
+    missing = 0
+    for entity_id in ids:
+        locations = index.find(entity_id, lang)
+        if not locations:
+            print(f"[ERROR] {entity_id}: not found")
+            missing += 1
+            continue
+        for location in locations:
+            print(f"[OK] {entity_id}: {location.lang}/{location.file} {location.dotted or '(root)'} ({location.kind})")
+            if '--show' in args:
+                entity = index.resolve(entity_id, location.lang, location.kind)
+                print(json.dumps(entity, ensure_ascii=False, indent=2))
+    sys.exit(1 if missing else 0)
+
+if __name__ == '__main__':
+    main()
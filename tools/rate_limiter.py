@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Adaptive token-bucket rate limiter shared by every translation provider.
+Limits requests/sec and characters/sec, honours Retry-After on HTTP 429 and
+applies jittered exponential backoff between retries. Records how much time
+a run spent throttled.
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Default budgets per provider: (requests/sec, characters/sec); 0 means unlimited.
+# Override with KT_<PROVIDER>_RPS / KT_<PROVIDER>_CPS, e.g. KT_GOOGLE_RPS=5.
+PROVIDER_LIMITS = {
+    "google": (10.0, 0.0),
+    "deepl": (5.0, 50000.0),
+}
+DEFAULT_LIMITS = (5.0, 0.0)
+
+# Backoff between retries: BACKOFF_BASE * 2**attempt seconds, jittered, capped at BACKOFF_MAX
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# After a 429 the rates drop by this factor, then recover additively on success
+DECREASE_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+
+class RateLimitedError(Exception):
+    """Raised by a provider when the service answered 429 Too Many Requests."""
+
+    def __init__(self, retry_after: Optional[float] = None, message: str = "rate limited (HTTP 429)"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (amounts above capacity wait for a full bucket)."""
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+class RateLimiter:
+    """
+    Thread-safe limiter on requests/sec and characters/sec.
+
+    Call :meth:`acquire` before each request, :meth:`on_success` after it and
+    :meth:`on_rate_limited` when the service answers 429. The configured rates
+    are ceilings: a 429 halves the current rates and successful requests slowly
+    raise them back.
+    """
+
+    def __init__(self, requests_per_sec: float = 0.0, chars_per_sec: float = 0.0):
+        self.max_requests_per_sec = requests_per_sec
+        self.max_chars_per_sec = chars_per_sec
+        self.lock = threading.Lock()
+        self.request_bucket = TokenBucket(requests_per_sec, max(1.0, requests_per_sec)) \
+            if requests_per_sec > 0 else None
+        self.char_bucket = TokenBucket(chars_per_sec, chars_per_sec) if chars_per_sec > 0 else None
+        self.paused_until = 0.0
+        self.stats = {"throttled": 0.0, "backoff": 0.0, "rate_limited": 0, "requests": 0}
+
+    @classmethod
+    def for_provider(cls, provider_name: str) -> 'RateLimiter':
+        """Limiter configured from PROVIDER_LIMITS and KT_<PROVIDER>_RPS / _CPS."""
+        rps, cps = PROVIDER_LIMITS.get(provider_name, DEFAULT_LIMITS)
+        prefix = f"KT_{provider_name.upper()}"
+        rps = float(os.getenv(f"{prefix}_RPS", rps))
+        cps = float(os.getenv(f"{prefix}_CPS", cps))
+        return cls(rps, cps)
+
+    def acquire(self, chars: int = 0) -> float:
+        """Block until one request of ``chars`` characters may be sent; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                wait = max(0.0, self.paused_until - now)
+                for bucket, amount in ((self.request_bucket, 1), (self.char_bucket, chars)):
+                    if bucket:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait <= 0:
+                    if self.request_bucket:
+                        self.request_bucket.tokens -= 1
+                    if self.char_bucket:
+                        self.char_bucket.tokens -= chars
+                    self.stats["requests"] += 1
+                    self.stats["throttled"] += waited
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+    def on_success(self):
+        """Additively recover the rates towards their configured ceilings."""
+        with self.lock:
+            for bucket, ceiling in ((self.request_bucket, self.max_requests_per_sec),
+                                    (self.char_bucket, self.max_chars_per_sec)):
+                if bucket and bucket.rate < ceiling:
+                    bucket.rate = min(ceiling, bucket.rate + ceiling * RECOVERY_STEP)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None, attempt: int = 0):
+        """
+        Record a 429: pause every request until Retry-After (or a backoff delay when the
+        header is absent) and cut the rates.
+        """
+        delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        with self.lock:
+            self.stats["rate_limited"] += 1
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            for bucket in (self.request_bucket, self.char_bucket):
+                if bucket:
+                    bucket.rate = max(bucket.rate * DECREASE_FACTOR, 0.01)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Jittered exponential backoff ("full jitter") for the given retry attempt."""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def backoff(self, attempt: int) -> float:
+        """Sleep for the backoff delay of ``attempt`` and return it."""
+        delay = self.backoff_delay(attempt)
+        time.sleep(delay)
+        with self.lock:
+            self.stats["backoff"] += delay
+        return delay
+
+    def summary(self) -> str:
+        """One-line summary of the time spent throttled."""
+        return (f"throttled {self.stats['throttled']:.1f}s across workers, backoff {self.stats['backoff']:.1f}s, "
+                f"{self.stats['rate_limited']} rate-limit responses")
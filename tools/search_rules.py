@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Full-text search of the rules text of a language (see killteam_data.search).
+
+Usage: python search_rules.py <query> [--lang es] [--limit 10] [--kind ploys] [--bench]
+
+  query   - Words to look for, e.g. "re-roll" or "repetir tirada"
+  --lang  - Language to search (default: en)
+  --limit - Number of results (default: 10)
+  --kind  - Only entities of this kind: teams, opTypes, abilities, ploys, equipments,
+            weapons, weapon_rules, actions, ops...
+  --bench - Also time loading the index and the query
+"""
+
+import statistics
+import sys
+import time
+from killteam_data.search import SearchIndex
+
+def main():
+    args = sys.argv[1:]
+    options = {flag: args[args.index(flag) + 1] for flag in ('--lang', '--limit', '--kind') if flag in args}
+    values = [args.index(flag) + 1 for flag in options]
+    words = [arg for i, arg in enumerate(args) if not arg.startswith('--') and i not in values]
+    if not words:
+        print("Usage: python search_rules.py <query> [--lang es] [--limit 10] [--kind ploys] [--bench]")
+        sys.exit(1)
+    query = ' '.join(words)
+    lang = options.get('--lang', 'en')
+    limit = int(options.get('--limit', 10))
+
+    start_time = time.perf_counter()
+    index = SearchIndex(lang)
+    load_time = time.perf_counter() - start_time
+    if index.rebuilt:
+        print(f"[INFO] Index of {lang}/ rebuilt: {len(index)} documents, {len(index.terms)} terms")
+
+    hits = index.search(query, limit, options.get('--kind'))
+    if not hits:
+        print(f"[INFO] No results for {query!r}")
+    for hit in hits:
+        print(f"{hit.score:7.2f}  {hit.id} ({hit.kind}, {hit.file}) - {hit.name}")
+        print(f"         {hit.snippet}")
+
+    if '--bench' in args:
+        timings = []
+        for _ in range(200):
+            start_time = time.perf_counter()
+            index.search(query, limit, options.get('--kind'))
+            timings.append(time.perf_counter() - start_time)
+        print(f"\nIndex load: {load_time * 1000:.1f} ms; query: median {statistics.median(timings) * 1e6:.0f} us, "
+              f"max {max(timings) * 1e6:.0f} us over {len(timings)} runs")
+
+if __name__ == '__main__':
+    main()
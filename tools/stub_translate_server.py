@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Google Translate web API (translate_a/single, gtx client)
+and the DeepL API (v2/translate, v2/usage, v2/glossaries).
+Used to benchmark and exercise the translation tools without network access.
+Latency, server errors (HTTP 500) and rate limiting (HTTP 429) can be injected
+into translation requests, and a setup delay into every new connection (the TCP and
+TLS handshakes a real provider costs).
+
+Usage: python stub_translate_server.py [--port 8765] [--latency 0.1] [--error-rate 0.05]
+                                       [--rate-limit-rate 0.05] [--handshake-latency 0.1]
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+def fake_translate(text: str, target_lang: str) -> str:
+    """
+    Deterministic fake translation: prefix every line containing words with the target language.
+    Lines without letters (blank lines, numbers, segment sentinels) are left alone, as real
+    providers do.
+    """
+    return '\n'.join(f"[{target_lang}] {line}" if re.search('[A-Za-z]', line) else line
+                     for line in text.split('\n'))
+
+def apply_glossary(text: str, entries: Dict[str, str]) -> str:
+    """Replace glossary terms (whole words, longest first) as DeepL does server-side."""
+    if not entries:
+        return text
+    pattern = '|'.join(re.escape(term) for term in sorted(entries, key=len, reverse=True))
+    return re.sub(rf'(?<!\w)(?:{pattern})(?!\w)', lambda match: entries[match.group(0)], text)
+
+class StubTranslateHandler(BaseHTTPRequestHandler):
+    """Request handler answering in the gtx and DeepL response shapes."""
+
+    # Keep connections alive so clients can reuse them; send replies without Nagle delays
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # Artificial latency in seconds, and fractions of translation requests answered
+    # with HTTP 500 / HTTP 429 (set per server)
+    latency = 0.0
+    error_rate = 0.0
+    rate_limit_rate = 0.0
+    # Delay in seconds before the first request of each new connection is read
+    handshake_latency = 0.0
+
+    def setup(self):
+        super().setup()
+        self.server.count("connection_count")
+        if self.handshake_latency:
+            time.sleep(self.handshake_latency)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == '/translate_a/single':
+            params = parse_qs(parsed.query)
+            self._reply_gtx(params.get('q', [''])[0], params.get('tl', ['es'])[0])
+        elif parsed.path == '/v2/usage':
+            self._send_json({"character_count": self.server.chars_received, "character_limit": 500000})
+        elif parsed.path == '/v2/glossaries':
+            self._send_json({"glossaries": [info for info, _ in self.server.glossaries.values()]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        if 'json' in self.headers.get('Content-Type', ''):
+            params = json.loads(body or '{}')
+        else:
+            params = {k: v if k == 'text' else v[0] for k, v in parse_qs(body).items()}
+        if parsed.path == '/translate_a/single':
+            self._reply_gtx(params.get('q', ''), params.get('tl', 'es'))
+        elif parsed.path == '/v2/translate':
+            texts = params.get('text', [])
+            self._reply_deepl(texts if isinstance(texts, list) else [texts],
+                              params.get('target_lang', 'ES'), params.get('glossary_id'))
+        elif parsed.path == '/v2/glossaries':
+            self._create_glossary(params)
+        else:
+            self.send_error(404)
+
+    def _inject(self) -> bool:
+        """Apply latency and injected failures; True when the request was already answered."""
+        if self.latency:
+            time.sleep(self.latency)
+        roll = self.server.random.random()
+        if roll < self.rate_limit_rate:
+            self.server.count("rate_limits_injected")
+            self._send_json({"message": "Too many requests"}, 429, {'Retry-After': '0'})
+            return True
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.server.count("errors_injected")
+            self._send_json({"message": "Internal server error"}, 500)
+            return True
+        return False
+
+    def _reply_gtx(self, text: str, target_lang: str):
+        if self._inject():
+            return
+        # Packed requests carry one string per sentinel line
+        self.server.count("request_count")
+        self.server.count("chars_received", len(text))
+        self.server.count("strings_received", max(1, len(re.findall(r'^\[\[\d+\]\]$', text, re.MULTILINE))))
+        self._send_json([[[fake_translate(text, target_lang), text, None, None]], None, "en"])
+
+    def _reply_deepl(self, texts: list, target_lang: str, glossary_id: str = None):
+        if self._inject():
+            return
+        entries = self.server.glossaries.get(glossary_id, (None, {}))[1]
+        target = target_lang.split('-')[0].lower()
+        self.server.count("request_count")
+        self.server.count("chars_received", sum(len(text) for text in texts))
+        self.server.count("strings_received", len(texts))
+        self._send_json({"translations": [
+            {"detected_source_language": "EN", "billed_characters": len(text),
+             "text": fake_translate(apply_glossary(text, entries), target)}
+            for text in texts]})
+
+    def _create_glossary(self, params: dict):
+        entries = dict(line.split('\t', 1) for line in params.get('entries', '').splitlines() if '\t' in line)
+        info = {
+            "glossary_id": str(uuid.uuid4()),
+            "name": params.get('name', ''),
+            "ready": True,
+            "source_lang": params.get('source_lang', 'en').lower(),
+            "target_lang": params.get('target_lang', 'es').lower(),
+            "creation_time": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            "entry_count": len(entries),
+        }
+        self.server.glossaries[info["glossary_id"]] = (info, entries)
+        self._send_json(info, 201)
+
+    def _send_json(self, data, status: int = 200, headers: Dict[str, str] = None):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """Threading server holding the request counters and DeepL glossaries."""
+
+    request_queue_size = 128
+    daemon_threads = True
+    counters = ("request_count", "connection_count", "chars_received", "strings_received",
+                "errors_injected", "rate_limits_injected")
+
+    def __init__(self, address, handler, seed: int = 0):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.glossaries = {}
+        for counter in self.counters:
+            setattr(self, counter, 0)
+        host, port = self.server_address[:2]
+        self.deepl_url = f"http://{host}:{port}"
+
+    def count(self, counter: str, amount: int = 1):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Current value of every counter."""
+        with self.lock:
+            return {counter: getattr(self, counter) for counter in self.counters}
+
+def start_stub_server(latency: float = 0.0, port: int = 0, error_rate: float = 0.0,
+                      rate_limit_rate: float = 0.0, seed: int = 0,
+                      handshake_latency: float = 0.0) -> Tuple[StubServer, str]:
+    """
+    Start the stub server on a background thread.
+    Returns the server and the translate_a/single URL to point providers at;
+    ``server.deepl_url`` is the DeepL server URL.
+    """
+    handler = type('Handler', (StubTranslateHandler,), {
+        'latency': latency, 'error_rate': error_rate, 'rate_limit_rate': rate_limit_rate,
+        'handshake_latency': handshake_latency})
+    server = StubServer(('127.0.0.1', port), handler, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"{server.deepl_url}/translate_a/single"
+
+def main():
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else 8765
+    latency = float(args[args.index('--latency') + 1]) if '--latency' in args else 0.0
+    error_rate = float(args[args.index('--error-rate') + 1]) if '--error-rate' in args else 0.0
+    rate_limit_rate = float(args[args.index('--rate-limit-rate') + 1]) if '--rate-limit-rate' in args else 0.0
+    handshake_latency = float(args[args.index('--handshake-latency') + 1]) if '--handshake-latency' in args else 0.0
+
+    server, url = start_stub_server(latency, port, error_rate, rate_limit_rate,
+                                    handshake_latency=handshake_latency)
+    print(f"Stub translation server listening on {url} (latency {latency:.3f}s, "
+          f"handshake {handshake_latency:.3f}s, "
+          f"{error_rate:.0%} errors, {rate_limit_rate:.0%} rate limited)")
+    print(f"Point the tools at it with: KT_GOOGLE_TRANSLATE_URL={url} KT_DEEPL_SERVER_URL={server.deepl_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\nServed {server.request_count} requests over {server.connection_count} connections "
+              f"({server.chars_received} characters, {server.errors_injected} errors and "
+              f"{server.rate_limits_injected} rate limits injected)")
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,20 @@
 """
 Comprehensive translation script for all JSON files.
 Translates English JSON files to Spanish and French using official Games Workshop terminology.
+Each English file is parsed once and fanned out to every language; files are spread
+across a process pool sized to the machine's cores.
+
+Usage: python translate_all.py [language ...] [--workers N]
 """
 
 import json
+import os
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from json_output import OutputStats, OUTPUT_STATS, write_json
 
 # Official GW Spanish terminology
 GW_SPANISH = {
@@ -104,20 +113,71 @@ GW_FRENCH = {
     "Infiltration": "Infiltration",
 }
 
+# Target languages: code -> (terminology, display name). Add new languages here.
+LANGUAGES = {
+    "es": (GW_SPANISH, "Spanish"),
+    "fr": (GW_FRENCH, "French"),
+}
+
+# Shared files translated besides the team files (the dictionary pass leaves the rest
+# of en/ to the other translate_* scripts)
+SOURCE_FILES = [
+    'weapon_rules.json',
+    'universal_equipment.json',
+    'actions.json',
+    'ops_2025.json',
+]
+
+def _trie_regex(terms):
+    """
+    Regex source for a set of terms, factored by common prefix (a trie), so the
+    engine only tries terms that start with the current character. At every
+    branch longer continuations come first, keeping longest-match-first semantics.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+    
+    return build(trie)
+
+def compile_glossary(lang_terms):
+    """
+    Compile a terminology dictionary into a single regex matched in one pass per string.
+    Longer terms win over their prefixes and terms must not touch other letters or digits,
+    so "Charge" never matches inside "Recharge". Compiled patterns are cached per dictionary.
+    """
+    cached = _glossary_cache.get(id(lang_terms))
+    if cached is not None and cached[0] is lang_terms:
+        return cached[1]
+    
+    # The leading character class lets the engine skip positions no term can start at
+    first_chars = ''.join(sorted({re.escape(term[0]) for term in lang_terms if term}))
+    pattern = re.compile(rf'(?=[{first_chars}])(?<!\w){_trie_regex(lang_terms)}(?!\w)')
+    _glossary_cache[id(lang_terms)] = (lang_terms, pattern)
+    return pattern
+
+# id(terminology dict) -> (dict, compiled pattern)
+_glossary_cache = {}
+
 def translate_text(text, lang_terms):
-    """Translate text using GW terminology dictionary."""
+    """Translate text using GW terminology dictionary (one longest-match-first pass)."""
     if not isinstance(text, str) or not text.strip():
         return text
     
-    # Apply term-by-term replacement (longest first to avoid partial matches)
-    translated = text
-    # Sort by length descending to match longer terms first
-    for en_term, trans_term in sorted(lang_terms.items(), key=lambda x: -len(x[0])):
-        # Use word boundary-aware replacement where appropriate
-        # For now, simple replacement - manual review needed for context
-        translated = translated.replace(en_term, trans_term)
-    
-    return translated
+    pattern = compile_glossary(lang_terms)
+    return pattern.sub(lambda match: lang_terms[match.group(0)], text)
 
 def translate_value(value, field_name, lang_terms):
     """Recursively translate JSON values."""
@@ -147,77 +207,78 @@ def translate_value(value, field_name, lang_terms):
     else:
         return value
 
-def translate_file(en_file, target_file, lang_terms, lang_name):
-    """Translate a JSON file."""
-    print(f"Translating {en_file.name} to {lang_name}...")
-    
+def translate_to_languages(filename, en_dir, languages):
+    """
+    Read and parse one English file once and write its translation for every language.
+    Runs in a worker process; returns (filename, messages, stats) for the parent to print.
+    """
+    en_file = Path(en_dir) / filename
     try:
         with open(en_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
     except Exception as e:
-        print(f"  Error reading {en_file}: {e}")
-        return False
-    
-    # Translate
-    translated = translate_value(data, "", lang_terms)
+        return filename, [f"  Error reading {en_file}: {e}"], OutputStats()
     
-        # Write
-    try:
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] Created {target_file.name}")
-        return True
-    except Exception as e:
-        print(f"  [ERROR] Writing {target_file}: {e}")
-        return False
+    messages = []
+    stats = OutputStats()
+    for lang_code in languages:
+        lang_terms, lang_name = LANGUAGES[lang_code]
+        target_file = Path(lang_code) / filename
+        translated = translate_value(data, "", lang_terms)
+        try:
+            if write_json(target_file, translated, stats):
+                messages.append(f"  [OK] Created {lang_code}/{filename} ({lang_name})")
+            else:
+                messages.append(f"  [SKIP] {lang_code}/{filename} unchanged")
+        except Exception as e:
+            messages.append(f"  [ERROR] Writing {target_file}: {e}")
+    return filename, messages, stats
 
 def main():
-    """Translate all JSON files to Spanish and French."""
-    files = [
-        'weapon_rules.json',
-        'universal_equipment.json',
-        'actions.json',
-        'ops_2025.json',
-    ]
-    # Add individual team files
-    teams_dir = Path('en') / 'teams'
-    if teams_dir.exists():
-        team_files = sorted(teams_dir.glob('*.json'))
-        files.extend([f'teams/{f.name}' for f in team_files])
+    """Translate all JSON files to every configured language (Spanish and French)."""
+    args = sys.argv[1:]
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else os.cpu_count() or 1
+    languages = [arg for arg in args if not arg.startswith('--') and arg in LANGUAGES]
+    languages = languages or list(LANGUAGES)
     
     en_dir = Path('en')
-    es_dir = Path('es')
-    fr_dir = Path('fr')
-    
-    es_dir.mkdir(exist_ok=True)
-    fr_dir.mkdir(exist_ok=True)
-    
-    print("Translating files to Spanish...")
-    print("=" * 50)
-    for filename in files:
-        en_file = en_dir / filename
-        es_file = es_dir / filename
-        
-        if en_file.exists():
-            translate_file(en_file, es_file, GW_SPANISH, "Spanish")
+    files = []
+    for filename in SOURCE_FILES:
+        if (en_dir / filename).exists():
+            files.append(filename)
         else:
-            print(f"Warning: {en_file} not found")
+            print(f"Warning: {en_dir / filename} not found")
+    # Add individual team files
+    files.extend(f'teams/{f.name}' for f in sorted((en_dir / 'teams').glob('*.json')))
     
-    print("\nTranslating files to French...")
+    print(f"Translating {len(files)} files to {', '.join(LANGUAGES[lang][1] for lang in languages)} "
+          f"using {workers} worker processes...")
     print("=" * 50)
-    for filename in files:
-        en_file = en_dir / filename
-        fr_file = fr_dir / filename
-        
-        if en_file.exists():
-            translate_file(en_file, fr_file, GW_FRENCH, "French")
-        else:
-            print(f"Warning: {en_file} not found")
+    start_time = time.time()
     
-    print("\n[OK] Translation complete!")
+    # Each English file is parsed once and fanned out to every language
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(translate_to_languages, filename, str(en_dir), languages)
+                       for filename in files]
+            for future in as_completed(futures):
+                filename, messages, stats = future.result()
+                OUTPUT_STATS.add(stats)
+                print(f"Translated {filename}")
+                for message in messages:
+                    print(message)
+    else:
+        for filename in files:
+            filename, messages, stats = translate_to_languages(filename, str(en_dir), languages)
+            OUTPUT_STATS.add(stats)
+            print(f"Translated {filename}")
+            for message in messages:
+                print(message)
+    
+    print(f"\n[OK] Translation complete! ({time.time() - start_time:.2f}s)")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("\nNote: This is a basic translation using terminology dictionaries.")
     print("For complete translations, manual review and refinement is recommended.")
 
 if __name__ == '__main__':
     main()
-
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
 Batch translation script that translates all JSON files using Google Translate.
-Uses batching and better rate limiting for faster translation.
+Packs many strings into each request, separated by sentinels that are checked on return.
 """
 
 import json
+import re
 import sys
 import time
+import urllib.parse
 from pathlib import Path
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
+from json_refs import StringRefs
+from json_output import OUTPUT_STATS, write_json
+from translation_config import iter_source_files
+from translation_engine import TranslationEngine
+from translation_estimate import print_estimate
+from translation_masking import format_savings, mask_text, masking_savings, needs_translation, unmask_text
+from translation_providers import google_translate
 
 # Fields that should NOT be translated (IDs, keys, etc.)
 NON_TRANSLATABLE_FIELDS = {'id', 'type', 'seq', 'AP', 'APL', 'GA', 'DF', 'SV', 'W', 'M', 
@@ -22,55 +31,142 @@ TRANSLATABLE_FIELDS = {'name', 'description', 'killteamName', 'opTypeName', 'wep
                        'victoryPoints', 'effects', 'conditions', 'packs', 'archetypes',
                        'ability', 'keyword', 'team'}
 
-def translate_batch(texts: List[str], target_lang: str, source_lang: str = "en") -> List[str]:
+# Request size budget (URL-encoded characters; Google Translate rejects requests around 5000)
+MAX_REQUEST_CHARS = 4000
+
+# Sentinel line placed before every segment of a packed request
+SEGMENT_SENTINEL = "[[{}]]"
+SENTINEL_PATTERN = re.compile(r'^[ \t]*\[\[[ \t]*(\d+)[ \t]*\]\][ \t]*$', re.MULTILINE)
+SENTINEL_OVERHEAD = len(urllib.parse.quote("\n[[000]]\n", safe=''))
+
+def pack_segments(texts: List[str], max_chars: int = MAX_REQUEST_CHARS) -> List[List[int]]:
     """
-    Translate multiple texts in a single API call using Google Translate web API.
-    This is much faster than individual calls.
+    Bin-pack texts into requests using first-fit decreasing on their URL-encoded size.
+    Returns the indices of the texts in each request; oversized texts get a request of their own.
     """
-    try:
-        import requests
-        
-        # Join texts with a delimiter
-        # Note: Google Translate has a 5000 char limit, so we may need to split
-        max_chars = 4000
-        results = []
-        
-        current_batch = []
-        current_size = 0
-        
-        for text in texts:
-            # Estimate size (roughly 2x for URL encoding)
-            text_size = len(text) * 2
-            
-            if current_size + text_size > max_chars and current_batch:
-                # Translate current batch
-                batch_text = '\n'.join(current_batch)
-                translated = translate_text(batch_text, target_lang, source_lang)
-                # Split back (Google Translate preserves newlines)
-                results.extend(translated.split('\n'))
-                current_batch = [text]
-                current_size = text_size
-                time.sleep(0.5)  # Rate limit delay
+    sizes = [len(urllib.parse.quote(text, safe='')) + SENTINEL_OVERHEAD for text in texts]
+    bins = []
+    free = []
+    for i in sorted(range(len(texts)), key=lambda i: -sizes[i]):
+        for b, space in enumerate(free):
+            if sizes[i] <= space:
+                bins[b].append(i)
+                free[b] -= sizes[i]
+                break
+        else:
+            bins.append([i])
+            free.append(max_chars - sizes[i])
+    return bins
+
+def encode_packet(texts: List[str]) -> str:
+    """Join texts into one request, each preceded by a numbered sentinel line."""
+    return '\n'.join(f"{SEGMENT_SENTINEL.format(n)}\n{text}" for n, text in enumerate(texts))
+
+def decode_packet(translated: str, count: int) -> List[Optional[str]]:
+    """
+    Split a translated packet back into segments using the sentinels.
+    Segments whose sentinel is missing, duplicated or out of order come back as None, as does
+    any segment that may have absorbed the text of a neighbour whose sentinel was lost.
+    """
+    segments = [None] * count
+    matches = list(SENTINEL_PATTERN.finditer(translated))
+    
+    # Anything before the first sentinel belongs to no segment
+    if not matches or translated[:matches[0].start()].strip():
+        return segments
+    
+    found = []
+    for n, match in enumerate(matches):
+        end = matches[n + 1].start() if n + 1 < len(matches) else len(translated)
+        # Drop only the separator newlines around the sentinel lines; the text keeps its own whitespace
+        body = translated[match.end():end]
+        body = body[1:] if body.startswith('\n') else body
+        if n + 1 < len(matches) and body.endswith('\n'):
+            body = body[:-1]
+        found.append((int(match.group(1)), body))
+    
+    indices = [index for index, _ in found]
+    for n, (index, body) in enumerate(found):
+        if index >= count or indices.count(index) > 1 or not body.strip():
+            continue
+        # Sentinels must be strictly increasing around this one
+        if n > 0 and indices[n - 1] >= index:
+            continue
+        if n + 1 < len(found) and indices[n + 1] <= index:
+            continue
+        # A gap after this sentinel means the missing segment's text ended up in this body
+        next_index = indices[n + 1] if n + 1 < len(found) else count
+        if next_index != index + 1:
+            continue
+        segments[index] = body
+    return segments
+
+def translate_batch(texts: List[str], target_lang: str, source_lang: str = "en",
+                    engine: TranslationEngine = None) -> List[str]:
+    """
+    Translate multiple texts by packing them into multi-segment requests.
+    
+    Each segment is preceded by a numbered sentinel line so multi-line markdown can't shift
+    segment boundaries. Replies are checked for alignment and only the broken segments are
+    retried as individual requests. The packed requests are sent concurrently through the
+    shared translation engine; texts already in the translation memory are not sent at all.
+    With masking enabled on the engine, each segment is masked before packing and restored
+    after decoding; a segment that lost a placeholder is retried individually.
+    """
+    engine = engine or TranslationEngine()
+    known = {}
+    if engine.memory:
+        known = engine.memory.get_many(set(texts), target_lang, engine.provider_name)
+    missing = [text for text in dict.fromkeys(texts) if text not in known and text.strip()]
+    
+    learned = {}
+    masked = {}
+    for text in missing:
+        masked[text] = mask_text(text) if engine.masking else (text, [])
+        # Nothing but keywords, numbers and markup: no request needed
+        if engine.masking and not needs_translation(masked[text][0]):
+            learned[text] = text
+    missing = [text for text in missing if text not in learned]
+    
+    # Pack and send
+    segments_sent = [masked[text][0] for text in missing]
+    engine.stats["chars_masked"] += sum(len(text) - len(segment)
+                                        for text, segment in zip(missing, segments_sent))
+    bins = pack_segments(segments_sent)
+    packets = [encode_packet([segments_sent[i] for i in indices]) for indices in bins]
+    replies = engine.translate(packets, target_lang, source_lang, use_memory=False,
+                               fallback_to_source=False, masking=False)
+    
+    broken = []
+    for indices, reply in zip(bins, replies):
+        segments = decode_packet(reply, len(indices)) if reply is not None else [None] * len(indices)
+        for i, segment in zip(indices, segments):
+            text = missing[i]
+            if segment is not None:
+                segment = unmask_text(segment, masked[text][1])
+            if segment is None:
+                broken.append(text)
             else:
-                current_batch.append(text)
-                current_size += text_size
-        
-        # Translate remaining batch
-        if current_batch:
-            batch_text = '\n'.join(current_batch)
-            translated = translate_text(batch_text, target_lang, source_lang)
-            results.extend(translated.split('\n'))
-            time.sleep(0.5)
-        
-        # Ensure we have same number of results
-        while len(results) < len(texts):
-            results.append("")
-        
-        return results[:len(texts)]
-        
-    except Exception as e:
-        print(f"    [WARNING] Batch translation error: {e}")
-        return texts  # Return original on error
+                learned[text] = segment
+    
+    # Retry misaligned segments on their own
+    if broken:
+        print(f"    [WARNING] {len(broken)} segments misaligned, retrying individually")
+        for text, translated in zip(broken, engine.translate(broken, target_lang, source_lang,
+                                                             use_memory=False,
+                                                             fallback_to_source=False)):
+            if translated is not None:
+                learned[text] = translated
+    
+    print(f"    Sent {len(missing)} strings in {len(packets)} packed requests "
+          f"({len(broken)} retried individually)")
+    
+    if engine.memory and learned:
+        engine.memory.put_many(learned.items(), target_lang, engine.provider_name)
+    known.update(learned)
+    
+    # Strings that still failed keep their English text
+    return [known.get(text, text) for text in texts]
 
 def translate_text(text: str, target_lang: str, source_lang: str = "en") -> str:
     """Translate a single text using Google Translate web API."""
@@ -78,49 +174,35 @@ def translate_text(text: str, target_lang: str, source_lang: str = "en") -> str:
         return text
     
     try:
-        import requests
-        import urllib.parse
-        
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": source_lang,
-            "tl": target_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                translated_parts = [part[0] for part in result[0] if part[0]]
-                return ''.join(translated_parts)
-        return text
+        return google_translate(text, target_lang, source_lang, timeout=15)
     except Exception as e:
         print(f"    [WARNING] Translation error: {e}")
         return text
 
-def collect_translatable_strings(data: Any, field_name: str = "", path: str = "") -> List[Dict]:
-    """Collect all translatable strings from JSON with their paths for restoration."""
-    strings = []
-    
-    if isinstance(data, str):
-        if should_translate_field(field_name, data) and data.strip():
-            strings.append({"path": path, "field": field_name, "value": data})
-    elif isinstance(data, dict):
+def collect_translatable_strings(data: Any, field_name: str = "", refs: StringRefs = None) -> StringRefs:
+    """
+    Collect direct (container, key) references to all translatable strings in the JSON,
+    so translations are written back without building or parsing paths.
+    """
+    if refs is None:
+        refs = StringRefs()
+    
+    if isinstance(data, dict):
         for k, v in data.items():
-            new_path = f"{path}.{k}" if path else k
-            strings.extend(collect_translatable_strings(v, k, new_path))
+            if isinstance(v, str):
+                if should_translate_field(k, v) and v.strip():
+                    refs.add(data, k)
+            else:
+                collect_translatable_strings(v, k, refs)
     elif isinstance(data, list):
         for i, item in enumerate(data):
-            new_path = f"{path}[{i}]" if path else f"[{i}]"
-            if isinstance(item, str) and should_translate_field(field_name, item) and item.strip():
-                strings.append({"path": new_path, "field": field_name, "value": item})
+            if isinstance(item, str):
+                if should_translate_field(field_name, item) and item.strip():
+                    refs.add(data, i)
             else:
-                strings.extend(collect_translatable_strings(item, field_name, new_path))
+                collect_translatable_strings(item, field_name, refs)
     
-    return strings
+    return refs
 
 def should_translate_field(field_name: str, value: Any) -> bool:
     """Determine if a field should be translated."""
@@ -135,36 +217,8 @@ def should_translate_field(field_name: str, value: Any) -> bool:
         return True
     return False
 
-def set_value_by_path(data: Any, path: str, value: str):
-    """Set a value in nested dict/list using dot notation path."""
-    parts = path.split('.')
-    current = data
-    
-    for i, part in enumerate(parts[:-1]):
-        if '[' in part:
-            # Handle list indices
-            base, idx = part.split('[')
-            idx = int(idx.rstrip(']'))
-            if base:
-                current = current[base][idx]
-            else:
-                current = current[idx]
-        else:
-            current = current[part]
-    
-    # Set final value
-    final_part = parts[-1]
-    if '[' in final_part:
-        base, idx = final_part.split('[')
-        idx = int(idx.rstrip(']'))
-        if base:
-            current[base][idx] = value
-        else:
-            current[idx] = value
-    else:
-        current[final_part] = value
-
-def translate_file(en_file: Path, target_file: Path, target_lang: str):
+def translate_file(en_file: Path, target_file: Path, target_lang: str,
+                   engine: TranslationEngine = None):
     """Translate a JSON file using batch translation."""
     print(f"\nTranslating {en_file.name} to {target_lang.upper()}...")
     
@@ -187,19 +241,19 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
     
     # Batch translate
     print(f"  Translating in batches (this may take a while)...")
-    texts = [s["value"] for s in translatable_strings]
+    texts = translatable_strings.texts()
+    if engine is None or engine.masking:
+        print(f"  {format_savings(*masking_savings(texts)).capitalize()}")
     
     try:
-        translated_texts = translate_batch(texts, target_lang)
+        translated_texts = translate_batch(texts, target_lang, engine=engine)
     except Exception as e:
         print(f"  [ERROR] Translation failed: {e}")
         return False
     
     # Apply translations back to data structure
     print(f"  Applying translations...")
-    for i, string_info in enumerate(translatable_strings):
-        if i < len(translated_texts):
-            set_value_by_path(data, string_info["path"], translated_texts[i])
+    translatable_strings.write(translated_texts)
     
     # Validate and write
     try:
@@ -209,21 +263,94 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
         return False
     
     try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] Created {target_file.name}")
+        if write_json(target_file, data):
+            print(f"  [OK] Created {target_file.name}")
+        else:
+            print(f"  [SKIP] {target_file.name} unchanged")
         return True
     except Exception as e:
         print(f"  [ERROR] Failed to write {target_file}: {e}")
         return False
 
+def dedup_stats(texts: List[str]) -> Dict[str, float]:
+    """Duplicate statistics for a list of strings: counts, dedup ratio and characters saved."""
+    unique = set(texts)
+    total_chars = sum(len(text) for text in texts)
+    unique_chars = sum(len(text) for text in unique)
+    return {
+        "strings": len(texts),
+        "unique": len(unique),
+        "ratio": len(texts) / max(len(unique), 1),
+        "chars": total_chars,
+        "unique_chars": unique_chars,
+        "chars_saved": total_chars - unique_chars,
+    }
+
+def translate_files(files: List[str], en_dir: Path, target_dir: Path, target_lang: str,
+                    engine: TranslationEngine = None) -> int:
+    """
+    Translate several files with a global deduplication pre-pass.
+    Strings from every input are collected into one unique set, each unique string is
+    translated once, and the results are fanned back out to every file that uses it.
+    Returns the number of files written.
+    """
+    engine = engine or TranslationEngine()
+    
+    # Pre-pass: collect translatable strings from every input
+    print("Collecting translatable strings from all files...")
+    collected = []
+    for filename in files:
+        en_file = en_dir / filename
+        try:
+            with open(en_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"  [ERROR] Failed to read {en_file}: {e}")
+            continue
+        strings = collect_translatable_strings(data)
+        if not strings:
+            print(f"  [SKIP] No translatable strings found in {filename}")
+            continue
+        if engine.masking:
+            savings = masking_savings(strings.texts())
+            print(f"  {filename}: {format_savings(*savings)}")
+        collected.append((filename, data, strings))
+    
+    all_texts = [text for _, _, strings in collected for text in strings.texts()]
+    stats = dedup_stats(all_texts)
+    unique_texts = list(dict.fromkeys(all_texts))
+    print(f"  {stats['strings']} strings in {len(collected)} files, {stats['unique']} unique "
+          f"(dedup ratio {stats['ratio']:.2f}x)")
+    print(f"  {stats['chars_saved']} of {stats['chars']} characters saved by deduplication "
+          f"({stats['chars_saved'] / max(stats['chars'], 1) * 100:.1f}%)")
+    
+    # Translate every unique string once
+    print(f"\nTranslating {len(unique_texts)} unique strings...")
+    translations = dict(zip(unique_texts, translate_batch(unique_texts, target_lang, engine=engine)))
+    
+    # Fan the results back out
+    success_count = 0
+    for filename, data, strings in collected:
+        strings.translate(translations)
+        
+        target_file = target_dir / filename
+        try:
+            if write_json(target_file, data):
+                print(f"  [OK] Created {filename} ({len(strings)} strings)")
+            else:
+                print(f"  [SKIP] {filename} unchanged")
+            success_count += 1
+        except Exception as e:
+            print(f"  [ERROR] Failed to write {target_file}: {e}")
+    return success_count
+
 def main():
     """Main translation function."""
     if len(sys.argv) < 2:
-        print("Usage: python translate_batch.py <language>")
+        print("Usage: python translate_batch.py <language> [--dry-run]")
         print("\nArguments:")
-        print("  language  - Target language: es (Spanish) or fr (French)")
+        print("  language   - Target language: es (Spanish) or fr (French)")
+        print("  --dry-run  - Estimate requests, characters and time without translating")
         print("\nExample:")
         print("  python translate_batch.py es")
         print("\nNote: This uses Google Translate web API which is free but has rate limits.")
@@ -236,25 +363,24 @@ def main():
         print(f"Error: Unsupported language '{target_lang}'. Use 'es' or 'fr'")
         sys.exit(1)
     
+    en_dir = Path('en')
+    files = [f.relative_to(en_dir).as_posix() for f in iter_source_files(en_dir)]
+    
+    if '--dry-run' in sys.argv:
+        # translate_files sends every file's strings in one call
+        texts = []
+        for filename in files:
+            with open(en_dir / filename, 'r', encoding='utf-8') as f:
+                texts.extend(collect_translatable_strings(json.load(f)).texts())
+        print_estimate([texts], target_lang, len(files), ["google"], packed=True)
+        return
+    
     try:
         import requests
     except ImportError:
         print("Error: requests package not installed. Install with: pip install requests")
         sys.exit(1)
     
-    files = [
-        'weapon_rules.json',
-        'universal_equipment.json',
-        'actions.json',
-        'ops_2025.json',
-    ]
-    # Add individual team files
-    teams_dir = Path('en') / 'teams'
-    if teams_dir.exists():
-        team_files = sorted(teams_dir.glob('*.json'))
-        files.extend([f'teams/{f.name}' for f in team_files])
-    
-    en_dir = Path('en')
     target_dir = Path(target_lang)
     target_dir.mkdir(exist_ok=True)
     
@@ -262,29 +388,19 @@ def main():
     print(f"Batch Translating all JSON files to {target_lang.upper()}")
     print("=" * 70)
     print("\nThis will translate all text content using Google Translate.")
-    print("Due to rate limits, this may take 10-30 minutes...")
+    print("Each unique string is translated once across all files.")
     print()
     
-    success_count = 0
+    engine = TranslationEngine()
     start_time = time.time()
-    
-    for filename in files:
-        en_file = en_dir / filename
-        target_file = target_dir / filename
-        
-        if en_file.exists():
-            file_start = time.time()
-            if translate_file(en_file, target_file, target_lang):
-                success_count += 1
-                elapsed = time.time() - file_start
-                print(f"  Completed in {elapsed:.1f} seconds")
-        else:
-            print(f"  [WARNING] {en_file} not found, skipping...")
+    success_count = translate_files(files, en_dir, target_dir, target_lang, engine)
     
     total_time = time.time() - start_time
     print("\n" + "=" * 70)
     print(f"[OK] Translation complete! {success_count}/{len(files)} files translated.")
     print(f"Total time: {total_time/60:.1f} minutes")
+    print(f"Translation engine: {engine.summary()}")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 70)
     print("\nNote: Please review translations for accuracy and Games Workshop terminology.")
 
@@ -6,53 +6,32 @@ Uses Google Translate API (free) or DeepL (requires API key) for complete transl
 
 import json
 import sys
-import time
 from pathlib import Path
 from typing import Any, Optional
+from json_output import OUTPUT_STATS, write_json
+from translation_engine import TranslationEngine
+from translation_providers import get_deepl_provider, google_translate
 
 def translate_google_translate(text: str, target_lang: str, source_lang: str = "en") -> str:
     """
     Translate text using Google Translate API via requests.
     This uses the unofficial Google Translate web interface.
+    Errors propagate so the translation engine can retry and back off.
     """
     try:
-        import requests
-        import urllib.parse
-        
-        # Use Google Translate web API
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": source_lang,
-            "tl": target_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        # Small delay to respect rate limits
-        time.sleep(0.2)
-        
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                # Extract translated text from nested array structure
-                translated_parts = [part[0] for part in result[0] if part[0]]
-                return ''.join(translated_parts)
-        return text
+        return google_translate(text, target_lang, source_lang, timeout=10)
     except ImportError:
         raise ImportError(
             "requests package not installed. Install with:\n"
             "  pip install requests"
         )
-    except Exception as e:
-        print(f"    [WARNING] Google Translate error: {e}")
-        return text
 
 def translate_deepl(text: str, target_lang: str, source_lang: str = "EN", api_key: str = None) -> str:
     """
     Translate text using DeepL API (requires API key).
     Install: pip install deepl
+    Uses the shared DeepL provider, so one client serves the whole run.
+    Errors propagate so the translation engine can retry; 429 responses raise RateLimitedError.
     """
     try:
         import os
@@ -64,29 +43,12 @@ def translate_deepl(text: str, target_lang: str, source_lang: str = "EN", api_ke
         if not api_key:
             raise ValueError("DeepL API key not provided")
         
-        translator = deepl.Translator(api_key)
-        
-        # Map language codes for DeepL
-        deepl_lang_map = {
-            "es": "ES",
-            "fr": "FR",
-            "de": "DE",
-            "it": "IT",
-            "pt": "PT"
-        }
-        
-        deepl_target = deepl_lang_map.get(target_lang.lower(), target_lang.upper())
-        
-        result = translator.translate_text(text, target_lang=deepl_target)
-        return result.text
+        return get_deepl_provider(api_key)(text, target_lang)
     except ImportError:
         raise ImportError(
             "deepl package not installed. Install with:\n"
             "  pip install deepl"
         )
-    except Exception as e:
-        print(f"    [WARNING] DeepL translation error: {e}")
-        return text
 
 # Fields that should NOT be translated (IDs, keys, etc.)
 NON_TRANSLATABLE_FIELDS = ['id', 'type', 'seq', 'AP', 'APL', 'GA', 'DF', 'SV', 'W', 'M', 
@@ -149,7 +111,8 @@ def translate_value(value: Any, field_name: str, target_lang: str, translate_fun
     else:
         return value
 
-def translate_file(en_file: Path, target_file: Path, target_lang: str, translate_func, provider_name: str):
+def translate_file(en_file: Path, target_file: Path, target_lang: str, translate_func, provider_name: str,
+                   engine: TranslationEngine = None):
     """Translate a JSON file using the specified translation function."""
     print(f"\nTranslating {en_file.name} to {target_lang.upper()} using {provider_name}...")
     
@@ -160,8 +123,18 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, translate
         print(f"  [ERROR] Failed to read {en_file}: {e}")
         return False
     
+    # Collect translatable strings in traversal order, then send them through the engine
+    texts = []
+    translate_value(data, "", target_lang, lambda t, l: texts.append(t) or t)
+    if engine is None:
+        # Memory entries are keyed by provider, so don't file DeepL results under Google
+        memory_provider = "deepl" if "deepl" in provider_name.lower() else "google"
+        engine = TranslationEngine(lambda text, tl, sl: translate_func(text, tl),
+                                   provider_name=memory_provider)
+    
     try:
-        translated = translate_value(data, "", target_lang, translate_func)
+        lookup = dict(zip(texts, engine.translate(texts, target_lang)))
+        translated = translate_value(data, "", target_lang, lambda t, l: lookup[t])
     except Exception as e:
         print(f"  [ERROR] Translation failed: {e}")
         return False
@@ -175,10 +148,10 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, translate
     
     # Write translated file
     try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] Created {target_file.name}")
+        if write_json(target_file, translated):
+            print(f"  [OK] Created {target_file.name}")
+        else:
+            print(f"  [SKIP] {target_file.name} unchanged")
         return True
     except Exception as e:
         print(f"  [ERROR] Failed to write {target_file}: {e}")
@@ -254,19 +227,26 @@ def main():
     print("This may take several minutes due to API rate limits...")
     print()
     
+    if provider == "deepl":
+        # List-batch requests through the shared client instead of one request per string
+        engine = TranslationEngine(get_deepl_provider(api_key), provider_name=provider)
+    else:
+        engine = TranslationEngine(lambda text, tl, sl: translate_func(text, tl), provider_name=provider)
     success_count = 0
     for filename in files:
         en_file = en_dir / filename
         target_file = target_dir / filename
         
         if en_file.exists():
-            if translate_file(en_file, target_file, target_lang, translate_func, provider_name):
+            if translate_file(en_file, target_file, target_lang, translate_func, provider_name, engine):
                 success_count += 1
         else:
             print(f"  [WARNING] {en_file} not found, skipping...")
     
     print("\n" + "=" * 70)
     print(f"[OK] Translation complete! {success_count}/{len(files)} files translated.")
+    print(f"Translation engine: {engine.summary()}")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 70)
     print("\nNote: Please review the translations for accuracy and Games Workshop terminology.")
     print("Some technical terms or proper nouns may need manual adjustment.")
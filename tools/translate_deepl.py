@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 DeepL translation script - fast translation using DeepL API.
+Strings are sent in list batches through one client, with the GW terminology
+from translate_all applied as a DeepL glossary.
 Usage: python translate_deepl.py <language> <api_key>
 """
 
@@ -8,34 +10,25 @@ import json
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, List
+from json_output import OUTPUT_STATS, write_json
+from translation_engine import TranslationEngine
+from translation_estimate import print_estimate
+from translation_providers import get_deepl_provider
+
+def gw_glossaries():
+    """GW terminology from translate_all per target language, registered as DeepL glossaries."""
+    from translate_all import LANGUAGES
+    return {lang_code: terms for lang_code, (terms, _) in LANGUAGES.items()}
 
 def translate_deepl(text: str, target_lang: str, api_key: str) -> str:
-    """Translate text using DeepL API."""
-    try:
-        import deepl
-        
-        if not text or not text.strip():
-            return text
-        
-        translator = deepl.Translator(api_key)
-        
-        # Map language codes for DeepL
-        deepl_lang_map = {
-            "es": "ES",
-            "fr": "FR",
-            "de": "DE",
-            "it": "IT",
-            "pt": "PT"
-        }
-        
-        deepl_target = deepl_lang_map.get(target_lang.lower(), target_lang.upper())
-        
-        result = translator.translate_text(text, target_lang=deepl_target)
-        return result.text
-    except Exception as e:
-        print(f"      [WARNING] DeepL translation error: {e}")
+    """
+    Translate text using DeepL API through the shared provider (one client per run).
+    Raises on errors so the engine can retry; 429 responses raise RateLimitedError.
+    """
+    if not text or not text.strip():
         return text
+    return get_deepl_provider(api_key, gw_glossaries())(text, target_lang)
 
 # Fields that should NOT be translated
 NON_TRANSLATABLE = {'id', 'type', 'seq', 'AP', 'APL', 'GA', 'DF', 'SV', 'W', 'M', 
@@ -59,24 +52,15 @@ def should_translate_field(field_name: str, value: Any) -> bool:
         return True
     return False
 
-def translate_value(value: Any, field_name: str, target_lang: str, api_key: str, 
-                   progress_callback=None) -> Any:
+def translate_value(value: Any, field_name: str, target_lang: str,
+                    translate_func: Callable[[str], str]) -> Any:
     """Recursively translate JSON values - field names stay in English!"""
     if isinstance(value, str):
         if should_translate_field(field_name, value) and value.strip():
-            try:
-                result = translate_deepl(value, target_lang, api_key)
-                if progress_callback:
-                    progress_callback()
-                return result
-            except Exception as e:
-                print(f"      [WARNING] Failed to translate {field_name}: {e}")
-                if progress_callback:
-                    progress_callback()
-                return value
+            return translate_func(value)
         return value
     elif isinstance(value, dict):
-        return {k: translate_value(v, k, target_lang, api_key, progress_callback) 
+        return {k: translate_value(v, k, target_lang, translate_func) 
                 for k, v in value.items()}
     elif isinstance(value, list):
         if not value:
@@ -87,15 +71,7 @@ def translate_value(value: Any, field_name: str, target_lang: str, api_key: str,
         if isinstance(first, str):
             # Translate array elements
             if field_name in {'effects', 'conditions', 'packs'}:
-                translated = []
-                for item in value:
-                    if item.strip():
-                        translated.append(translate_deepl(item, target_lang, api_key))
-                        if progress_callback:
-                            progress_callback()
-                    else:
-                        translated.append(item)
-                return translated
+                return [translate_func(item) if item.strip() else item for item in value]
             elif field_name == 'archetypes':
                 # Map archetypes
                 archetype_map = {
@@ -104,32 +80,19 @@ def translate_value(value: Any, field_name: str, target_lang: str, api_key: str,
                     "fr": {"Security": "Sécurité", "Seek & Destroy": "Rechercher et Détruire",
                           "Recon": "Reconnaissance", "Infiltration": "Infiltration"}
                 }
-                translated = []
-                for item in value:
-                    if item in archetype_map.get(target_lang, {}):
-                        translated.append(archetype_map[target_lang][item])
-                    else:
-                        translated.append(translate_deepl(item, target_lang, api_key))
-                        if progress_callback:
-                            progress_callback()
-                return translated
+                return [archetype_map[target_lang][item]
+                        if item in archetype_map.get(target_lang, {}) else translate_func(item)
+                        for item in value]
             elif value and value[0].strip():
-                translated = []
-                for item in value:
-                    if item.strip():
-                        translated.append(translate_deepl(item, target_lang, api_key))
-                        if progress_callback:
-                            progress_callback()
-                    else:
-                        translated.append(item)
-                return translated
+                return [translate_func(item) if item.strip() else item for item in value]
         
-        return [translate_value(item, field_name, target_lang, api_key, progress_callback) 
+        return [translate_value(item, field_name, target_lang, translate_func) 
                 for item in value]
     else:
         return value
 
-def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key: str):
+def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key: str,
+                   engine: TranslationEngine = None):
     """Translate a JSON file."""
     print(f"\nTranslating {en_file.name} to {target_lang.upper()} using DeepL...")
     
@@ -140,21 +103,10 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key:
         print(f"  [ERROR] Failed to read {en_file}: {e}")
         return False
     
-    # Count translatable strings for progress
-    def count_strings(obj, field=""):
-        count = 0
-        if isinstance(obj, str):
-            if should_translate_field(field, obj):
-                count += 1
-        elif isinstance(obj, dict):
-            for k, v in obj.items():
-                count += count_strings(v, k)
-        elif isinstance(obj, list):
-            for item in obj:
-                count += count_strings(item, field)
-        return count
-    
-    total_strings = count_strings(data)
+    # Collect translatable strings in traversal order
+    texts = []
+    translate_value(data, "", target_lang, lambda text: texts.append(text) or text)
+    total_strings = len(texts)
     print(f"  Found {total_strings} translatable strings")
     
     if total_strings == 0:
@@ -173,8 +125,7 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key:
         # Show progress every 25 strings or every 5 seconds
         if (translated_count[0] % 25 == 0) or (current_time - last_progress_time[0] >= 5):
             progress = (translated_count[0] / total_strings) * 100
-            elapsed = current_time - last_progress_time[0]
-            rate = translated_count[0] / max(elapsed, 1)
+            rate = translated_count[0] / max(current_time - start_time, 0.001)
             remaining = (total_strings - translated_count[0]) / max(rate, 0.1)
             
             print(f"    [{translated_count[0]}/{total_strings}] {progress:.1f}% | "
@@ -183,9 +134,13 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key:
     
     print(f"  Starting translation...")
     start_time = time.time()
+    engine = engine or TranslationEngine(get_deepl_provider(api_key, gw_glossaries()),
+                                         provider_name="deepl")
     
     try:
-        translated_data = translate_value(data, "", target_lang, api_key, progress_callback)
+        translated = engine.translate(texts, target_lang, progress_callback=progress_callback)
+        lookup = dict(zip(texts, translated))
+        translated_data = translate_value(data, "", target_lang, lookup.__getitem__)
     except Exception as e:
         print(f"  [ERROR] Translation failed: {e}")
         import traceback
@@ -201,48 +156,47 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, api_key:
     
     # Write
     try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
+        written = write_json(target_file, translated_data)
         elapsed = time.time() - start_time
-        print(f"  [OK] Created {target_file.name}")
+        print(f"  [OK] Created {target_file.name}" if written else f"  [SKIP] {target_file.name} unchanged")
         print(f"      {translated_count[0]} strings translated in {elapsed:.1f}s ({elapsed/60:.1f} min)")
         return True
     except Exception as e:
         print(f"  [ERROR] Failed to write {target_file}: {e}")
         return False
 
+def estimate_run(files: List[str], target_lang: str):
+    """Print the DeepL cost and time of translating ``files``, without contacting DeepL."""
+    en_dir = Path('en')
+    calls = []
+    files = [filename for filename in files if (en_dir / filename).exists()]
+    for filename in files:
+        texts = []
+        with open(en_dir / filename, 'r', encoding='utf-8') as f:
+            translate_value(json.load(f), "", target_lang, lambda text: texts.append(text) or text)
+        calls.append(texts)
+    print_estimate(calls, target_lang, len(files), ["deepl"])
+
 def main():
     """Main translation function."""
-    if len(sys.argv) < 3:
-        print("Usage: python translate_deepl.py <language> <api_key>")
+    dry_run = '--dry-run' in sys.argv
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) < (1 if dry_run else 2):
+        print("Usage: python translate_deepl.py <language> <api_key> [--dry-run]")
         print("\nArguments:")
-        print("  language  - Target language: es (Spanish) or fr (French)")
-        print("  api_key   - Your DeepL API key")
+        print("  language   - Target language: es (Spanish) or fr (French)")
+        print("  api_key    - Your DeepL API key (not needed with --dry-run)")
+        print("  --dry-run  - Estimate billed characters and time without contacting DeepL")
         print("\nExample:")
         print("  python translate_deepl.py es 06238e61-30f8-445a-9188-56ea16902f56:fx")
         sys.exit(1)
     
-    target_lang = sys.argv[1].lower()
-    api_key = sys.argv[2]
+    target_lang = args[0].lower()
     
     if target_lang not in ["es", "fr"]:
         print(f"Error: Unsupported language '{target_lang}'. Use 'es' or 'fr'")
         sys.exit(1)
     
-    try:
-        import deepl
-        # Test API key
-        translator = deepl.Translator(api_key)
-        usage = translator.get_usage()
-        print(f"DeepL API Usage: {usage.character.count}/{usage.character.limit} characters used")
-    except ImportError:
-        print("Error: deepl package not installed. Install with: pip install deepl")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: DeepL API key validation failed: {e}")
-        sys.exit(1)
-    
     files = [
         'weapon_rules.json',
         'universal_equipment.json',
@@ -255,6 +209,24 @@ def main():
         team_files = sorted(teams_dir.glob('*.json'))
         files.extend([f'teams/{f.name}' for f in team_files])
     
+    if dry_run:
+        estimate_run(files, target_lang)
+        return
+    api_key = args[1]
+    
+    try:
+        import deepl
+        # Test API key
+        provider = get_deepl_provider(api_key, gw_glossaries())
+        usage = provider.translator.get_usage()
+        print(f"DeepL API Usage: {usage.character.count}/{usage.character.limit} characters used")
+    except ImportError:
+        print("Error: deepl package not installed. Install with: pip install deepl")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: DeepL API key validation failed: {e}")
+        sys.exit(1)
+    
     en_dir = Path('en')
     target_dir = Path(target_lang)
     target_dir.mkdir(exist_ok=True)
@@ -265,6 +237,7 @@ def main():
     print("\nField names stay in English - only values are translated.")
     print()
     
+    engine = TranslationEngine(provider, provider_name="deepl")
     success_count = 0
     start_time = time.time()
     
@@ -274,7 +247,7 @@ def main():
         
         if en_file.exists():
             file_start = time.time()
-            if translate_file(en_file, target_file, target_lang, api_key):
+            if translate_file(en_file, target_file, target_lang, api_key, engine):
                 success_count += 1
                 elapsed = time.time() - file_start
                 print(f"  Completed in {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
@@ -285,6 +258,8 @@ def main():
     print("\n" + "=" * 70)
     print(f"[OK] Translation complete! {success_count}/{len(files)} files translated.")
     print(f"Total time: {total_time/60:.1f} minutes")
+    print(f"Translation engine: {engine.summary()}")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 70)
     print("\nNote: Please review translations for accuracy and Games Workshop terminology.")
 
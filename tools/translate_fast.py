@@ -9,6 +9,10 @@ import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, List
+from json_refs import StringRefs
+from json_output import OUTPUT_STATS, write_json
+from translation_engine import TranslationEngine
+from translation_providers import google_translate
 
 # Fields that should NOT be translated
 NON_TRANSLATABLE = {'id', 'type', 'seq', 'AP', 'APL', 'GA', 'DF', 'SV', 'W', 'M', 
@@ -26,83 +30,72 @@ def translate_text(text: str, target_lang: str) -> str:
         return text
     
     try:
-        import requests
-        
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": "en",
-            "tl": target_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                translated_parts = [part[0] for part in result[0] if part[0]]
-                return ''.join(translated_parts)
-        return text
+        return google_translate(text, target_lang, timeout=15)
     except Exception as e:
         print(f"      [WARNING] Translation error: {e}")
         return text
 
-def translate_value_recursive(value: Any, field_name: str, target_lang: str, translate_func) -> Any:
-    """Recursively translate JSON values - field names stay in English!"""
-    if isinstance(value, str):
-        # Check if this field should be translated
-        if field_name in TRANSLATABLE or (field_name not in NON_TRANSLATABLE and value.strip()):
-            # Don't translate IDs or codes
-            if field_name.lower().endswith(('id', '_id', 'code', '_code')):
-                return value
-            # Translate the value
-            if value.strip():
-                try:
-                    return translate_func(value, target_lang)
-                except Exception as e:
-                    print(f"      [WARNING] Failed to translate {field_name}: {e}")
-                    return value
-        return value
-    elif isinstance(value, dict):
-        # Keep field names in English, only translate values
-        return {k: translate_value_recursive(v, k, target_lang, translate_func) 
-                for k, v in value.items()}
-    elif isinstance(value, list):
-        if not value:
-            return value
-        
+# Official archetype names, used instead of machine translation
+ARCHETYPE_MAP = {
+    "es": {"Security": "Seguridad", "Seek & Destroy": "Buscar y Destruir", 
+          "Recon": "Reconocimiento", "Infiltration": "Infiltración"},
+    "fr": {"Security": "Sécurité", "Seek & Destroy": "Rechercher et Détruire",
+          "Recon": "Reconnaissance", "Infiltration": "Infiltration"}
+}
+
+def should_translate_string(field_name: str, value: str) -> bool:
+    """Whether a string value of ``field_name`` is translated - field names stay in English!"""
+    if not value.strip():
+        return False
+    if field_name not in TRANSLATABLE and field_name in NON_TRANSLATABLE:
+        return False
+    # Don't translate IDs or codes
+    return not field_name.lower().endswith(('id', '_id', 'code', '_code'))
+
+def collect_translatable_refs(value: Any, field_name: str, target_lang: str,
+                              refs: StringRefs = None) -> StringRefs:
+    """
+    Collect (container, key) references to every string to translate, for in-place write-back.
+    Archetypes with an official name are written immediately instead of being collected.
+    """
+    if refs is None:
+        refs = StringRefs()
+    
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if isinstance(v, str):
+                if should_translate_string(k, v):
+                    refs.add(value, k)
+            else:
+                collect_translatable_refs(v, k, target_lang, refs)
+    elif isinstance(value, list) and value:
         first = value[0]
         
-        # Translate array elements
-        if isinstance(first, str):
-            # For effects, conditions, packs arrays
-            if field_name in {'effects', 'conditions', 'packs'}:
-                return [translate_func(item, target_lang) if item.strip() else item 
-                       for item in value]
-            # For archetypes or other string arrays
-            elif field_name == 'archetypes':
-                # Map archetypes
-                archetype_map = {
-                    "es": {"Security": "Seguridad", "Seek & Destroy": "Buscar y Destruir", 
-                          "Recon": "Reconocimiento", "Infiltration": "Infiltración"},
-                    "fr": {"Security": "Sécurité", "Seek & Destroy": "Rechercher et Détruire",
-                          "Recon": "Reconnaissance", "Infiltration": "Infiltration"}
-                }
-                return [archetype_map.get(target_lang, {}).get(item, translate_func(item, target_lang))
-                       for item in value]
-            # Generic string array
-            elif value and value[0].strip():
-                return [translate_func(item, target_lang) if item.strip() else item 
-                       for item in value]
-        
-        # Recursive for nested objects
-        return [translate_value_recursive(item, field_name, target_lang, translate_func) 
-                for item in value]
-    else:
-        return value
+        if isinstance(first, str) and field_name == 'archetypes':
+            archetypes = ARCHETYPE_MAP.get(target_lang, {})
+            for i, item in enumerate(value):
+                if item in archetypes:
+                    value[i] = archetypes[item]
+                else:
+                    refs.add(value, i)
+        elif isinstance(first, str) and (field_name in {'effects', 'conditions', 'packs'} or first.strip()):
+            # For effects, conditions, packs and other string arrays
+            for i, item in enumerate(value):
+                if item.strip():
+                    refs.add(value, i)
+        else:
+            # Nested objects (or strings judged by their field name)
+            for i, item in enumerate(value):
+                if isinstance(item, str):
+                    if should_translate_string(field_name, item):
+                        refs.add(value, i)
+                else:
+                    collect_translatable_refs(item, field_name, target_lang, refs)
+    
+    return refs
 
-def translate_file(en_file: Path, target_file: Path, target_lang: str):
+def translate_file(en_file: Path, target_file: Path, target_lang: str,
+                   engine: TranslationEngine = None):
     """Translate a JSON file."""
     print(f"\nTranslating {en_file.name} to {target_lang.upper()}...")
     
@@ -113,38 +106,27 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
         print(f"  [ERROR] Failed to read {en_file}: {e}")
         return False
     
-    # Count translatable strings for progress
-    def count_strings(obj, field=""):
-        count = 0
-        if isinstance(obj, str):
-            if field in TRANSLATABLE or (field not in NON_TRANSLATABLE and obj.strip()):
-                if not field.lower().endswith(('id', '_id', 'code', '_code')):
-                    count += 1
-        elif isinstance(obj, dict):
-            for k, v in obj.items():
-                count += count_strings(v, k)
-        elif isinstance(obj, list):
-            for item in obj:
-                count += count_strings(item, field)
-        return count
-    
-    total_strings = count_strings(data)
+    # Collect references to the translatable strings in traversal order
+    refs = collect_translatable_refs(data, "", target_lang)
+    texts = refs.texts()
+    total_strings = len(texts)
     print(f"  Found {total_strings} translatable strings (this will take time)...")
     
     # Translate with progress indication
     translated_count = [0]
     
-    def translate_with_progress(text, lang):
-        result = translate_text(text, lang)
+    def progress_callback():
         translated_count[0] += 1
         if translated_count[0] % 10 == 0:
             print(f"    Progress: {translated_count[0]}/{total_strings} strings translated...")
-        time.sleep(0.3)  # Rate limit delay
-        return result
+    
+    engine = engine or TranslationEngine()
     
     try:
-        translated_data = translate_value_recursive(data, "", target_lang, 
-                                                   lambda t, l: translate_with_progress(t, l))
+        translated = engine.translate(texts, target_lang, progress_callback=progress_callback)
+        # Write the translations straight into the parsed tree
+        refs.write(translated)
+        translated_data = data
     except Exception as e:
         print(f"  [ERROR] Translation failed: {e}")
         return False
@@ -158,10 +140,10 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
     
     # Write
     try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] Created {target_file.name}")
+        if write_json(target_file, translated_data):
+            print(f"  [OK] Created {target_file.name}")
+        else:
+            print(f"  [SKIP] {target_file.name} unchanged")
         return True
     except Exception as e:
         print(f"  [ERROR] Failed to write {target_file}: {e}")
@@ -216,6 +198,7 @@ def main():
     print("Progress will be shown during translation.")
     print()
     
+    engine = TranslationEngine()
     success_count = 0
     start_time = time.time()
     
@@ -225,7 +208,7 @@ def main():
         
         if en_file.exists():
             file_start = time.time()
-            if translate_file(en_file, target_file, target_lang):
+            if translate_file(en_file, target_file, target_lang, engine):
                 success_count += 1
                 elapsed = time.time() - file_start
                 print(f"  Completed in {elapsed/60:.1f} minutes")
@@ -236,6 +219,8 @@ def main():
     print("\n" + "=" * 70)
     print(f"[OK] Translation complete! {success_count}/{len(files)} files translated.")
     print(f"Total time: {total_time/60:.1f} minutes")
+    print(f"Translation engine: {engine.summary()}")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 70)
 
 if __name__ == '__main__':
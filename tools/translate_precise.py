@@ -8,8 +8,16 @@ import json
 import sys
 import time
 from pathlib import Path
-from typing import Any, List
-from translation_config import should_translate_field
+from typing import Any, Callable, Dict, List
+from json_output import OUTPUT_STATS, write_json
+from translation_config import NO_RULES, RuleNode, compiled_rules, translatable_refs
+from translation_engine import TranslationEngine
+from translation_estimate import print_estimate
+from translation_providers import google_translate
+from translation_journal import TranslationJournal
+from translation_masking import format_savings, masking_savings
+from translation_manifest import TranslationManifest, collect_translatable_paths, manifest_key
+from validate_translation import compare_structures
 
 def translate_text(text: str, target_lang: str) -> str:
     """Translate a single text using Google Translate web API."""
@@ -17,41 +25,13 @@ def translate_text(text: str, target_lang: str) -> str:
         return text
     
     try:
-        import requests
-        
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": "en",
-            "tl": target_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        response = requests.get(url, params=params, timeout=20)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                translated_parts = [part[0] for part in result[0] if part[0]]
-                return ''.join(translated_parts)
-        return text
+        return google_translate(text, target_lang)
     except Exception as e:
         print(f"      [WARNING] Translation error: {e}")
-        # Retry once after a short delay
-        time.sleep(1)
-        try:
-            response = requests.get(url, params=params, timeout=20)
-            if response.status_code == 200:
-                result = response.json()
-                if result and result[0]:
-                    translated_parts = [part[0] for part in result[0] if part[0]]
-                    return ''.join(translated_parts)
-        except:
-            pass
         return text
 
 def translate_value(value: Any, field_name: str, field_path: List[str], 
-                   file_name: str, target_lang: str, progress_callback=None) -> Any:
+                   file_name: str, translate_func: Callable[[str], str]) -> Any:
     """
     Recursively translate JSON values based on precise field rules.
     Field names stay in English - only specified values are translated.
@@ -61,30 +41,24 @@ def translate_value(value: Any, field_name: str, field_path: List[str],
         field_name: Name of the current field
         field_path: List of parent field names (for nested structures)
         file_name: Name of the JSON file being translated
-        target_lang: Target language code
-        progress_callback: Optional callback function for progress tracking
+        translate_func: Function called with each translatable string, returning its translation
     """
+    return _translate_node(value, field_name, compiled_rules(file_name, field_path), translate_func)
+
+def _translate_node(value: Any, field_name: str, node: RuleNode,
+                    translate_func: Callable[[str], str]) -> Any:
+    """translate_value against an already compiled rules node (one lookup per JSON node)."""
     if isinstance(value, str):
         # Check if this field should be translated
-        if should_translate_field(file_name, field_path, field_name) and value.strip():
-            try:
-                result = translate_text(value, target_lang)
-                if progress_callback:
-                    progress_callback()
-                time.sleep(0.3)  # Rate limit delay
-                return result
-            except Exception as e:
-                print(f"      [WARNING] Failed to translate {field_name}: {e}")
-                if progress_callback:
-                    progress_callback()
-                return value
+        if node.translates(field_name) and value.strip():
+            return translate_func(value)
         return value
     elif isinstance(value, dict):
-        # Update field path for nested objects
-        # Add current field_name to path if it exists (for nested objects)
-        new_path = field_path + [field_name] if field_name else field_path
-        return {k: translate_value(v, k, new_path, file_name, target_lang, progress_callback) 
-                for k, v in value.items()}
+        # Nested objects descend into the rules of their field name
+        node = node.child(field_name) if field_name else node
+        if node is NO_RULES:
+            return value
+        return {k: _translate_node(v, k, node, translate_func) for k, v in value.items()}
     elif isinstance(value, list):
         if not value:
             return value
@@ -93,35 +67,132 @@ def translate_value(value: Any, field_name: str, field_path: List[str],
         first = value[0]
         if isinstance(first, str):
             # For arrays like effects, conditions - check if parent field allows translation
-            if should_translate_field(file_name, field_path, field_name):
-                translated = []
-                for item in value:
-                    if item.strip():
-                        translated.append(translate_text(item, target_lang))
-                        if progress_callback:
-                            progress_callback()
-                        time.sleep(0.3)
-                    else:
-                        translated.append(item)
-                return translated
+            if node.translates(field_name):
+                return [translate_func(item) if item.strip() else item for item in value]
             return value
         
-        # For arrays of objects (like opTypes, weapons, etc.)
-        # Add the field_name to path so nested fields can be found
-        # Example: opTypes array -> path becomes ['opTypes'], then inside each item we look for 'weapons'
-        new_path = field_path + [field_name] if field_name else field_path
-        return [translate_value(item, "", new_path, file_name, target_lang, progress_callback) 
-                for item in value]
+        # For arrays of objects (like opTypes, weapons, etc.) the items use the array's rules
+        # Example: opTypes array -> items are matched against the 'opTypes' rules, which contain 'weapons'
+        node = node.child(field_name) if field_name else node
+        if node is NO_RULES:
+            return value
+        return [_translate_node(item, "", node, translate_func) for item in value]
     else:
         return value
 
-def translate_file(en_file: Path, target_file: Path, target_lang: str):
-    """Translate a JSON file using precise field rules."""
+def translate_strings(strings: Dict[str, str], file_name: str, target_lang: str,
+                      engine: TranslationEngine, journal: TranslationJournal = None,
+                      progress_callback=None) -> Dict[str, str]:
+    """
+    Translate ``strings`` (path -> English text) of one file and return English text -> translation.
+    Strings already in the journal are reused; every new translation is journaled as soon as
+    it arrives, so an interrupted run loses nothing.
+    """
+    lookup = journal.completed(file_name, strings) if journal is not None else {}
+    if lookup:
+        print(f"  [INFO] Resumed {len(lookup)} strings from {journal.path}")
+        if progress_callback:
+            for text in strings.values():
+                if text in lookup:
+                    progress_callback()
+    
+    paths_by_text = {}
+    for path, text in strings.items():
+        if text not in lookup:
+            paths_by_text.setdefault(text, []).append(path)
+    
+    def on_result(text, translation):
+        journal.record(file_name, paths_by_text[text], text, translation)
+    
+    texts = list(paths_by_text)
+    translated = engine.translate(texts, target_lang, progress_callback=progress_callback,
+                                  on_result=on_result if journal is not None else None)
+    lookup.update(zip(texts, translated))
+    return lookup
+
+def translate_changed_paths(data: Any, file_name: str, target_file: Path, target_lang: str,
+                            engine: TranslationEngine, manifest: TranslationManifest,
+                            journal: TranslationJournal = None):
+    """
+    Incrementally update an existing translation.
+    Only paths whose English text is new or changed since the manifest was recorded are
+    translated and patched into the existing target file; everything else is left untouched.
+    Returns None when the existing target can't be patched (missing, unreadable or with a
+    different structure), in which case the caller falls back to a full translation.
+    """
+    if not target_file.exists() or not manifest.has_file(file_name):
+        return None
+    
+    try:
+        with open(target_file, 'r', encoding='utf-8') as f:
+            target_data = json.load(f)
+    except Exception as e:
+        print(f"  [WARNING] Failed to read existing {target_file}: {e}")
+        return None
+    
+    if compare_structures(data, target_data):
+        print(f"  [INFO] Structure differs from the existing translation, rebuilding whole file")
+        return None
+    
+    strings = collect_translatable_paths(data, file_name)
+    changed = manifest.changed_paths(file_name, strings)
+    if not changed:
+        print(f"  [SKIP] Up to date ({len(strings)} strings unchanged)")
+        return True
+    
+    print(f"  {len(changed)}/{len(strings)} strings new or changed, patching existing translation")
+    fallbacks = engine.stats["fallbacks"]
+    lookup = translate_strings({path: strings[path] for path in changed}, file_name,
+                               target_lang, engine, journal)
+    # Same structure as the English file, so the changed paths are found among its references
+    # (blank strings included, in case the existing translation left one empty)
+    handles = translatable_refs(target_data, file_name, with_paths=True, skip_blank=False).handles()
+    for path in changed:
+        container, key = handles[path]
+        container[key] = lookup[strings[path]]
+    
+    try:
+        write_json(target_file, target_data)
+    except Exception as e:
+        print(f"  [ERROR] Failed to write {target_file}: {e}")
+        return False
+    
+    # Strings that fell back to English must be retried next run
+    if engine.stats["fallbacks"] == fallbacks:
+        manifest.record(file_name, strings)
+        manifest.save()
+    print(f"  [OK] Updated {target_file.name}")
+    return True
+
+def pending_strings(en_file: Path, target_file: Path, manifest: TranslationManifest = None) -> List[str]:
+    """
+    English strings a run would translate for one file, without translating anything:
+    with a manifest and a patchable target, only the new or changed ones.
+    """
+    file_name = manifest_key(en_file)
+    with open(en_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    strings = collect_translatable_paths(data, file_name)
+    if manifest is not None and target_file.exists() and manifest.has_file(file_name):
+        try:
+            with open(target_file, 'r', encoding='utf-8') as f:
+                target_data = json.load(f)
+        except Exception:
+            return list(strings.values())
+        if not compare_structures(data, target_data):
+            return [strings[path] for path in manifest.changed_paths(file_name, strings)]
+    return list(strings.values())
+
+def translate_file(en_file: Path, target_file: Path, target_lang: str,
+                   engine: TranslationEngine = None, manifest: TranslationManifest = None,
+                   journal: TranslationJournal = None):
+    """
+    Translate a JSON file using precise field rules.
+    With a manifest, only new or changed strings are translated into the existing target file.
+    With a journal, every translation is checkpointed and already journaled strings are reused.
+    """
     # For team files, use the full relative path for rule matching
-    if 'teams' in str(en_file):
-        file_name = f"teams/{en_file.name}"
-    else:
-        file_name = en_file.name
+    file_name = manifest_key(en_file)
     print(f"\nTranslating {en_file.name} to {target_lang.upper()}...")
     
     try:
@@ -131,29 +202,24 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
         print(f"  [ERROR] Failed to read {en_file}: {e}")
         return False
     
-    # Count translatable strings for progress
-    def count_strings(obj, field="", path=None):
-        if path is None:
-            path = []
-        count = 0
-        if isinstance(obj, str):
-            if should_translate_field(file_name, path, field) and obj.strip():
-                count += 1
-        elif isinstance(obj, dict):
-            for k, v in obj.items():
-                new_path = path + [field] if field else path
-                count += count_strings(v, k, new_path)
-        elif isinstance(obj, list):
-            for item in obj:
-                count += count_strings(item, field, path)
-        return count
-    
-    total_strings = count_strings(data)
+    engine = engine or TranslationEngine()
+    if manifest is not None:
+        result = translate_changed_paths(data, file_name, target_file, target_lang, engine,
+                                         manifest, journal)
+        if result is not None:
+            return result
+    
+    # Collect references to the translatable strings, with their paths
+    refs = translatable_refs(data, file_name, with_paths=True)
+    strings = refs.locations()
+    total_strings = len(strings)
     print(f"  Found {total_strings} translatable strings")
     
     if total_strings == 0:
         print(f"  [SKIP] No translatable strings found")
         return False
+    if engine.masking:
+        print(f"  {format_savings(*masking_savings(strings.values())).capitalize()}")
     
     # Progress tracking
     translated_count = [0]
@@ -166,8 +232,7 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
         # Show progress every 50 strings or every 10 seconds
         if (translated_count[0] % 50 == 0) or (current_time - last_progress_time[0] >= 10):
             progress = (translated_count[0] / total_strings) * 100
-            elapsed = current_time - last_progress_time[0]
-            rate = 50 / max(elapsed, 1) if translated_count[0] % 50 == 0 else translated_count[0] / max(current_time - (time.time() - elapsed), 1)
+            rate = translated_count[0] / max(current_time - start_time, 0.001)
             remaining = (total_strings - translated_count[0]) / max(rate, 0.1)
             
             print(f"    [{translated_count[0]}/{total_strings}] {progress:.1f}% | "
@@ -176,9 +241,14 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
     
     print(f"  Starting translation...")
     start_time = time.time()
+    fallbacks = engine.stats["fallbacks"]
     
     try:
-        translated_data = translate_value(data, "", [], file_name, target_lang, progress_callback)
+        lookup = translate_strings(strings, file_name, target_lang, engine, journal,
+                                   progress_callback)
+        # Write the translations straight into the parsed tree
+        refs.translate(lookup)
+        translated_data = data
     except KeyboardInterrupt:
         print(f"\n  [INTERRUPTED] Translation stopped at {translated_count[0]}/{total_strings} strings")
         return False
@@ -197,44 +267,49 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str):
     
     # Write
     try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
+        written = write_json(target_file, translated_data)
         elapsed = time.time() - start_time
-        print(f"  [OK] Created {target_file.name}")
+        print(f"  [OK] Created {target_file.name}" if written else f"  [SKIP] {target_file.name} unchanged")
         print(f"      {translated_count[0]} strings translated in {elapsed/60:.1f} minutes")
-        return True
     except Exception as e:
         print(f"  [ERROR] Failed to write {target_file}: {e}")
         return False
+    
+    # Strings that fell back to English must be retried next run
+    if manifest is not None and engine.stats["fallbacks"] == fallbacks:
+        manifest.record(file_name, strings)
+        manifest.save()
+    return True
 
 def main():
     """Main translation function."""
     if len(sys.argv) < 2:
-        print("Usage: python translate_precise.py <language> [file1] [file2] ...")
+        print("Usage: python translate_precise.py <language> [file1] [file2] ... [--full] [--resume] [--dry-run]")
         print("\nArguments:")
         print("  language  - Target language: es (Spanish) or fr (French)")
         print("  files     - Optional: specific files to translate (default: all)")
+        print("  --full    - Ignore the manifest and rebuild every target file from scratch")
+        print("  --resume  - Continue an interrupted run from <language>.journal.jsonl")
+        print("  --dry-run - Estimate requests, characters and time without translating")
         print("\nExample:")
         print("  python translate_precise.py es")
         print("  python translate_precise.py es teams.json")
+        print("\nOnly strings that changed since the last run (see <language>.manifest.json)")
+        print("are translated and patched into the existing target files.")
         sys.exit(1)
     
-    target_lang = sys.argv[1].lower()
+    full_rebuild = '--full' in sys.argv
+    resume = '--resume' in sys.argv
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    target_lang = args[0].lower()
     
     if target_lang not in ["es", "fr"]:
         print(f"Error: Unsupported language '{target_lang}'. Use 'es' or 'fr'")
         sys.exit(1)
     
-    try:
-        import requests
-    except ImportError:
-        print("Error: requests package not installed. Install with: pip install requests")
-        sys.exit(1)
-    
     # Determine which files to translate
-    if len(sys.argv) > 2:
-        files = sys.argv[2:]
+    if len(args) > 1:
+        files = args[1:]
     else:
         files = [
             'weapon_rules.json',
@@ -250,6 +325,20 @@ def main():
     
     en_dir = Path('en')
     target_dir = Path(target_lang)
+    
+    if '--dry-run' in sys.argv:
+        manifest = None if full_rebuild else TranslationManifest.for_language(target_lang)
+        found = [filename for filename in files if (en_dir / filename).exists()]
+        calls = [pending_strings(en_dir / filename, target_dir / filename, manifest) for filename in found]
+        print_estimate(calls, target_lang, len(found), ["google"])
+        return
+    
+    try:
+        import requests
+    except ImportError:
+        print("Error: requests package not installed. Install with: pip install requests")
+        sys.exit(1)
+    
     target_dir.mkdir(exist_ok=True)
     
     print("=" * 70)
@@ -258,23 +347,38 @@ def main():
     print("\nOnly specified fields will be translated (see translation_config.py)")
     print()
     
+    engine = TranslationEngine()
+    manifest = TranslationManifest.for_language(target_lang)
+    journal_path = Path(f"{target_lang}.journal.jsonl")
+    if journal_path.exists() and not resume:
+        print(f"[WARNING] Discarding {journal_path} from an interrupted run (use --resume to continue it)")
+    journal = TranslationJournal.for_language(target_lang, resume)
+    if resume:
+        print(f"[INFO] Resuming: {len(journal)} strings already translated in {journal.path}")
     success_count = 0
     start_time = time.time()
     
-    for filename in files:
-        en_file = en_dir / filename
-        target_file = target_dir / filename
-        
-        if en_file.exists():
-            if translate_file(en_file, target_file, target_lang):
-                success_count += 1
-        else:
-            print(f"  [WARNING] {en_file} not found, skipping...")
+    try:
+        for filename in files:
+            en_file = en_dir / filename
+            target_file = target_dir / filename
+            
+            if en_file.exists():
+                if translate_file(en_file, target_file, target_lang, engine,
+                                  None if full_rebuild else manifest, journal):
+                    success_count += 1
+            else:
+                print(f"  [WARNING] {en_file} not found, skipping...")
+    finally:
+        # Kept until the next run without --resume, in case this one did not complete
+        journal.close()
     
     total_time = time.time() - start_time
     print("\n" + "=" * 70)
     print(f"[OK] Translation complete! {success_count}/{len(files)} files translated.")
     print(f"Total time: {total_time/60:.1f} minutes")
+    print(f"Translation engine: {engine.summary()}")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 70)
 
 if __name__ == '__main__':
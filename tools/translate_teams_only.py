@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """
-Translate only teams.json using Google Translate.
+Translate only the team files (en/teams/*.json) using Google Translate.
 """
 
 import json
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+from json_output import write_json
+from translation_config import iter_source_files
+from translation_engine import TranslationEngine
+from translation_providers import google_translate
 
 # Fields that should NOT be translated
 NON_TRANSLATABLE = {'id', 'type', 'seq', 'AP', 'APL', 'GA', 'DF', 'SV', 'W', 'M', 
@@ -25,37 +29,9 @@ def translate_text(text: str, target_lang: str) -> str:
         return text
     
     try:
-        import requests
-        
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": "en",
-            "tl": target_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        response = requests.get(url, params=params, timeout=20)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                translated_parts = [part[0] for part in result[0] if part[0]]
-                return ''.join(translated_parts)
-        return text
+        return google_translate(text, target_lang)
     except Exception as e:
         print(f"      [WARNING] Translation error: {e}")
-        # Retry once after a short delay
-        time.sleep(1)
-        try:
-            response = requests.get(url, params=params, timeout=20)
-            if response.status_code == 200:
-                result = response.json()
-                if result and result[0]:
-                    translated_parts = [part[0] for part in result[0] if part[0]]
-                    return ''.join(translated_parts)
-        except:
-            pass
         return text
 
 def should_translate_field(field_name: str, value: Any) -> bool:
@@ -70,24 +46,15 @@ def should_translate_field(field_name: str, value: Any) -> bool:
         return True
     return False
 
-def translate_value(value: Any, field_name: str, target_lang: str, progress_callback=None) -> Any:
+def translate_value(value: Any, field_name: str, target_lang: str,
+                    translate_func: Callable[[str], str]) -> Any:
     """Recursively translate JSON values - field names stay in English!"""
     if isinstance(value, str):
         if should_translate_field(field_name, value) and value.strip():
-            try:
-                result = translate_text(value, target_lang)
-                if progress_callback:
-                    progress_callback()
-                time.sleep(0.3)  # Rate limit delay
-                return result
-            except Exception as e:
-                print(f"      [WARNING] Failed to translate {field_name}: {e}")
-                if progress_callback:
-                    progress_callback()
-                return value
+            return translate_func(value)
         return value
     elif isinstance(value, dict):
-        return {k: translate_value(v, k, target_lang, progress_callback) 
+        return {k: translate_value(v, k, target_lang, translate_func) 
                 for k, v in value.items()}
     elif isinstance(value, list):
         if not value:
@@ -97,16 +64,7 @@ def translate_value(value: Any, field_name: str, target_lang: str, progress_call
         
         if isinstance(first, str):
             if field_name in {'effects', 'conditions', 'packs'}:
-                translated = []
-                for item in value:
-                    if item.strip():
-                        translated.append(translate_text(item, target_lang))
-                        if progress_callback:
-                            progress_callback()
-                        time.sleep(0.3)
-                    else:
-                        translated.append(item)
-                return translated
+                return [translate_func(item) if item.strip() else item for item in value]
             elif field_name == 'archetypes':
                 archetype_map = {
                     "es": {"Security": "Seguridad", "Seek & Destroy": "Buscar y Destruir", 
@@ -114,68 +72,43 @@ def translate_value(value: Any, field_name: str, target_lang: str, progress_call
                     "fr": {"Security": "Sécurité", "Seek & Destroy": "Rechercher et Détruire",
                           "Recon": "Reconnaissance", "Infiltration": "Infiltration"}
                 }
-                translated = []
-                for item in value:
-                    if item in archetype_map.get(target_lang, {}):
-                        translated.append(archetype_map[target_lang][item])
-                    else:
-                        translated.append(translate_text(item, target_lang))
-                        if progress_callback:
-                            progress_callback()
-                        time.sleep(0.3)
-                return translated
+                return [archetype_map[target_lang][item]
+                        if item in archetype_map.get(target_lang, {}) else translate_func(item)
+                        for item in value]
             elif value and value[0].strip():
-                translated = []
-                for item in value:
-                    if item.strip():
-                        translated.append(translate_text(item, target_lang))
-                        if progress_callback:
-                            progress_callback()
-                        time.sleep(0.3)
-                    else:
-                        translated.append(item)
-                return translated
+                return [translate_func(item) if item.strip() else item for item in value]
         
-        return [translate_value(item, field_name, target_lang, progress_callback) 
+        return [translate_value(item, field_name, target_lang, translate_func) 
                 for item in value]
     else:
         return value
 
 def main():
-    """Translate teams.json only."""
+    """Translate the team files (en/teams/*.json) only."""
     target_lang = "es"
     
-    en_file = Path('en/teams.json')
-    target_file = Path('es/teams.json')
+    en_files = [f for f in iter_source_files() if f.parent.name == 'teams']
+    target_dir = Path(target_lang) / 'teams'
     
     print("=" * 70)
-    print(f"Translating teams.json to {target_lang.upper()} using Google Translate")
+    print(f"Translating {len(en_files)} team files to {target_lang.upper()} using Google Translate")
     print("=" * 70)
     
-    try:
-        with open(en_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"  [ERROR] Failed to read {en_file}: {e}")
-        return
-    
-    # Count translatable strings
-    def count_strings(obj, field=""):
-        count = 0
-        if isinstance(obj, str):
-            if should_translate_field(field, obj):
-                count += 1
-        elif isinstance(obj, dict):
-            for k, v in obj.items():
-                count += count_strings(v, k)
-        elif isinstance(obj, list):
-            for item in obj:
-                count += count_strings(item, field)
-        return count
+    teams = {}
+    for en_file in en_files:
+        try:
+            with open(en_file, 'r', encoding='utf-8') as f:
+                teams[en_file.name] = json.load(f)
+        except Exception as e:
+            print(f"  [ERROR] Failed to read {en_file}: {e}")
+            return
     
-    total_strings = count_strings(data)
+    # Collect translatable strings of every team in traversal order
+    texts = []
+    for data in teams.values():
+        translate_value(data, "", target_lang, lambda text: texts.append(text) or text)
+    total_strings = len(texts)
     print(f"  Found {total_strings} translatable strings")
-    print(f"  This will take approximately {total_strings * 0.3 / 60:.1f} minutes")
     print()
     
     # Progress tracking
@@ -189,8 +122,7 @@ def main():
         # Show progress every 50 strings or every 10 seconds
         if (translated_count[0] % 50 == 0) or (current_time - last_progress_time[0] >= 10):
             progress = (translated_count[0] / total_strings) * 100
-            elapsed = current_time - last_progress_time[0]
-            rate = 50 / max(elapsed, 1) if translated_count[0] % 50 == 0 else translated_count[0] / max(current_time - (time.time() - elapsed), 1)
+            rate = translated_count[0] / max(current_time - start_time, 0.001)
             remaining = (total_strings - translated_count[0]) / max(rate, 0.1)
             
             print(f"    [{translated_count[0]}/{total_strings}] {progress:.1f}% | "
@@ -199,20 +131,31 @@ def main():
     
     print(f"  Starting translation...")
     start_time = time.time()
+    engine = TranslationEngine()
+    # Translations received so far, for a partial save if the run is interrupted
+    done = {}
     
     try:
-        translated_data = translate_value(data, "", target_lang, progress_callback)
+        translated = engine.translate(texts, target_lang, progress_callback=progress_callback,
+                                      on_result=done.__setitem__)
+        lookup = dict(zip(texts, translated))
+        translated_teams = {name: translate_value(data, "", target_lang, lookup.__getitem__)
+                            for name, data in teams.items()}
     except KeyboardInterrupt:
         print(f"\n  [INTERRUPTED] Translation stopped at {translated_count[0]}/{total_strings} strings")
         print(f"  Saving partial translation...")
-        # Save partial translation
-        try:
-            target_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(target_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
-            print(f"  [OK] Partial translation saved to {target_file.name}")
-        except Exception as e:
-            print(f"  [ERROR] Failed to save: {e}")
+        # Strings answered by the translation memory never reach on_result
+        if engine.memory:
+            done.update(engine.memory.get_many(set(texts), target_lang, engine.provider_name))
+        saved = 0
+        for name, data in teams.items():
+            partial = translate_value(data, "", target_lang, lambda text: done.get(text, text))
+            try:
+                write_json(target_dir / name, partial)
+                saved += 1
+            except Exception as e:
+                print(f"  [ERROR] Failed to save {target_dir / name}: {e}")
+        print(f"  [OK] Partial translation ({len(done)} strings) saved to {saved} team files in {target_dir}")
         return
     except Exception as e:
         print(f"  [ERROR] Translation failed: {e}")
@@ -220,23 +163,25 @@ def main():
         traceback.print_exc()
         return
     
-    # Validate JSON
-    try:
-        json.dumps(translated_data)
-    except Exception as e:
-        print(f"  [ERROR] Invalid JSON after translation: {e}")
-        return
+    # Validate JSON and write
+    created = 0
+    for name, translated_data in translated_teams.items():
+        target_file = target_dir / name
+        try:
+            json.dumps(translated_data)
+        except Exception as e:
+            print(f"  [ERROR] Invalid JSON after translation of {name}: {e}")
+            continue
+        try:
+            if write_json(target_file, translated_data):
+                created += 1
+        except Exception as e:
+            print(f"  [ERROR] Failed to write {target_file}: {e}")
     
-    # Write
-    try:
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
-        elapsed = time.time() - start_time
-        print(f"  [OK] Created {target_file.name}")
-        print(f"      {translated_count[0]} strings translated in {elapsed/60:.1f} minutes")
-    except Exception as e:
-        print(f"  [ERROR] Failed to write {target_file}: {e}")
+    elapsed = time.time() - start_time
+    print(f"  [OK] Created {created} team files in {target_dir} ({len(translated_teams) - created} unchanged)")
+    print(f"      {translated_count[0]} strings translated in {elapsed/60:.1f} minutes")
+    print(f"      Translation engine: {engine.summary()}")
 
 if __name__ == '__main__':
     main()
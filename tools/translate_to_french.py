@@ -7,6 +7,7 @@ Creates French versions with proper GW French terminology.
 import json
 import sys
 from pathlib import Path
+from json_output import write_json
 
 # Official GW French terminology dictionary
 GW_FR_TERMS = {
@@ -87,8 +88,7 @@ def translate_file(en_file, fr_file):
     translated = translate_value(data)
     
     # Write French file
-    with open(fr_file, 'w', encoding='utf-8') as f:
-        json.dump(translated, f, ensure_ascii=False, indent=2)
+    write_json(fr_file, translated)
     
     print(f"Created {fr_file} (structure copied, ready for French translation)")
     return translated
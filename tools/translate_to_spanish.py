@@ -6,6 +6,7 @@ Translate JSON files to Spanish using official Games Workshop terminology.
 import json
 import sys
 from pathlib import Path
+from json_output import write_json
 
 # Official GW Spanish terminology dictionary
 GW_TERMS = {
@@ -104,8 +105,7 @@ def translate_file(en_file, es_file):
     translated = translate_value(data)
     
     # Write translated file
-    with open(es_file, 'w', encoding='utf-8') as f:
-        json.dump(translated, f, ensure_ascii=False, indent=2)
+    write_json(es_file, translated)
     
     print(f"Created {es_file} (structure copied, ready for manual translation)")
     return translated
@@ -7,6 +7,7 @@ Supports DeepL, Google Translate, and others for full sentence-level translation
 import json
 import sys
 from pathlib import Path
+from json_output import OUTPUT_STATS, write_json
 from typing import Dict, Any, Optional
 
 # Translation API integration functions
@@ -145,9 +146,10 @@ def translate_file(en_file: Path, target_file: Path, target_lang: str, translate
     
     # Write
     try:
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] Created {target_file.name}")
+        if write_json(target_file, translated):
+            print(f"  [OK] Created {target_file.name}")
+        else:
+            print(f"  [SKIP] {target_file.name} unchanged")
         return True
     except Exception as e:
         print(f"  [ERROR] Writing {target_file}: {e}")
@@ -219,6 +221,7 @@ def main():
     
     print("\n" + "=" * 60)
     print("[OK] Translation complete!")
+    print(f"Output: {OUTPUT_STATS.summary()}")
     print("=" * 60)
 
 if __name__ == '__main__':
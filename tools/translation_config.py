@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 """
 Translation configuration - defines exactly which fields to translate for each JSON file.
+The rules are compiled once into a trie of RuleNodes, so checking a field is a set lookup
+and descending into a nested field is a single dict lookup.
 """
 
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+from json_refs import StringRefs
+
 # Translation rules per file
 TRANSLATION_RULES = {
     'actions.json': {
@@ -79,6 +86,54 @@ TRANSLATION_RULES = {
     }
 }
 
+class RuleNode:
+    """
+    One level of compiled translation rules: the field names translated at this level
+    and the nested rules of each field. Immutable once built.
+    """
+
+    __slots__ = ('fields', 'children')
+
+    def __init__(self, rules: dict):
+        self.fields = frozenset(name for name, rule in rules.items() if rule)
+        self.children = MappingProxyType({name: RuleNode(rule) for name, rule in rules.items()
+                                          if isinstance(rule, dict)})
+
+    def child(self, field_name: str) -> 'RuleNode':
+        """Rules inside ``field_name`` (NO_RULES when nothing below it is translated)."""
+        return self.children.get(field_name, NO_RULES)
+
+    def translates(self, field_name: str) -> bool:
+        return field_name in self.fields
+
+NO_RULES = RuleNode({})
+
+# Compiled once at import: rules key -> root RuleNode
+COMPILED_RULES = MappingProxyType({key: RuleNode(rules) for key, rules in TRANSLATION_RULES.items()})
+
+def rules_key(file_name: str) -> str:
+    """Key of the rules for a file (any file in the teams/ subfolder uses the 'teams' rules)."""
+    if file_name.endswith('.json') and 'teams' in file_name.lower():
+        return 'teams'
+    return file_name
+
+def file_key(json_file: Path) -> str:
+    """Name used for a file in the rules and manifests (teams/X.json or X.json)."""
+    json_file = Path(json_file)
+    if 'teams' in str(json_file):
+        return f"teams/{json_file.name}"
+    return json_file.name
+
+def has_rules(file_name: str) -> bool:
+    return rules_key(file_name) in COMPILED_RULES
+
+def compiled_rules(file_name: str, field_path: List[str] = ()) -> RuleNode:
+    """Compiled rules for a file, descended along ``field_path``."""
+    node = COMPILED_RULES.get(rules_key(file_name), NO_RULES)
+    for parent_field in field_path:
+        node = node.child(parent_field)
+    return node
+
 def should_translate_field(file_name: str, field_path: list, field_name: str) -> bool:
     """
     Check if a field should be translated based on the file and field path.
@@ -92,32 +147,58 @@ def should_translate_field(file_name: str, field_path: list, field_name: str) ->
     Returns:
         True if the field should be translated, False otherwise
     """
-    # Check if this is a team file in the teams/ subfolder
-    if file_name.endswith('.json') and 'teams' in file_name.lower():
-        # Use 'teams' rules for any file in teams/ subfolder
-        rules_key = 'teams'
-    else:
-        rules_key = file_name
-    
-    if rules_key not in TRANSLATION_RULES:
-        return False
-    
-    rules = TRANSLATION_RULES[rules_key]
-    
-    # Navigate through the field path
-    current_rules = rules
-    for parent_field in field_path:
-        if isinstance(current_rules, dict) and parent_field in current_rules:
-            current_rules = current_rules[parent_field]
+    return compiled_rules(file_name, field_path).translates(field_name)
+
+def translatable_refs(data: Any, file_name: str, with_paths: bool = False,
+                      skip_blank: bool = True) -> StringRefs:
+    """
+    Direct (container, key) references to every translatable string in a file, in
+    traversal order; dotted paths are recorded too with ``with_paths``.
+    Empty strings are skipped unless ``skip_blank`` is False.
+    """
+    refs = StringRefs(with_paths)
+    _collect_refs(data, compiled_rules(file_name), "", "" if with_paths else None, refs, skip_blank)
+    return refs
+
+def translatable_locations(data: Any, file_name: str) -> Dict[str, str]:
+    """
+    Flat map of every translatable location in a file to its English text, in traversal
+    order, e.g. ``{'opTypes[3].weapons[1].wepName': 'Bolt pistol', ...}``.
+    Empty strings are skipped.
+    """
+    return translatable_refs(data, file_name, with_paths=True).locations()
+
+def _collect_refs(value: Any, node: RuleNode, field_name: str, path: Optional[str], refs: StringRefs,
+                  skip_blank: bool = True):
+    # Arrays keep their field name, so the items of 'opTypes' are matched with the 'opTypes' rules.
+    # Paths are only built when requested (path is None otherwise).
+    if isinstance(value, dict):
+        node = node.child(field_name) if field_name else node
+        if node is NO_RULES:
+            return
+        for k, v in value.items():
+            if isinstance(v, str):
+                if (v.strip() or not skip_blank) and node.translates(k):
+                    refs.add(value, k, None if path is None else f"{path}.{k}" if path else k)
+            elif isinstance(v, (dict, list)):
+                _collect_refs(v, node, k, None if path is None else f"{path}.{k}" if path else k, refs, skip_blank)
+    elif isinstance(value, list) and value:
+        if isinstance(value[0], str):
+            if node.translates(field_name):
+                for i, item in enumerate(value):
+                    if item.strip() or not skip_blank:
+                        refs.add(value, i, None if path is None else f"{path}[{i}]")
         else:
-            # Path doesn't match rules, don't translate
-            return False
-    
-    # Check if the field name is in the current rules
-    if isinstance(current_rules, dict):
-        return current_rules.get(field_name, False)
-    
-    return False
+            node = node.child(field_name) if field_name else node
+            if node is NO_RULES:
+                return
+            for i, item in enumerate(value):
+                _collect_refs(item, node, "", None if path is None else f"{path}[{i}]", refs, skip_blank)
+
+def iter_source_files(en_dir: Path = Path('en')) -> List[Path]:
+    """Every English JSON file: en/*.json, en/packs/*.json and en/teams/*.json."""
+    return sorted(en_dir.glob('*.json')) + sorted(en_dir.glob('packs/*.json')) + \
+        sorted(en_dir.glob('teams/*.json'))
 
 def get_translatable_fields_for_file(file_name: str) -> dict:
     """Get the translation rules for a specific file."""
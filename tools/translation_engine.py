@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Shared asyncio translation engine used by the translate_* scripts.
+Sends strings to a provider with a bounded number of requests in flight and
+returns the results in the original order. Strings already in the translation
+memory are answered locally without a network call, and every request goes
+through the provider's rate limiter. Keywords, numbers and markdown are masked
+with placeholders before a request (see translation_masking).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from rate_limiter import RateLimitedError, RateLimiter
+from translation_masking import mask_text, needs_translation, unmask_text
+from translation_memory import TranslationMemory
+from translation_providers import get_google_provider
+
+# Maximum number of provider requests in flight at once
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("KT_TRANSLATE_CONCURRENCY", "8"))
+
+# How many 429 responses a single string may receive before giving up
+MAX_RATE_LIMITED_RETRIES = 8
+
+class TranslationEngine:
+    """
+    Bounded-concurrency translation engine.
+
+    The provider is a blocking callable ``provider(text, target_lang, source_lang) -> str``.
+    Providers that also implement ``translate_many(texts, target_lang, source_lang)``
+    receive unique strings in list batches instead of one request per string.
+    Calls run on a worker pool driven by asyncio, with at most ``max_in_flight``
+    requests outstanding. Every request first takes a token from the rate limiter;
+    failed strings are retried with jittered exponential backoff (429 responses
+    pause the limiter for Retry-After) and finally fall back to the source text,
+    matching the behaviour of the individual scripts.
+
+    Successful translations are stored in the translation memory under
+    ``provider_name``; fallbacks are never stored.
+
+    With ``masking``, protected spans are replaced with placeholders before the
+    request and restored afterwards; a reply that lost a placeholder is sent
+    again unmasked. Strings with nothing left to translate are never sent.
+    """
+
+    def __init__(self, provider: Optional[Callable[[str, str, str], str]] = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, retries: int = 3,
+                 provider_name: str = "google", memory: Optional[TranslationMemory] = None,
+                 use_memory: bool = True, limiter: Optional[RateLimiter] = None,
+                 masking: bool = True):
+        self.provider = provider or get_google_provider()
+        self.provider_name = provider_name
+        self.max_in_flight = max(1, max_in_flight)
+        self.retries = retries
+        if memory is None and use_memory:
+            memory = TranslationMemory()
+        self.memory = memory
+        self.limiter = limiter or RateLimiter.for_provider(provider_name)
+        self.masking = masking
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "failures": 0, "fallbacks": 0, "strings": 0,
+                      "memory_hits": 0, "elapsed": 0.0, "chars_sent": 0, "chars_masked": 0,
+                      "unmask_failures": 0}
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def _send(self, call: Callable[[], Any], chars: int) -> Optional[Any]:
+        """
+        Blocking provider request with rate limiting and retries (runs on a worker thread).
+        Returns None when every attempt failed.
+        """
+        attempt = 0
+        rate_limited = 0
+        while True:
+            self.limiter.acquire(chars)
+            self._count("requests")
+            self._count("chars_sent", chars)
+            try:
+                result = call()
+                self.limiter.on_success()
+                return result
+            except RateLimitedError as e:
+                self._count("failures")
+                self.limiter.on_rate_limited(e.retry_after, rate_limited)
+                rate_limited += 1
+                if rate_limited > MAX_RATE_LIMITED_RETRIES:
+                    print(f"      [WARNING] Translation error: {e}")
+                    return None
+            except Exception as e:
+                self._count("failures")
+                if attempt >= self.retries:
+                    print(f"      [WARNING] Translation error: {e}")
+                    return None
+                self.limiter.backoff(attempt)
+                attempt += 1
+
+    def _mask(self, text: str, masking: bool) -> Tuple[Optional[str], List[str]]:
+        """Masked request text and spans; the request text is None when nothing needs translating."""
+        if not masking:
+            return text, []
+        request_text, spans = mask_text(text)
+        if not needs_translation(request_text):
+            return None, spans
+        self._count("chars_masked", len(text) - len(request_text))
+        return request_text, spans
+
+    def _unmask(self, text: str, translated: str, spans: List[str],
+                target_lang: str, source_lang: str) -> Optional[str]:
+        """Restore masked spans; a reply that mangled a placeholder is re-sent unmasked."""
+        if not spans:
+            return translated
+        unmasked = unmask_text(translated, spans)
+        if unmasked is None:
+            self._count("unmask_failures")
+            return self._send(lambda: self.provider(text, target_lang, source_lang), len(text))
+        return unmasked
+
+    def _call_provider(self, text: str, target_lang: str, source_lang: str,
+                       masking: bool = True) -> Optional[str]:
+        """Translate one string on a worker thread; returns None when every attempt failed."""
+        request_text, spans = self._mask(text, masking)
+        if request_text is None:
+            return text
+        result = self._send(lambda: self.provider(request_text, target_lang, source_lang),
+                            len(request_text))
+        if result is None:
+            return None
+        return self._unmask(text, result, spans, target_lang, source_lang)
+
+    def _call_provider_many(self, texts: List[str], target_lang: str, source_lang: str,
+                            masking: bool = True) -> List[Optional[str]]:
+        """Translate a group of strings in one request (providers with ``translate_many``)."""
+        results: List[Optional[str]] = list(texts)
+        masked = [self._mask(text, masking) for text in texts]
+        send = [i for i, (request_text, _) in enumerate(masked) if request_text is not None]
+        if not send:
+            return results
+        request_texts = [masked[i][0] for i in send]
+        replies = self._send(lambda: self.provider.translate_many(request_texts, target_lang, source_lang),
+                             sum(len(text) for text in request_texts))
+        for n, i in enumerate(send):
+            results[i] = None if replies is None else \
+                self._unmask(texts[i], replies[n], masked[i][1], target_lang, source_lang)
+        return results
+
+    def _groups(self, texts: List[str]) -> List[List[str]]:
+        """
+        Split texts into request groups: one string per request, or for providers with
+        ``translate_many`` consecutive lists bounded by their batch size and characters.
+        """
+        if not hasattr(self.provider, "translate_many"):
+            return [[text] for text in texts]
+        batch_size = getattr(self.provider, "batch_size", 50)
+        max_chars = getattr(self.provider, "max_batch_chars", 100000)
+        groups = []
+        chars = 0
+        for text in texts:
+            if not groups or len(groups[-1]) >= batch_size or chars + len(text) > max_chars:
+                groups.append([])
+                chars = 0
+            groups[-1].append(text)
+            chars += len(text)
+        return groups
+
+    async def _translate_group(self, semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor,
+                               group: List[str], target_lang: str, source_lang: str,
+                               masking: bool = True) -> List[Optional[str]]:
+        """Translate one request group; failed strings come back as None."""
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            if hasattr(self.provider, "translate_many"):
+                return await loop.run_in_executor(
+                    executor, self._call_provider_many, group, target_lang, source_lang, masking)
+            return [await loop.run_in_executor(
+                executor, self._call_provider, group[0], target_lang, source_lang, masking)]
+
+    async def translate_async(self, texts: List[str], target_lang: str, source_lang: str = "en",
+                              progress_callback=None, use_memory: bool = True,
+                              fallback_to_source: bool = True,
+                              on_result: Optional[Callable[[str, str], None]] = None,
+                              masking: Optional[bool] = None) -> List[Optional[str]]:
+        """
+        Translate ``texts`` concurrently; results keep the input order.
+        Strings that could not be translated come back unchanged, or as None
+        when ``fallback_to_source`` is False. ``on_result(text, translation)`` is
+        called as soon as each unique string has been translated by the provider
+        (e.g. to checkpoint it), never for fallbacks or memory hits; the translation
+        memory is written as each request group completes, so an interrupted call keeps
+        what it already paid for. ``masking``
+        overrides the engine setting for this call (packed requests mask per segment).
+        """
+        masking = self.masking if masking is None else masking
+        start_time = time.time()
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+
+        # Answer what we can from the translation memory
+        memory = self.memory if use_memory else None
+        if memory and pending:
+            cached = memory.get_many({texts[i] for i in pending}, target_lang, self.provider_name)
+            still_pending = []
+            for i in pending:
+                if texts[i] in cached:
+                    results[i] = cached[texts[i]]
+                    self.stats["memory_hits"] += 1
+                    if progress_callback:
+                        progress_callback()
+                else:
+                    still_pending.append(i)
+            pending = still_pending
+
+        # Duplicates within the call are sent once
+        positions = {}
+        for i in pending:
+            positions.setdefault(texts[i], []).append(i)
+
+        async def translate_group(group):
+            translated = await self._translate_group(semaphore, executor, group,
+                                                     target_lang, source_lang, masking)
+            if memory:
+                learned = [(text, result) for text, result in zip(group, translated) if result is not None]
+                if learned:
+                    memory.put_many(learned, target_lang, self.provider_name)
+            for text, result in zip(group, translated):
+                if on_result and result is not None:
+                    on_result(text, result)
+                if progress_callback:
+                    for _ in positions[text]:
+                        progress_callback()
+            return translated
+
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            groups = await asyncio.gather(*[translate_group(group)
+                                            for group in self._groups(list(positions))])
+        translated = [result for group in groups for result in group]
+
+        for (text, indices), result in zip(positions.items(), translated):
+            if result is None:
+                self.stats["fallbacks"] += 1
+                if fallback_to_source:
+                    continue
+            for i in indices:
+                results[i] = result
+
+        self.stats["strings"] += len(texts)
+        self.stats["elapsed"] += time.time() - start_time
+        return results
+
+    def translate(self, texts: List[str], target_lang: str, source_lang: str = "en",
+                  progress_callback=None, use_memory: bool = True,
+                  fallback_to_source: bool = True,
+                  on_result: Optional[Callable[[str, str], None]] = None,
+                  masking: Optional[bool] = None) -> List[Optional[str]]:
+        """Blocking wrapper around :meth:`translate_async` for the scripts."""
+        return asyncio.run(self.translate_async(texts, target_lang, source_lang, progress_callback,
+                                                use_memory, fallback_to_source, on_result, masking))
+
+    def summary(self) -> str:
+        """One-line summary of the work done by this engine."""
+        return (f"{self.stats['strings']} strings, {self.stats['memory_hits']} from translation memory, "
+                f"{self.stats['requests']} requests ({self.stats['failures']} failed), "
+                f"{self.stats['chars_sent']} characters sent ({self.stats['chars_masked']} masked, "
+                f"{self.stats['unmask_failures']} unmask failures re-sent), "
+                f"{self.limiter.summary()}"
+                + (f", {self.provider.summary()}" if hasattr(self.provider, "summary") else ""))
+
+def translate_texts(texts: List[str], target_lang: str, source_lang: str = "en",
+                    provider=None, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                    progress_callback=None) -> List[str]:
+    """Convenience wrapper: translate ``texts`` with a one-off engine."""
+    engine = TranslationEngine(provider, max_in_flight=max_in_flight)
+    return engine.translate(texts, target_lang, source_lang, progress_callback)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Dry-run cost and time estimate of a translation job, without any network I/O.
+Takes the strings a run would translate, drops duplicates across files, strings already
+in the translation memory and strings masking leaves nothing to translate in, then
+groups the rest into requests the way each provider is called and estimates the wall
+time from the configured rate limits and concurrency.
+"""
+
+import os
+from typing import List, Optional, Set, Tuple
+from rate_limiter import RateLimiter
+from translation_engine import DEFAULT_MAX_IN_FLIGHT
+from translation_masking import mask_text, needs_translation
+from translation_memory import DEFAULT_MEMORY_PATH, TranslationMemory
+from translation_providers import DEEPL_BATCH_SIZE, DEEPL_MAX_BATCH_CHARS
+
+# Assumed round-trip time of one request in seconds (override with KT_ESTIMATE_LATENCY)
+ESTIMATED_LATENCY = float(os.getenv("KT_ESTIMATE_LATENCY", "0.3"))
+
+def memory_known(texts: List[str], target_lang: str, provider_name: str) -> Set[str]:
+    """Strings of ``texts`` the translation memory already holds (none if there is no memory yet)."""
+    if not DEFAULT_MEMORY_PATH.exists():
+        return set()
+    memory = TranslationMemory()
+    try:
+        return set(memory.get_many(texts, target_lang, provider_name))
+    finally:
+        memory.close()
+
+def request_texts(calls: List[List[str]], target_lang: str, provider_name: str,
+                  masking: bool = True) -> Tuple[int, int, List[List[Tuple[str, Optional[str]]]]]:
+    """
+    Unique strings, memory hits and, per engine call, every string that would reach the
+    provider stage with the (masked) text actually sent, or None when masking leaves nothing
+    to translate. Mirrors TranslationEngine: blank strings are skipped, duplicates sent once,
+    and strings sent by an earlier call are answered by the translation memory.
+    """
+    unique = list(dict.fromkeys(text for texts in calls for text in texts if text and text.strip()))
+    known = memory_known(unique, target_lang, provider_name)
+    hits = len(known)
+    pending = []
+    for texts in calls:
+        pending.append([])
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip() or text in known:
+                continue
+            known.add(text)
+            request_text = text
+            if masking:
+                request_text, _ = mask_text(text)
+                if not needs_translation(request_text):
+                    request_text = None
+            pending[-1].append((text, request_text))
+    return len(unique), hits, pending
+
+def request_sizes(pending: List[Tuple[str, Optional[str]]], provider_name: str,
+                  packed: bool = False) -> List[int]:
+    """
+    Characters of each request for one engine call: DeepL list batches (grouped before
+    masking, like the engine), sentinel-packed or single Google requests.
+    """
+    if provider_name == "deepl":
+        sizes = []
+        count = 0
+        chars = 0
+        for text, request_text in pending:
+            if not sizes or count >= DEEPL_BATCH_SIZE or chars + len(text) > DEEPL_MAX_BATCH_CHARS:
+                sizes.append(None)
+                count = 0
+                chars = 0
+            count += 1
+            chars += len(text)
+            if request_text is not None:
+                sizes[-1] = (sizes[-1] or 0) + len(request_text)
+        # A batch whose strings were all masked away is never sent
+        return [size for size in sizes if size is not None]
+    texts = [request_text for _, request_text in pending if request_text is not None]
+    if packed:
+        from translate_batch import encode_packet, pack_segments
+        return [len(encode_packet([texts[i] for i in indices])) for indices in pack_segments(texts)]
+    return [len(text) for text in texts]
+
+def estimate_seconds(sizes: List[int], provider_name: str,
+                     max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> float:
+    """Wall time bounded by latency over the requests in flight and by the rate limits."""
+    limiter = RateLimiter.for_provider(provider_name)
+    seconds = len(sizes) * ESTIMATED_LATENCY / max(1, max_in_flight)
+    if limiter.max_requests_per_sec > 0:
+        seconds = max(seconds, len(sizes) / limiter.max_requests_per_sec)
+    if limiter.max_chars_per_sec > 0:
+        seconds = max(seconds, sum(sizes) / limiter.max_chars_per_sec)
+    return seconds
+
+def print_estimate(calls: List[List[str]], target_lang: str, files: int, providers: List[str],
+                   packed: bool = False):
+    """
+    Print the estimate for every string a run would translate across ``files`` files, given
+    as the texts of each engine call (one per file, or a single call for the whole tree),
+    for each of ``providers`` (the providers the script sends requests to).
+    ``packed`` estimates Google requests as translate_batch packs them.
+    """
+    print("=" * 70)
+    print(f"Dry run: estimated cost of translating to {target_lang.upper()} (nothing is sent)")
+    print("=" * 70)
+    print(f"  {sum(len(texts) for texts in calls)} strings found in {files} files")
+
+    rows = []
+    for provider_name in providers:
+        unique, hits, pending = request_texts(calls, target_lang, provider_name)
+        sizes = [size for texts in pending for size in request_sizes(texts, provider_name, packed)]
+        sent = sum(request_text is not None for texts in pending for _, request_text in texts)
+        rows.append((provider_name, unique, hits, sent, len(sizes), sum(sizes),
+                     estimate_seconds(sizes, provider_name)))
+
+    print(f"\n{'Provider':<10}{'Unique':>8}{'Memory':>8}{'To send':>9}{'Requests':>10}"
+          f"{'Characters':>12}{'Est. time':>11}")
+    print("-" * 70)
+    for provider_name, unique, hits, sent, requests, chars, seconds in rows:
+        print(f"{provider_name:<10}{unique:>8}{hits:>8}{sent:>9}{requests:>10}{chars:>12}"
+              f"{seconds / 60:>9.1f} m")
+    print("-" * 70)
+    print(f"Characters are after masking (DeepL bills them). Times assume {ESTIMATED_LATENCY:.1f}s per request")
+    print(f"(KT_ESTIMATE_LATENCY), {DEFAULT_MAX_IN_FLIGHT} requests in flight and the rate limits of")
+    print("KT_<PROVIDER>_RPS / KT_<PROVIDER>_CPS; retries and 429 pauses are not included.")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long translation runs.
+Every completed (file, path, translation) is appended and flushed as soon as the
+provider returns it, so an interrupted run can be resumed with ``--resume``:
+strings already in the journal are not sent again and the target files are
+rebuilt from it.
+
+The journal for a language is stored next to its folder, e.g. es.journal.jsonl for es/.
+
+Usage: python translation_journal.py <status|clear> <language>
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# fsync the journal after this many entries (entries are always flushed immediately)
+SYNC_EVERY = 50
+
+class TranslationJournal:
+    """JSON-lines journal of translated strings, keyed by file and path."""
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.entries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.corrupt_lines = 0
+        if resume:
+            self._load()
+        elif self.path.exists():
+            self.path.unlink()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.unsynced = 0
+
+    @classmethod
+    def for_language(cls, target_lang: str, resume: bool = False) -> 'TranslationJournal':
+        """Open the journal stored next to the language folder (started afresh unless resuming)."""
+        return cls(Path(f"{target_lang}.journal.jsonl"), resume)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[(entry["file"], entry["path"])] = (entry["source"], entry["translation"])
+                except (ValueError, KeyError, TypeError):
+                    # A crash can leave the last line half-written
+                    self.corrupt_lines += 1
+        self._drop_partial_line()
+
+    def _drop_partial_line(self):
+        """Cut off a half-written last line so new entries start on a line of their own."""
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def completed(self, file_key: str, strings: Dict[str, str]) -> Dict[str, str]:
+        """
+        Translations already journaled for ``strings`` (path -> English text) of a file,
+        as English text -> translation. Entries whose English text has changed are ignored.
+        """
+        done = {}
+        for path, text in strings.items():
+            entry = self.entries.get((file_key, path))
+            if entry and entry[0] == text:
+                done[text] = entry[1]
+        return done
+
+    def record(self, file_key: str, paths: List[str], source: str, translation: str):
+        """Append one translated string for every path it appears at, and flush."""
+        for path in paths:
+            self.entries[(file_key, path)] = (source, translation)
+            self.file.write(json.dumps({"file": file_key, "path": path, "source": source,
+                                        "translation": translation}, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.unsynced += 1
+        if self.unsynced >= SYNC_EVERY:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+
+    def close(self):
+        """Flush the journal to disk and close it."""
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ["status", "clear"]:
+        print("Usage: python translation_journal.py <status|clear> <language>")
+        print("\nCommands:")
+        print("  status  - Show what an interrupted run has already translated")
+        print("  clear   - Delete the journal so the next run starts afresh")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    path = Path(f"{sys.argv[2].lower()}.journal.jsonl")
+    if not path.exists():
+        print(f"[INFO] No journal at {path}")
+        return
+    if command == "clear":
+        path.unlink()
+        print(f"[OK] Removed {path}")
+        return
+
+    journal = TranslationJournal(path, resume=True)
+    per_file = {}
+    for file_key, _ in journal.entries:
+        per_file[file_key] = per_file.get(file_key, 0) + 1
+    for file_key, count in sorted(per_file.items()):
+        print(f"  {file_key}: {count} strings")
+    print(f"\n{len(journal)} strings journaled in {path}"
+          + (f" ({journal.corrupt_lines} unreadable lines skipped)" if journal.corrupt_lines else ""))
+    journal.close()
+
+if __name__ == '__main__':
+    main()
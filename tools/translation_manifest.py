@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Content manifest of the English source for incremental translation.
+Records a hash of every translatable string (as defined by translation_config.TRANSLATION_RULES)
+per file and path, so a run only translates paths whose English text is new or changed.
+
+The manifest for a language is stored next to its folder, e.g. es.manifest.json for es/.
+
+Usage: python translation_manifest.py <status|init> <language>
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from translation_config import file_key, iter_source_files, translatable_locations
+from translation_memory import text_hash
+
+MANIFEST_VERSION = 1
+
+def manifest_key(en_file: Path) -> str:
+    """Key used for a file in the manifest and in the field rules (teams/X.json or X.json)."""
+    return file_key(en_file)
+
+def collect_translatable_paths(value: Any, file_name: str) -> Dict[str, str]:
+    """
+    Collect every translatable string with its path (e.g. ``opTypes[3].weapons[1].wepName``),
+    using the compiled field rules of translation_config.
+    """
+    return translatable_locations(value, file_name)
+
+def hash_strings(strings: Dict[str, str]) -> Dict[str, str]:
+    """Compact per-path hashes of the English strings."""
+    return {path: text_hash(text)[:16] for path, text in strings.items()}
+
+class TranslationManifest:
+    """Per-file, per-path hashes of the English strings a translation was built from."""
+
+    def __init__(self, path: Path, files: Dict[str, Dict[str, str]] = None):
+        self.path = Path(path)
+        self.files = files or {}
+
+    @classmethod
+    def for_language(cls, target_lang: str) -> 'TranslationManifest':
+        """Load the manifest stored next to the language folder (empty if it does not exist)."""
+        path = Path(f"{target_lang}.manifest.json")
+        if not path.exists():
+            return cls(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            print(f"  [WARNING] Ignoring {path}: unsupported manifest version")
+            return cls(path)
+        return cls(path, data.get("files", {}))
+
+    def has_file(self, file_key: str) -> bool:
+        return file_key in self.files
+
+    def changed_paths(self, file_key: str, strings: Dict[str, str]) -> List[str]:
+        """Paths whose English text is new or changed since the manifest was recorded."""
+        recorded = self.files.get(file_key, {})
+        return [path for path, digest in hash_strings(strings).items()
+                if recorded.get(path) != digest]
+
+    def record(self, file_key: str, strings: Dict[str, str]):
+        """Record the English strings a file's translation now corresponds to."""
+        self.files[file_key] = hash_strings(strings)
+
+    def save(self):
+        """Write the manifest through a temporary file so a crash never truncates it."""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files}, f,
+                      ensure_ascii=False, indent=1, sort_keys=True)
+        tmp_path.replace(self.path)
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ["status", "init"]:
+        print("Usage: python translation_manifest.py <status|init> <language>")
+        print("\nCommands:")
+        print("  status  - Show how many translatable strings changed per file since the last run")
+        print("  init    - Record the current English text as already translated")
+        print("            (use once to adopt an existing, up-to-date translation)")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    target_lang = sys.argv[2].lower()
+    manifest = TranslationManifest.for_language(target_lang)
+
+    total_changed = 0
+    for en_file in iter_source_files():
+        with open(en_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        file_key = manifest_key(en_file)
+        strings = collect_translatable_paths(data, file_key)
+        if not strings:
+            continue
+        if command == "init":
+            manifest.record(file_key, strings)
+            continue
+        changed = manifest.changed_paths(file_key, strings)
+        total_changed += len(changed)
+        if changed:
+            print(f"  {file_key}: {len(changed)}/{len(strings)} strings new or changed")
+
+    if command == "init":
+        manifest.save()
+        print(f"[OK] Recorded {len(manifest.files)} files in {manifest.path}")
+    else:
+        print(f"\n{total_changed} strings to translate for {target_lang.upper()}")
+
+if __name__ == '__main__':
+    main()
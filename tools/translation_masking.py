@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Placeholder masking for machine translation.
+Spans a provider must not touch (ALL-CAPS keywords, stat names, distances, dice and
+other numbers, markdown markers, URLs) are replaced with compact ``{n}`` tokens
+before a request and restored afterwards, so they are neither mangled nor billed.
+
+Usage: python translation_masking.py [file.json ...]   (report characters saved, default: en/teams)
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from extract_translatables import NON_TRANSLATABLE_FIELDS
+
+# Stat and identifier field names that may appear verbatim in rule text (MOVE, APL, wepType...);
+# plain lowercase field names like 'type' or 'amount' are ordinary English words and are left alone
+PROTECTED_TERMS = sorted((field for field in NON_TRANSLATABLE_FIELDS
+                          if '*' not in field and not field.islower()), key=len, reverse=True)
+
+MASK_PATTERN = re.compile('|'.join([
+    r'https?://\S+',                                          # URLs
+    r'\{\d+\}',                                               # literal text that looks like a placeholder
+    r'^[ \t]*(?:#{1,6}|[-*•])[ \t]+',                    # markdown headings and list bullets
+    r'\*\*|__',                                               # markdown bold markers
+    r'\b(?:' + '|'.join(map(re.escape, PROTECTED_TERMS)) + r')\b',
+    r"\b[A-Z][A-Z0-9'’-]*[A-Z0-9](?:[ \t]+[A-Z][A-Z0-9'’-]*[A-Z0-9])*\b",  # ALL-CAPS keywords
+    r'\+?\d+(?:[./]\d+)?(?:D\d+)?[+"]?',                      # numbers, 6", 3+, 3/4, 2D6
+]), re.MULTILINE)
+
+# Placeholder as sent, and as it may come back (providers sometimes add spaces inside braces)
+PLACEHOLDER = "{{{}}}"
+PLACEHOLDER_PATTERN = re.compile(r'\{\s*(\d+)\s*\}')
+
+# Spans separated only by this are merged into a single placeholder
+MERGE_GAP = re.compile(r'[ \t]*')
+
+def mask_text(text: str) -> Tuple[str, List[str]]:
+    """
+    Replace protected spans with ``{0}``, ``{1}``... placeholders.
+    Returns the masked text and the original spans, in placeholder order.
+    """
+    spans = []
+    merged = []
+    for match in MASK_PATTERN.finditer(text):
+        start, end = match.span()
+        if start == end:
+            continue
+        if merged and MERGE_GAP.fullmatch(text, merged[-1][1], start):
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    parts = []
+    last = 0
+    for start, end in merged:
+        parts.append(text[last:start])
+        parts.append(PLACEHOLDER.format(len(spans)))
+        spans.append(text[start:end])
+        last = end
+    parts.append(text[last:])
+    return ''.join(parts), spans
+
+def unmask_text(translated: str, spans: List[str]) -> Optional[str]:
+    """
+    Restore the original spans into a translated text.
+    Returns None if a placeholder was lost, duplicated or invented by the provider.
+    """
+    if not spans:
+        return translated
+    found = [int(n) for n in PLACEHOLDER_PATTERN.findall(translated)]
+    if sorted(found) != list(range(len(spans))):
+        return None
+    return PLACEHOLDER_PATTERN.sub(lambda match: spans[int(match.group(1))], translated)
+
+def needs_translation(masked: str) -> bool:
+    """False when nothing but placeholders, punctuation and whitespace is left to translate."""
+    return bool(re.search(r'[^\W\d_]', PLACEHOLDER_PATTERN.sub('', masked)))
+
+def masking_savings(texts: Iterable[str]) -> Tuple[int, int]:
+    """Billable characters of ``texts`` without and with masking."""
+    original = 0
+    masked = 0
+    for text in texts:
+        original += len(text)
+        masked_text, _ = mask_text(text)
+        masked += len(masked_text) if needs_translation(masked_text) else 0
+    return original, masked
+
+def format_savings(original: int, masked: int) -> str:
+    saved = original - masked
+    return f"masking saved {saved} of {original} billable characters ({saved / max(original, 1) * 100:.1f}%)"
+
+def main():
+    from translate_precise import translate_value
+
+    files = [Path(arg) for arg in sys.argv[1:]] or sorted((Path('en') / 'teams').glob('*.json'))
+    total_original = 0
+    total_masked = 0
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        file_key = f"teams/{json_file.name}" if 'teams' in str(json_file) else json_file.name
+        texts = []
+        translate_value(data, "", [], file_key, lambda text: texts.append(text) or text)
+        original, masked = masking_savings(texts)
+        total_original += original
+        total_masked += masked
+        print(f"  {file_key}: {format_savings(original, masked)}")
+    print(f"\nTotal: {format_savings(total_original, total_masked)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory shared by every translate_* script.
+Translations are stored in SQLite, keyed by source-text hash, target language and provider,
+so re-runs only send strings that have never been translated before.
+
+Usage: python translation_memory.py [stats|clear] [memory_file]
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Default location of the memory database (repository root, ignored by git)
+DEFAULT_MEMORY_PATH = Path(os.getenv("KT_TRANSLATION_MEMORY", ".translation_memory.sqlite"))
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+
+def text_hash(text: str) -> str:
+    """Stable hash of a source text, used as the memory key."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    """SQLite-backed store of (source hash, target language, provider) -> translation."""
+
+    def __init__(self, path: Path = DEFAULT_MEMORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "  source_hash TEXT NOT NULL,"
+            "  target_lang TEXT NOT NULL,"
+            "  provider TEXT NOT NULL,"
+            "  source_text TEXT NOT NULL,"
+            "  translation TEXT NOT NULL,"
+            "  PRIMARY KEY (source_hash, target_lang, provider)"
+            ")"
+        )
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, texts: Iterable[str], target_lang: str, provider: str) -> Dict[str, str]:
+        """Return the stored translations for whichever of ``texts`` are in memory."""
+        by_hash = {text_hash(text): text for text in texts}
+        hashes = list(by_hash)
+        found = {}
+        for i in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            chunk = hashes[i:i + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT source_hash, source_text, translation FROM translations "
+                f"WHERE target_lang = ? AND provider = ? AND source_hash IN ({placeholders})",
+                [target_lang, provider] + chunk
+            )
+            for source_hash, source_text, translation in rows:
+                # Guard against hash collisions
+                if by_hash[source_hash] == source_text:
+                    found[source_text] = translation
+        self.hits += len(found)
+        self.misses += len(by_hash) - len(found)
+        return found
+
+    def get(self, text: str, target_lang: str, provider: str) -> Optional[str]:
+        """Return the stored translation for ``text``, or None."""
+        return self.get_many([text], target_lang, provider).get(text)
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], target_lang: str, provider: str):
+        """Store (source, translation) pairs."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO translations "
+            "(source_hash, target_lang, provider, source_text, translation) VALUES (?, ?, ?, ?, ?)",
+            [(text_hash(source), target_lang, provider, source, translation)
+             for source, translation in pairs]
+        )
+        self.conn.commit()
+
+    def count(self) -> int:
+        """Number of stored translations."""
+        return self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def summary(self) -> List[Tuple[str, str, int]]:
+        """Stored translation counts per (provider, target language)."""
+        return self.conn.execute(
+            "SELECT provider, target_lang, COUNT(*) FROM translations "
+            "GROUP BY provider, target_lang ORDER BY provider, target_lang"
+        ).fetchall()
+
+    def clear(self):
+        """Delete every stored translation."""
+        self.conn.execute("DELETE FROM translations")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    path = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MEMORY_PATH
+
+    if command not in ["stats", "clear"]:
+        print("Usage: python translation_memory.py [stats|clear] [memory_file]")
+        sys.exit(1)
+
+    memory = TranslationMemory(path)
+    if command == "clear":
+        memory.clear()
+        print(f"[OK] Cleared translation memory {path}")
+    else:
+        print(f"Translation memory: {path}")
+        print(f"Total entries: {memory.count()}")
+        for provider, target_lang, count in memory.summary():
+            print(f"  {provider:10} {target_lang:4} {count}")
+    memory.close()
+
+if __name__ == '__main__':
+    main()
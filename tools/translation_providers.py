@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Provider client layer for the translation tools.
+Providers reuse pooled keep-alive HTTP sessions instead of opening a new
+connection per string, and record per-request latency. The DeepL provider
+keeps one client per run, sends strings in list batches and applies a
+server-side glossary of the GW terminology.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from rate_limiter import RateLimitedError, parse_retry_after
+
+# Google Translate web API endpoint (overridable to point at a local stub server)
+GOOGLE_TRANSLATE_URL = os.getenv("KT_GOOGLE_TRANSLATE_URL",
+                                 "https://translate.googleapis.com/translate_a/single")
+
+# DeepL API server (overridable to point at a local stub server; default picked by the client)
+DEEPL_SERVER_URL = os.getenv("KT_DEEPL_SERVER_URL")
+
+# DeepL accepts at most 50 texts per request and a 128 KiB request body
+DEEPL_BATCH_SIZE = 50
+DEEPL_MAX_BATCH_CHARS = 100000
+
+# Language codes expected by DeepL
+DEEPL_LANG_MAP = {
+    "es": "ES",
+    "fr": "FR",
+    "de": "DE",
+    "it": "IT",
+    "pt": "PT",
+}
+
+# Connections kept open per host; should be at least the engine's in-flight limit
+DEFAULT_POOL_SIZE = int(os.getenv("KT_HTTP_POOL_SIZE", os.getenv("KT_TRANSLATE_CONCURRENCY", "8")))
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE):
+    """requests.Session with a keep-alive connection pool of ``pool_size`` connections per host."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class LatencyStats:
+    """Thread-safe record of per-request latencies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: List[float] = []
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return "no requests"
+        mean = sum(self.latencies) / len(self.latencies)
+        return (f"latency mean {mean * 1000:.0f} ms, p50 {self.percentile(0.5) * 1000:.0f} ms, "
+                f"p95 {self.percentile(0.95) * 1000:.0f} ms")
+
+class HttpProvider:
+    """Base class for providers speaking HTTP through a shared pooled session."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, session=None):
+        self.pool_size = pool_size
+        self._session = session
+        self._session_lock = threading.Lock()
+        self.latency = LatencyStats()
+
+    @property
+    def session(self):
+        # Created lazily so importing the tools never requires requests
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_session(self.pool_size)
+        return self._session
+
+    def timed_request(self, method: str, url: str, **kwargs):
+        """Send a request through the pooled session and record its latency."""
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            self.latency.add(time.perf_counter() - start)
+
+    def summary(self) -> str:
+        return f"{len(self.latency.latencies)} HTTP requests, {self.latency.summary()}"
+
+class GoogleProvider(HttpProvider):
+    """Google Translate web API (gtx client)."""
+
+    name = "google"
+
+    def __init__(self, url: Optional[str] = None, timeout: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url or GOOGLE_TRANSLATE_URL
+        self.timeout = timeout
+
+    def __call__(self, text: str, target_lang: str, source_lang: str = "en") -> str:
+        return self.translate(text, target_lang, source_lang)
+
+    def translate(self, text: str, target_lang: str, source_lang: str = "en",
+                  timeout: Optional[int] = None) -> str:
+        """
+        Translate a single text.
+        Raises on network or HTTP errors so the engine can retry, and RateLimitedError on 429.
+        """
+        params = {
+            "client": "gtx",
+            "sl": source_lang,
+            "tl": target_lang,
+            "dt": "t",
+            "q": text
+        }
+
+        response = self.timed_request("GET", self.url, params=params, timeout=timeout or self.timeout)
+        if response.status_code == 429:
+            raise RateLimitedError(parse_retry_after(response.headers.get("Retry-After")))
+        response.raise_for_status()
+        result = response.json()
+        if result and result[0]:
+            translated_parts = [part[0] for part in result[0] if part[0]]
+            return ''.join(translated_parts)
+        return text
+
+# Process-wide Google provider shared by every script
+_google_provider = None
+_google_provider_lock = threading.Lock()
+
+def get_google_provider() -> GoogleProvider:
+    """The shared Google provider (one connection pool per process)."""
+    global _google_provider
+    with _google_provider_lock:
+        if _google_provider is None:
+            _google_provider = GoogleProvider()
+        return _google_provider
+
+def google_translate(text: str, target_lang: str, source_lang: str = "en", timeout: int = 20) -> str:
+    """
+    Translate a single text using the Google Translate web API (gtx client)
+    through the shared pooled provider.
+    Raises on network or HTTP errors so the engine can retry, and RateLimitedError on 429.
+    """
+    return get_google_provider().translate(text, target_lang, source_lang, timeout)
+
+class DeepLProvider:
+    """
+    DeepL API through the official client, created once per provider.
+
+    Implements ``translate_many`` so the engine sends up to ``batch_size`` strings per
+    request. When glossaries are given (target language -> {English term: translation}),
+    each is registered on the DeepL account once, under a name derived from its content,
+    and the existing glossary is reused by later runs.
+    """
+
+    name = "deepl"
+    batch_size = DEEPL_BATCH_SIZE
+    max_batch_chars = DEEPL_MAX_BATCH_CHARS
+
+    def __init__(self, api_key: str, glossaries: Optional[Dict[str, Dict[str, str]]] = None,
+                 server_url: Optional[str] = None):
+        self.api_key = api_key
+        self.glossaries = glossaries or {}
+        self.server_url = server_url or DEEPL_SERVER_URL
+        self._translator = None
+        self._glossary_ids: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.latency = LatencyStats()
+
+    @property
+    def translator(self):
+        # Imported lazily so the other tools never require the deepl package
+        if self._translator is None:
+            with self._lock:
+                if self._translator is None:
+                    import deepl
+                    # Retries and 429 handling belong to the engine's rate limiter
+                    deepl.http_client.max_network_retries = 0
+                    self._translator = deepl.Translator(self.api_key, server_url=self.server_url)
+        return self._translator
+
+    def glossary_id(self, target_lang: str, source_lang: str = "en") -> Optional[str]:
+        """ID of the glossary for ``target_lang``, registering it on first use (None without one)."""
+        target_lang = target_lang.lower()
+        with self._lock:
+            if target_lang in self._glossary_ids:
+                return self._glossary_ids[target_lang]
+        terms = self.glossaries.get(target_lang)
+        glossary_id = None
+        if terms:
+            digest = hashlib.sha256(json.dumps(terms, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+            name = f"killteamjson-{source_lang}-{target_lang}-{digest}"
+            existing = [g for g in self.translator.list_glossaries() if g.name == name]
+            if existing:
+                glossary_id = existing[0].glossary_id
+            else:
+                glossary_id = self.translator.create_glossary(
+                    name, source_lang=source_lang.upper(), target_lang=target_lang.upper(),
+                    entries=terms).glossary_id
+                print(f"  [INFO] Registered DeepL glossary {name} ({len(terms)} terms)")
+        with self._lock:
+            self._glossary_ids[target_lang] = glossary_id
+        return glossary_id
+
+    def translate_many(self, texts: List[str], target_lang: str, source_lang: str = "en") -> List[str]:
+        """
+        Translate a list of texts in one request.
+        Raises on errors so the engine can retry, and RateLimitedError on 429.
+        """
+        import deepl
+
+        glossary_id = self.glossary_id(target_lang, source_lang)
+        start = time.perf_counter()
+        try:
+            results = self.translator.translate_text(
+                texts, source_lang=source_lang.upper() if glossary_id else None,
+                target_lang=DEEPL_LANG_MAP.get(target_lang.lower(), target_lang.upper()),
+                glossary=glossary_id)
+        except deepl.TooManyRequestsException as e:
+            raise RateLimitedError(message=str(e)) from e
+        finally:
+            self.latency.add(time.perf_counter() - start)
+        return [result.text for result in results]
+
+    def __call__(self, text: str, target_lang: str, source_lang: str = "en") -> str:
+        return self.translate_many([text], target_lang, source_lang)[0]
+
+    def summary(self) -> str:
+        return f"{len(self.latency.latencies)} DeepL requests, {self.latency.summary()}"
+
+# One DeepL provider per API key, shared by every script in the process
+_deepl_providers: Dict[str, DeepLProvider] = {}
+_deepl_providers_lock = threading.Lock()
+
+def get_deepl_provider(api_key: str, glossaries: Optional[Dict[str, Dict[str, str]]] = None) -> DeepLProvider:
+    """The shared DeepL provider for ``api_key`` (one client per process)."""
+    with _deepl_providers_lock:
+        if api_key not in _deepl_providers:
+            _deepl_providers[api_key] = DeepLProvider(api_key, glossaries)
+        elif glossaries:
+            _deepl_providers[api_key].glossaries.update(glossaries)
+        return _deepl_providers[api_key]
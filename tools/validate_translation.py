@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """
 Validate that a translated JSON file has identical structure to the English base file.
+For files covered by translation_config, values outside the translatable fields are
+also checked to be unchanged from English.
 """
 
 import json
 import sys
 from pathlib import Path
+from translation_config import file_key, has_rules, translatable_locations
 
 def compare_structures(en_data, trans_data, path="", errors=None):
     """Recursively compare two JSON structures."""
@@ -43,6 +46,28 @@ def compare_structures(en_data, trans_data, path="", errors=None):
     
     return errors
 
+def changed_values(en_data, trans_data, path="", changes=None):
+    """Paths of primitive values that differ between two structurally identical files."""
+    if changes is None:
+        changes = []
+    
+    if isinstance(en_data, dict) and isinstance(trans_data, dict):
+        for key in en_data:
+            if key in trans_data:
+                changed_values(en_data[key], trans_data[key], f"{path}.{key}" if path else key, changes)
+    elif isinstance(en_data, list) and isinstance(trans_data, list):
+        for i, (en_item, trans_item) in enumerate(zip(en_data, trans_data)):
+            changed_values(en_item, trans_item, f"{path}[{i}]", changes)
+    elif en_data != trans_data:
+        changes.append(path)
+    
+    return changes
+
+def untranslatable_changes(en_data, trans_data, file_name):
+    """Paths whose value changed although the compiled rules don't translate them."""
+    translatable = translatable_locations(en_data, file_name)
+    return [path for path in changed_values(en_data, trans_data) if path not in translatable]
+
 def validate_translation(english_file, translation_file):
     """Validate a translation file against the English base."""
     try:
@@ -70,9 +95,20 @@ def validate_translation(english_file, translation_file):
         if len(errors) > 50:
             print(f"\n  ... and {len(errors) - 50} more errors")
         return False
-    else:
-        print(f"[OK] {translation_file} structure matches {english_file}")
-        return True
+    
+    print(f"[OK] {translation_file} structure matches {english_file}")
+    
+    # Values the rules don't translate (IDs, stats, keywords...) should be identical to English
+    file_name = file_key(english_file)
+    if has_rules(file_name):
+        changes = untranslatable_changes(en_data, trans_data, file_name)
+        if changes:
+            print(f"[WARNING] {len(changes)} values outside the translatable fields differ from English:")
+            for path in changes[:20]:
+                print(f"  - {path}")
+            if len(changes) > 20:
+                print(f"\n  ... and {len(changes) - 20} more")
+    return True
 
 def main():
     if len(sys.argv) < 3: